@@ -44,12 +44,15 @@ import topics
 import works
 import work_types
 from core.exceptions import APIError
+from core.group_by.utils import load_groupby_values
+from core.late_meta import LateMetaJSONEncoder
 from extensions import cache
 
 
 def create_app(config_object="settings"):
     app = Flask(__name__)
     app.config.from_object(config_object)
+    app.json_encoder = LateMetaJSONEncoder
 
     register_blueprints(app)
     register_extensions(app)
@@ -64,9 +67,13 @@ def create_app(config_object="settings"):
 
     @app.after_request
     def inject_cost_usd(response):
-        cost_header = response.headers.get("X-Cost-USD") or request.headers.get("X-Cost-USD")
+        # Requests carrying X-Cost-USD get meta.cost_usd while the payload is
+        # serialized (core/late_meta.py). This re-encode only covers a cost
+        # header set on the response itself.
+        cost_header = response.headers.get("X-Cost-USD")
         if (
             cost_header is not None
+            and request.headers.get("X-Cost-USD") is None
             and response.content_type
             and "application/json" in response.content_type
         ):
@@ -134,6 +141,10 @@ def register_extensions(app):
     if settings.ES_VECTOR_SEARCH_URL:
         connections.create_connection('vector', hosts=[settings.ES_VECTOR_SEARCH_URL], timeout=15)
     cache.init_app(app)
+    # Load the groupby_values table once at boot; under gunicorn --preload this
+    # runs before fork so every worker starts with it (core/group_by/utils.py).
+    if app.config.get("GROUPBY_VALUES_PRELOAD"):
+        load_groupby_values('walden')
 
 
 def register_errorhandlers(app):
@@ -151,6 +162,8 @@ def register_errorhandlers(app):
         # hammering during a users-api blip (security review M5).
         if err.code == 503:
             headers["Retry-After"] = "30"
+        elif err.code == 429:
+            headers["Retry-After"] = "5"
         return jsonify(response), err.code, headers
 
     app.errorhandler(APIError)(handle_exception)
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+import settings
+from autocomplete.utils import is_cached_autocomplete
+from extensions import cache
+
+
+"""
+Prefix-result cache for /autocomplete.
+
+A typing user fires a request per keystroke, and the same prefixes ("jo",
+"mit", "nat") come in from many users, so dumped results are kept in two
+levels:
+
+  - a process-local LRU, for every prefix: the hot ones stay resident
+  - Redis (`extensions.cache`), for short prefixes (is_cached_autocomplete),
+    which every worker sees
+
+Entries are keyed on (q, entity_type, hide_works, data_version, author_hint)
+and expire after AUTOCOMPLETE_CACHE_TIMEOUT seconds. The cache is best-effort:
+a Redis failure reads as a miss.
+"""
+
+AUTOCOMPLETE_CACHE_PREFIX = "autocomplete"
+KEY_ARGS = ("q", "entity_type", "hide_works", "author_hint")
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def get_prefix_cache_key(request, data_version):
+    """Cache key for a full-autocomplete request, or None when it is not cached."""
+    if (
+        settings.DEBUG
+        or not settings.AUTOCOMPLETE_CACHE_TIMEOUT
+        or not request.args.get("q")
+        or request.args.get("bypass_cache") == "true"
+    ):
+        return None
+    values = [request.args.get(arg) or "" for arg in KEY_ARGS]
+    values.append(data_version)
+    return f"{AUTOCOMPLETE_CACHE_PREFIX}:" + ":".join(
+        value.replace(":", "%3A") for value in values
+    )
+
+
+def get_cached_autocomplete(key, request):
+    results = _get_local(key)
+    if results is None and is_cached_autocomplete(request):
+        results = _get_shared(key)
+        if results is not None:
+            _set_local(key, results)
+    return results
+
+
+def set_cached_autocomplete(key, request, results):
+    _set_local(key, results)
+    if is_cached_autocomplete(request):
+        _set_shared(key, results)
+
+
+def _get_local(key):
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, results = entry
+        if expires_at < time.monotonic():
+            del _local_cache[key]
+            return None
+        _local_cache.move_to_end(key)
+        return results
+
+
+def _set_local(key, results):
+    expires_at = time.monotonic() + settings.AUTOCOMPLETE_CACHE_TIMEOUT
+    with _local_cache_lock:
+        _local_cache[key] = (expires_at, results)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > settings.AUTOCOMPLETE_CACHE_MAX_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def _get_shared(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def _set_shared(key, results):
+    try:
+        cache.set(key, results, timeout=settings.AUTOCOMPLETE_CACHE_TIMEOUT)
+    except Exception:
+        pass
@@ -1,3 +1,5 @@
+import settings
+
 AUTOCOMPLETE_SOURCE = [
     "country_code",
     "id",
@@ -20,8 +22,10 @@ AUTOCOMPLETE_SOURCE = [
 
 
 def is_cached_autocomplete(request):
-    """Cache autocomplete with 1 or 2 characters."""
-    if request.args.get("q") and len(request.args.get("q")) <= 2:
+    """Share cached autocomplete results across workers (Redis) for prefixes up
+    to AUTOCOMPLETE_SHARED_CACHE_MAX_LENGTH characters."""
+    q = request.args.get("q")
+    if q and len(q) <= settings.AUTOCOMPLETE_SHARED_CACHE_MAX_LENGTH:
         cached = True
     else:
         cached = False
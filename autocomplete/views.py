@@ -1,9 +1,15 @@
+import time
 from collections import OrderedDict
 
-from elasticsearch_dsl import A, Search
+from elasticsearch_dsl import Search
 from flask import Blueprint, request
 
 from authors.fields import fields_dict as authors_fields_dict
+from autocomplete.cache import (
+    get_cached_autocomplete,
+    get_prefix_cache_key,
+    set_cached_autocomplete,
+)
 from autocomplete.schemas import MessageAutocompleteCustomSchema, MessageSchema
 from autocomplete.shared import (
     search_canonical_id_full,
@@ -19,6 +25,12 @@ from autocomplete.full import (
     build_full_search_query,
 )
 from autocomplete.validate import validate_full_autocomplete_params
+from autocomplete.vocabulary import (
+    VOCABULARY_ENTITY_TYPES,
+    get_institution_types,
+    get_vocabulary_index,
+    normalize_phrase,
+)
 from concepts.fields import fields_dict as concepts_fields_dict
 from core.exceptions import APIQueryParamsError
 from core.preference import clean_preference
@@ -93,25 +105,39 @@ def autocomplete_full():
         else:
             index = ",".join(entities_to_indeces.values())
 
+    cache_key = get_prefix_cache_key(request, data_version)
+    if cache_key:
+        cached_results = get_cached_autocomplete(cache_key, request)
+        if cached_results is not None:
+            return cached_results
+
     s = Search(index=index, using=connection)
 
     # Exclude deleted author ID
     s = s.exclude("term", ids__openalex="https://openalex.org/A5317838346")
 
+    vocabulary = None
     if q:
         # canonical id match
         s, canonical_id_found = search_canonical_id_full(s, q)
         if not canonical_id_found:
-            s = build_full_search_query(q, s, sort)
+            if entity_type in VOCABULARY_ENTITY_TYPES and normalize_phrase(q):
+                vocabulary = get_vocabulary_index(index, connection)
+            if vocabulary is None:
+                s = build_full_search_query(q, s, sort)
             filter_results = get_filter_results(q)
 
-    s = s.source(AUTOCOMPLETE_SOURCE)
-    preference = clean_preference(q)
-    s = s.params(preference=preference)
-    # track_total_hits folds the exact count into the one search request;
-    # a separate s.count() round-trip roughly doubled cold-query latency (#648).
-    s = s.extra(track_total_hits=True)
-    response = s.params(timeout='5s').execute()
+    if vocabulary is not None:
+        # closed vocabulary: matched in memory, no ES round trip
+        response = vocabulary.search(q, sort)
+    else:
+        s = s.source(AUTOCOMPLETE_SOURCE)
+        preference = clean_preference(q)
+        s = s.params(preference=preference)
+        # track_total_hits folds the exact count into the one search request;
+        # a separate s.count() round-trip roughly doubled cold-query latency (#648).
+        s = s.extra(track_total_hits=True)
+        response = s.params(timeout='5s').execute()
 
     result = OrderedDict()
     result["meta"] = {
@@ -131,6 +157,8 @@ def autocomplete_full():
 
         # insert the filter_results at the beginning of the list
         results["results"] = filter_results + results["results"]
+    if cache_key:
+        set_cached_autocomplete(cache_key, request, results)
     return results
 
 
@@ -312,28 +340,19 @@ def autocomplete_institutions_type():
 
     connection = get_data_version_connection(request)
 
-    s = Search(index=INSTITUTIONS_INDEX, using=connection)
-    a = A(
-        "terms",
-        field="type",
-        missing="unknown",
-        size=200,
-    )
-    a.metric("cited_by_sum", "sum", field="cited_by_count")
-    s.aggs.bucket("groupby", a)
-    s = s.params(timeout='5s')
-    response = s.execute()
-    buckets = response.aggregations.groupby.buckets
+    # the type buckets are a closed vocabulary, aggregated once and kept in memory
+    start = time.perf_counter()
+    institution_types = get_institution_types(connection)
 
     hits = []
-    for b in buckets:
-        if b.key.startswith(q):
+    for institution_type, cited_by_count in institution_types:
+        if institution_type.startswith(q):
             hits.append(
                 OrderedDict(
                     {
                         "id": None,
-                        "display_name": b.key,
-                        "cited_by_count": b.cited_by_sum.value,
+                        "display_name": institution_type,
+                        "cited_by_count": cited_by_count,
                         "entity_type": "institution",
                         "external_id": None,
                     }
@@ -343,7 +362,7 @@ def autocomplete_institutions_type():
     result = OrderedDict()
     result["meta"] = {
         "count": len(hits),
-        "db_response_time_ms": response.took,
+        "db_response_time_ms": round((time.perf_counter() - start) * 1000),
         "page": 1,
         "per_page": 10,
     }
@@ -0,0 +1,156 @@
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+import settings
+from autocomplete.utils import AUTOCOMPLETE_SOURCE
+
+
+"""
+In-memory autocomplete for the small closed vocabularies.
+
+Countries, languages, licenses, SDGs and work types are a few hundred docs at
+most, so `/autocomplete?entity_type=...` for them doesn't need a
+`match_phrase_prefix` search per keystroke. Each index is loaded once (and
+again every AUTOCOMPLETE_VOCABULARY_TIMEOUT seconds) into a sorted list of
+phrases -- every suffix of every matched field, starting at a word boundary --
+so a prefix query is a bisect plus a scan over the matching run. Institution
+types (one terms agg over the institutions index) are cached the same way.
+"""
+
+# entity_type (autocomplete.full.get_indices) -> closed vocabulary
+VOCABULARY_ENTITY_TYPES = ("countries", "language", "license", "sdgs", "work_type")
+
+# the fields build_full_search_query matches on
+MATCH_FIELDS = (
+    "display_name",
+    "alternate_titles",
+    "abbreviated_title",
+    "display_name_acronyms",
+    "display_name_alternatives",
+    "description",
+)
+
+# a vocabulary larger than this isn't closed; its queries stay on ES
+MAX_VOCABULARY_SIZE = 1000
+
+_vocabularies = {}
+_vocabularies_lock = threading.Lock()
+
+
+def normalize_phrase(text):
+    """Lowercase, accent-folded words separated by single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+
+class VocabularyIndex:
+    def __init__(self, index_name, hits):
+        self.index_name = index_name
+        self.hits = hits
+        entries = sorted(
+            (phrase, position)
+            for position, hit in enumerate(hits)
+            for phrase in _phrases(hit["_source"])
+        )
+        self.phrases = [phrase for phrase, _ in entries]
+        self.positions = [position for _, position in entries]
+
+    def search(self, q, sort, size=10):
+        """A Response like the ES search's: the top `size` matches by `sort`
+        (e.g. "-works_count"), with the full match count."""
+        prefix = normalize_phrase(q)
+        matched = set()
+        i = bisect_left(self.phrases, prefix)
+        while i < len(self.phrases) and self.phrases[i].startswith(prefix):
+            matched.add(self.positions[i])
+            i += 1
+
+        sort_field = sort.lstrip("-")
+        reverse = sort.startswith("-")
+        ranked = sorted(
+            matched,
+            key=lambda position: self.hits[position]["_source"].get(sort_field) or 0,
+            reverse=reverse,
+        )
+        raw = {
+            "took": 0,
+            "timed_out": False,
+            "hits": {
+                "total": {"value": len(matched), "relation": "eq"},
+                "hits": [self.hits[position] for position in ranked[:size]],
+            },
+        }
+        return Response(Search(index=self.index_name), raw)
+
+
+def _phrases(source):
+    phrases = set()
+    for field in MATCH_FIELDS:
+        values = source.get(field)
+        if isinstance(values, str):
+            values = [values]
+        for value in values or []:
+            if not isinstance(value, str):
+                continue
+            words = normalize_phrase(value).split(" ")
+            phrases.update(" ".join(words[start:]) for start in range(len(words)))
+    phrases.discard("")
+    return phrases
+
+
+def get_vocabulary_index(index_name, connection):
+    """The in-memory index for `index_name`, or None if it is too large to be a
+    closed vocabulary."""
+    return _get_or_load(("index", index_name, connection), lambda: _load_index(index_name, connection))
+
+
+def get_institution_types(connection):
+    """[(type, cited_by_count sum)] for every institution type."""
+    return _get_or_load(
+        ("institution_types", connection), lambda: _load_institution_types(connection)
+    )
+
+
+def _get_or_load(key, load):
+    now = time.monotonic()
+    with _vocabularies_lock:
+        entry = _vocabularies.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    try:
+        value = load()
+    except Exception:
+        # serve the stale copy, if any, rather than failing the request
+        if entry is None:
+            raise
+        return entry[1]
+    with _vocabularies_lock:
+        _vocabularies[key] = (now + settings.AUTOCOMPLETE_VOCABULARY_TIMEOUT, value)
+    return value
+
+
+def _load_index(index_name, connection):
+    s = Search(index=index_name, using=connection)
+    s = s.source(AUTOCOMPLETE_SOURCE + [f for f in MATCH_FIELDS if f not in AUTOCOMPLETE_SOURCE])
+    s = s.extra(size=MAX_VOCABULARY_SIZE, track_total_hits=True)
+    response = s.params(timeout="5s").execute()
+    if response.hits.total.value > MAX_VOCABULARY_SIZE:
+        return None
+    return VocabularyIndex(index_name, response.to_dict()["hits"]["hits"])
+
+
+def _load_institution_types(connection):
+    s = Search(index=settings.INSTITUTIONS_INDEX, using=connection).extra(size=0)
+    s.aggs.bucket(
+        "groupby", "terms", field="type", missing="unknown", size=200
+    ).metric("cited_by_sum", "sum", field="cited_by_count")
+    response = s.params(timeout="5s").execute()
+    return [
+        (b.key, b.cited_by_sum.value) for b in response.aggregations.groupby.buckets
+    ]
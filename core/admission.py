@@ -0,0 +1,177 @@
+"""Admission control for expensive ES queries (ADMISSION_CONTROL).
+
+The ES query timeout is soft (5s, partial results) and gunicorn's is 12s, so a
+few pathological queries can pin every worker on a dyno. Each search is given a
+cost estimated from its built body:
+
+  - `terms` filter values (up to MAX_IDS_IN_FILTER per filter)
+  - wildcard / prefix / regexp / fuzzy clauses and `query_string` wildcards
+  - `intervals` queries (proximity / adjacency wildcards, core/search.py)
+  - `random_score` (sample=, scores every match)
+  - bucket aggregations, by the buckets they return (size), multiplied through
+    nesting with each nested level capped at NESTED_AGG_MAX_COST
+  - hits fetched (from + size, deep sample pages) and an exact hit count
+
+Queries under ADMISSION_COST_THRESHOLD run as before. Costlier ones need one of
+the dyno's ADMISSION_POOL_SIZE slots; a query that can't get one within
+ADMISSION_QUEUE_TIMEOUT seconds is rejected with a retryable 429.
+
+A slot is a lease: a Redis key set only if absent, expiring after
+ADMISSION_LEASE_TIMEOUT seconds. That outlives gunicorn's worker timeout, so a
+worker killed mid-query (which never releases its slot) loses it when the lease
+expires rather than shrinking the pool for the life of the dyno. If Redis
+can't be reached, queries are admitted without a slot.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+import settings
+from core.exceptions import APIOverloadedError
+from extensions import cache
+
+logger = logging.getLogger(__name__)
+
+BASE_COST = 1.0
+EXACT_COUNT_COST = 1.0
+HIT_COST = 0.001
+TERMS_VALUE_COST = 0.05
+WILDCARD_COST = 5.0
+INTERVALS_COST = 10.0
+RANDOM_SCORE_COST = 10.0
+BUCKET_COST = 0.002
+# A nested level's bucket product is a worst case (every parent bucket full) that
+# small group_by dimensions (type, is_oa, ...) never reach, so it stops growing here.
+NESTED_AGG_MAX_COST = 8.0
+
+BUCKET_AGGS = ("terms", "composite", "multi_terms", "significant_terms")
+SEARCH_CLAUSES = ("query", "post_filter", "rescore", "knn")
+
+ADMISSION_KEY_PREFIX = "admission"
+# how often a queued query retries the slots
+ADMISSION_POLL_INTERVAL = 0.05
+
+
+def estimate_query_cost(body, hits=0):
+    """Cost of a search body (Search.to_dict()) fetching `hits` hits, in units
+    of roughly one plain filtered page."""
+    cost = BASE_COST + HIT_COST * hits
+    for clause in SEARCH_CLAUSES:
+        cost += _clause_cost(body.get(clause))
+    cost += _aggs_cost(body.get("aggs"))
+    if body.get("track_total_hits") is True:
+        cost += EXACT_COUNT_COST
+    return cost
+
+
+def _clause_cost(node, in_intervals=False):
+    if isinstance(node, list):
+        return sum(_clause_cost(item, in_intervals) for item in node)
+    if not isinstance(node, dict):
+        return 0
+    cost = 0
+    for key, value in node.items():
+        if key == "terms" and isinstance(value, dict):
+            cost += TERMS_VALUE_COST * sum(
+                len(values) for values in value.values() if isinstance(values, list)
+            )
+            continue
+        if key in ("wildcard", "prefix", "regexp", "fuzzy"):
+            cost += WILDCARD_COST
+        elif key == "query_string" and isinstance(value, dict):
+            query = str(value.get("query", ""))
+            cost += WILDCARD_COST * (query.count("*") + query.count("?"))
+        elif key == "intervals":
+            # rule lists (all_of/any_of) nest under an `intervals` key too
+            if not in_intervals:
+                cost += INTERVALS_COST
+            cost += _clause_cost(value, in_intervals=True)
+            continue
+        elif key == "random_score":
+            cost += RANDOM_SCORE_COST
+        cost += _clause_cost(value, in_intervals)
+    return cost
+
+
+def _aggs_cost(aggs, fanout=1):
+    cost = 0
+    for agg in (aggs or {}).values():
+        buckets = _agg_buckets(agg)
+        level_cost = BUCKET_COST * fanout * buckets
+        cost += level_cost if fanout == 1 else min(level_cost, NESTED_AGG_MAX_COST)
+        cost += _aggs_cost(agg.get("aggs"), fanout * max(buckets, 1))
+    return cost
+
+
+def _agg_buckets(agg):
+    for kind in BUCKET_AGGS:
+        if kind in agg:
+            spec = agg[kind]
+            # shard_size is a per-shard candidate list ES trims back to size
+            return spec.get("size", 10)
+    if "filters" in agg:
+        return len(agg["filters"].get("filters", {}))
+    return 1
+
+
+def get_slot_keys():
+    """Lease keys of this dyno's slots (DYNO is set by Heroku)."""
+    dyno = os.environ.get("DYNO", "local")
+    return [
+        f"{ADMISSION_KEY_PREFIX}:{dyno}:{slot}"
+        for slot in range(settings.ADMISSION_POOL_SIZE)
+    ]
+
+
+def acquire_slot(timeout):
+    """Lease a free slot, waiting up to `timeout` seconds. Returns its key, ""
+    when Redis is unavailable (admit without a slot), or None if every slot
+    stayed taken."""
+    deadline = time.monotonic() + timeout
+    while True:
+        for key in get_slot_keys():
+            try:
+                leased = cache.add(key, 1, timeout=settings.ADMISSION_LEASE_TIMEOUT)
+            except Exception:
+                logger.warning("admission_lease_unavailable")
+                return ""
+            if leased:
+                return key
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(ADMISSION_POLL_INTERVAL)
+
+
+def release_slot(key):
+    try:
+        cache.delete(key)
+    except Exception:
+        # the lease expires on its own
+        logger.info("admission_release_failed key=%s", key)
+
+
+@contextmanager
+def admit_query(s, hits=0):
+    """Run the enclosed search directly when it's cheap, else in a pool slot,
+    raising APIOverloadedError (429) if none frees up in time."""
+    if not settings.ADMISSION_CONTROL:
+        yield
+        return
+    cost = estimate_query_cost(s.to_dict(), hits)
+    if cost < settings.ADMISSION_COST_THRESHOLD:
+        yield
+        return
+
+    slot = acquire_slot(settings.ADMISSION_QUEUE_TIMEOUT)
+    if slot is None:
+        logger.warning("admission_rejected cost=%.1f", cost)
+        raise APIOverloadedError(
+            "This query is expensive and the server is busy. Retry shortly, or "
+            "narrow the query (fewer filter values, wildcards or group_by dimensions)."
+        )
+    try:
+        yield
+    finally:
+        if slot:
+            release_slot(slot)
@@ -0,0 +1,274 @@
+"""Compiled marshmallow dumps for the hot list/entity serialization path.
+
+`Schema.dump` walks every field through `Field.serialize` -> `get_value` ->
+accessor -> `_serialize` for every hit, which dominates CPU on `per_page=200`
+works pages. `get_compiled_schema` generates, once per (schema class, `only`,
+context), a flat Python function per schema that reads and converts each field
+inline, then reuses it for every request with the same shape.
+
+Parity with `schema.dump` is the contract (see tests/unit/test_compiled_schema.py):
+
+  - values are read with marshmallow's own accessor semantics (`obj[key]`, then
+    `getattr`; read straight off `_d_` for plain ES-hit AttrDicts), and
+    `dump_default`, `data_key` and `dict_class` are honored
+  - String/Integer/Float are converted inline; Boolean, List and Nested reuse
+    the field's own `_serialize` semantics; every other field type (Method,
+    Function, Raw, custom) is delegated to `field.serialize` on the bound field
+  - pre_dump/post_dump hooks run through the schema instance's own processor
+    machinery, so hooks and `context` behave exactly as in `dump`
+  - a schema that overrides `get_attribute` is not compiled; it uses `dump`
+
+Nested schemas are compiled lazily on first use (GroupBySchema nests itself).
+
+`json_response` encodes with orjson when it is installed and SERIALIZER_ORJSON
+is set. orjson writes non-ASCII as UTF-8 instead of `\\uXXXX` escapes, so that
+output is equivalent JSON but not byte-identical to Flask's encoder.
+"""
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from elasticsearch_dsl.utils import AttrDict, _wrap
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import _get_value_for_key, ensure_text_type, get_value
+
+import settings
+from core.late_meta import get_late_meta, with_late_meta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+COMPILED_CACHE_MAX_SIZE = 256
+
+_compiled_cache = OrderedDict()
+_compiled_cache_lock = threading.Lock()
+
+# Field classes converted inline; subclasses may override _serialize, so the
+# match is on the exact class.
+_INLINE_CONVERTERS = {
+    fields.String: "_text",
+    fields.Integer: "int",
+    fields.Float: "float",
+}
+
+
+# AttrDict subclasses (ES hits, LakebaseHit) that keep AttrDict's own item and
+# attribute access, so values can be read off `_d_` directly: class -> bool.
+_plain_attr_dict_classes = {}
+# (class, name) -> whether the class defines attribute `name`.
+_class_attrs = {}
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _text(value):
+    return value if value.__class__ is str else ensure_text_type(value)
+
+
+def _is_plain_attr_dict(cls):
+    plain = _plain_attr_dict_classes.get(cls)
+    if plain is None:
+        plain = _plain_attr_dict_classes[cls] = (
+            issubclass(cls, AttrDict)
+            and cls.__getitem__ is AttrDict.__getitem__
+            and cls.__getattr__ is AttrDict.__getattr__
+            and cls.__getattribute__ is object.__getattribute__
+        )
+    return plain
+
+
+def _get_one(obj, key, default):
+    """marshmallow's `_get_value_for_key`, without the KeyError -> getattr ->
+    AttributeError round trip for keys missing from a plain AttrDict."""
+    cls = obj.__class__
+    plain = _plain_attr_dict_classes.get(cls)
+    if plain is None:
+        plain = _is_plain_attr_dict(cls)
+    if not plain:
+        return _get_value_for_key(obj, key, default)
+
+    d = obj._d_
+    if key in d:
+        # AttrDict.__getitem__, minus the Mapping ABC check for scalars
+        value = d[key]
+        return value if value.__class__ in _SCALAR_TYPES else _wrap(value)
+
+    # What getattr() finds once AttrDict.__getattr__ has raised: a class
+    # attribute, else the instance __dict__ (e.g. Hit.meta).
+    class_attr = _class_attrs.get((cls, key))
+    if class_attr is None:
+        class_attr = _class_attrs[(cls, key)] = hasattr(cls, key)
+    if class_attr:
+        try:
+            return object.__getattribute__(obj, key)
+        except AttributeError:
+            return default
+    return obj.__dict__.get(key, default)
+
+
+class _LazyNested:
+    """Compiled dump of a Nested field's schema, built on first call."""
+
+    def __init__(self, field):
+        self.field = field
+        self.dump = None
+
+    def __call__(self, value):
+        if self.dump is None:
+            schema = self.field.schema
+            self.many = schema.many or self.field.many
+            self.dump = _compile(schema)
+        return self.dump(value, self.many)
+
+
+class CompiledSchema:
+    """A compiled stand-in for one bound schema instance's `dump`."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._dump = _compile(schema)
+
+    def dump(self, obj, *, many=None):
+        many = self.schema.many if many is None else bool(many)
+        return self._dump(obj, many)
+
+
+def _field_code(i, attr_name, field, env):
+    """Source lines that serialize one field of `obj` into `ret`."""
+    key = field.data_key if field.data_key is not None else attr_name
+    env[f"f{i}"] = field
+    lines = []
+
+    if not field._CHECK_ATTRIBUTE or field.__class__ not in _INLINE_CONVERTERS and not isinstance(
+        field, (fields.Boolean, fields.List, fields.Nested)
+    ):
+        lines.append(f"    v = f{i}.serialize({attr_name!r}, obj, accessor=get_attribute)")
+        lines.append(f"    if v is not missing:")
+        lines.append(f"        ret[{key!r}] = v")
+        return lines
+
+    check_key = attr_name if field.attribute is None else field.attribute
+    getter = "get_value" if "." in check_key else "get_one"
+    lines.append(f"    v = {getter}(obj, {check_key!r}, missing)")
+    if field.dump_default is not missing:
+        env[f"d{i}"] = field.dump_default
+        call = "()" if callable(field.dump_default) else ""
+        lines.append(f"    if v is missing:")
+        lines.append(f"        v = d{i}{call}")
+    lines.append(f"    if v is not missing:")
+
+    converter = _INLINE_CONVERTERS.get(field.__class__)
+    if converter:
+        lines.append(f"        ret[{key!r}] = None if v is None else {converter}(v)")
+    elif isinstance(field, fields.Nested) and field.__class__ is fields.Nested:
+        env[f"n{i}"] = _LazyNested(field)
+        lines.append(f"        ret[{key!r}] = None if v is None else n{i}(v)")
+    elif field.__class__ is fields.List and field.inner.__class__ is fields.Nested:
+        env[f"n{i}"] = _LazyNested(field.inner)
+        lines.append(f"        ret[{key!r}] = None if v is None else [n{i}(x) for x in v]")
+    elif field.__class__ is fields.List and field.inner.__class__ in _INLINE_CONVERTERS:
+        converter = _INLINE_CONVERTERS[field.inner.__class__]
+        lines.append(
+            f"        ret[{key!r}] = None if v is None else "
+            f"[None if x is None else {converter}(x) for x in v]"
+        )
+    else:
+        lines.append(f"        ret[{key!r}] = f{i}._serialize(v, {attr_name!r}, obj)")
+    return lines
+
+
+def _compile(schema):
+    """Return `dump(obj, many)` for a bound schema instance."""
+    if type(schema).get_attribute is not Schema.get_attribute:
+        return lambda obj, many: schema.dump(obj, many=many)
+
+    env = {
+        "missing": missing,
+        "get_attribute": schema.get_attribute,
+        "get_one": _get_one,
+        "get_value": get_value,
+        "dict_class": schema.dict_class,
+        "_text": _text,
+    }
+    body = ["def serialize_one(obj):", "    ret = dict_class()"]
+    for i, (attr_name, field) in enumerate(schema.dump_fields.items()):
+        body.extend(_field_code(i, attr_name, field, env))
+    body.append("    return ret")
+    exec(compile("\n".join(body), f"<compiled {type(schema).__name__}>", "exec"), env)
+    serialize_one = env["serialize_one"]
+
+    has_pre = schema._has_processors(PRE_DUMP)
+    has_post = schema._has_processors(POST_DUMP)
+
+    def dump(obj, many):
+        processed = obj
+        if has_pre:
+            processed = schema._invoke_dump_processors(
+                PRE_DUMP, obj, many=many, original_data=obj
+            )
+        if many and processed is not None:
+            result = [serialize_one(d) for d in processed]
+        else:
+            result = serialize_one(processed)
+        if has_post:
+            result = schema._invoke_dump_processors(
+                POST_DUMP, result, many=many, original_data=obj
+            )
+        return result
+
+    return dump
+
+
+def get_compiled_schema(schema_class, only=None, context=None):
+    """Compiled equivalent of `schema_class(only=only, context=context)`.
+
+    Cached per (class, only, context); contexts with unhashable values are
+    compiled per call.
+    """
+    context = context or {}
+    try:
+        key = (
+            schema_class,
+            tuple(only) if only is not None else None,
+            tuple(sorted(context.items())),
+        )
+        hash(key)
+    except TypeError:
+        return CompiledSchema(schema_class(only=only, context=context))
+
+    with _compiled_cache_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is not None:
+            _compiled_cache.move_to_end(key)
+            return compiled
+
+    compiled = CompiledSchema(schema_class(only=only, context=dict(context)))
+    with _compiled_cache_lock:
+        _compiled_cache[key] = compiled
+        while len(_compiled_cache) > COMPILED_CACHE_MAX_SIZE:
+            _compiled_cache.popitem(last=False)
+    return compiled
+
+
+def compiled_dump(schema_class, obj, only=None, context=None, many=None):
+    """`schema_class(only=only, context=context).dump(obj, many=many)`,
+    compiled when COMPILED_SERIALIZER is on."""
+    if not settings.COMPILED_SERIALIZER:
+        return schema_class(only=only, context=context or {}).dump(obj, many=many)
+    return get_compiled_schema(schema_class, only=only, context=context).dump(
+        obj, many=many
+    )
+
+
+def json_response(data):
+    """Return a dumped payload for Flask to jsonify as usual, or, with orjson
+    enabled, an orjson-encoded response (late meta included)."""
+    if orjson is None or not settings.SERIALIZER_ORJSON:
+        return data
+    body = orjson.dumps(with_late_meta(data, get_late_meta()))
+    return current_app.response_class(
+        body + b"\n", mimetype=current_app.config["JSONIFY_MIMETYPE"]
+    )
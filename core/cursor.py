@@ -8,6 +8,10 @@ from core.exceptions import APIPaginationError
 from core.group_by.utils import parse_group_by, get_bucket_keys
 
 
+# Upper bound on `slice=<id>/<max>` for parallel point-in-time cursors.
+MAX_CURSOR_SLICES = 64
+
+
 def encode_cursor(cursor):
     cursor_json = json.dumps(str(cursor)).encode()
     return base64.b64encode(cursor_json).decode()
@@ -30,6 +34,70 @@ def decode_cursor(encoded_cursor, return_json=True):
         raise APIPaginationError("Invalid cursor value")
 
 
+def encode_pit_cursor(pit_id, search_after, count, cursor_slice=None, count_is_exact=True):
+    """Cursor for a point-in-time page: the PIT id, the last hit's sort values,
+    the total count from the first page, and the slice it walks (if any)."""
+    state = {"pit": pit_id, "search_after": search_after, "count": count}
+    if not count_is_exact:
+        state["count_is_exact"] = False
+    if cursor_slice:
+        state["slice"] = list(cursor_slice)
+    return base64.b64encode(json.dumps(state).encode()).decode()
+
+
+def decode_pit_cursor(encoded_cursor):
+    """State of a point-in-time cursor, or None for a plain search_after cursor.
+
+    Plain cursors encode a JSON string; point-in-time cursors a JSON object.
+    """
+    try:
+        decoded = base64.b64decode(encoded_cursor).decode("utf8")
+    except ValueError:
+        return None
+    if not decoded.startswith("{"):
+        return None
+    try:
+        state = json.loads(decoded)
+    except json.decoder.JSONDecodeError:
+        raise APIPaginationError("Invalid cursor value")
+    if (
+        not isinstance(state, dict)
+        or not isinstance(state.get("pit"), str)
+        or not isinstance(state.get("search_after"), list)
+        or not (state.get("count") is None or _is_int(state["count"]))
+        or not isinstance(state.get("count_is_exact", True), bool)
+        or not _is_cursor_slice(state.get("slice"))
+    ):
+        raise APIPaginationError("Invalid cursor value")
+    return state
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_cursor_slice(value):
+    return value is None or (
+        isinstance(value, list) and len(value) == 2 and all(_is_int(v) for v in value)
+    )
+
+
+def parse_cursor_slice(slice_param):
+    """`slice=<id>/<max>` -> (id, max), or None. It starts a sliced cursor with
+    `cursor=*`; later pages carry the slice in their cursor."""
+    if not slice_param:
+        return None
+    try:
+        slice_id, slice_max = (int(part) for part in slice_param.split("/"))
+    except ValueError:
+        raise APIPaginationError("slice must look like <id>/<max>, e.g. slice=0/4.")
+    if not 2 <= slice_max <= MAX_CURSOR_SLICES or not 0 <= slice_id < slice_max:
+        raise APIPaginationError(
+            f"slice must be <id>/<max> with 0 <= id < max and 2 <= max <= {MAX_CURSOR_SLICES}."
+        )
+    return slice_id, slice_max
+
+
 def get_cursor(response, per_page):
     hits = response["hits"]["hits"]
     if len(hits) < per_page:
@@ -45,6 +113,15 @@ def get_next_cursor(params, response):
         elastic_cursor = get_group_by_after_key(params["group_by"], response)
     else:
         elastic_cursor = get_cursor(response, params["per_page"])
+    if elastic_cursor and params.get("pit"):
+        pit = params["pit"]
+        return encode_pit_cursor(
+            response.to_dict().get("pit_id", pit["id"]),
+            list(elastic_cursor),
+            pit["count"],
+            pit["slice"],
+            pit.get("count_is_exact", True),
+        )
     next_cursor = encode_cursor(elastic_cursor) if elastic_cursor else None
     return next_cursor
 
@@ -53,7 +130,11 @@ def handle_cursor(cursor, page, s):
     if cursor and page != 1:
         raise APIPaginationError("Cannot use page parameter with cursor.")
     if cursor and cursor != "*":
-        decoded_cursor = decode_cursor(cursor)
+        pit_cursor = decode_pit_cursor(cursor)
+        if pit_cursor:
+            decoded_cursor = pit_cursor["search_after"]
+        else:
+            decoded_cursor = decode_cursor(cursor)
         s = s.extra(search_after=decoded_cursor)
     return s
 
@@ -24,6 +24,11 @@ class HighAuthorCountError(APIError):
     description = "High author count limitation."
 
 
+class APIOverloadedError(APIError):
+    code = 429
+    description = "Too many expensive queries."
+
+
 class CollectionResolutionUnavailableError(APIError):
     code = 503
     description = "collection resolution unavailable"
@@ -1,12 +1,26 @@
 import csv
 import datetime
 import io
+import json
+import zlib
 
-from flask import make_response
+from flask import Response, make_response
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.writer.excel import save_virtual_workbook
 
+import settings
+from core.compiled_schema import compiled_dump, get_compiled_schema
+from core.exceptions import APIQueryParamsError
+from core.utils import set_number_param
+
+# format -> content type for full-result exports streamed from list queries
+STREAM_EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "jsonl.gz": "application/gzip",
+}
+
 
 def is_group_by_export(request):
     export_format = request.args.get("format")
@@ -19,6 +33,145 @@ def is_group_by_export(request):
     )
 
 
+def is_stream_export(request):
+    export_format = request.args.get("format")
+    group_by = request.args.get("group_by") or request.args.get("group-by")
+    group_bys = request.args.get("group_bys") or request.args.get("group-bys")
+    return (
+        export_format
+        and export_format.lower() in STREAM_EXPORT_FORMATS
+        and not (group_by or group_bys)
+    )
+
+
+def is_group_by_stream_export(request):
+    export_format = request.args.get("format")
+    group_by = request.args.get("group_by") or request.args.get("group-by")
+    return (
+        export_format
+        and export_format.lower() in ("ndjson", "jsonl.gz")
+        and group_by
+    )
+
+
+def get_export_max_rows(request):
+    """Row cap for one response of an export: `max_rows`, at most EXPORT_MAX_ROWS."""
+    max_rows = set_number_param(request, "max_rows", settings.EXPORT_MAX_ROWS)
+    if max_rows < 1 or max_rows > settings.EXPORT_MAX_ROWS:
+        raise APIQueryParamsError(
+            f"max_rows must be between 1 and {settings.EXPORT_MAX_ROWS:,}."
+        )
+    return max_rows
+
+
+def export_stream(request, pages, schema_class, only=None, entity_name="works"):
+    """Export the hits in `pages` (a core.shared_view.PitPages) as CSV, NDJSON or
+    gzipped NDJSON.
+
+    Each page is serialized with `schema_class` (restricted to `only`, the
+    `select=` fields). The body is bounded by `pages` to fit well inside the
+    worker timeout and is built before the response starts, so a failed page
+    is an error status rather than a truncated file; see `_export_response` for
+    the cursor that resumes the export.
+    """
+    export_format = request.args.get("format").lower()
+    filename = f"openalex-{entity_name}-{get_timestamp()}.{export_format}"
+
+    if export_format == "csv":
+        chunks = _csv_chunks(pages, schema_class, only)
+    else:
+        chunks = _ndjson_chunks(pages, schema_class, only)
+        if export_format == "jsonl.gz":
+            chunks = _gzip_chunks(chunks)
+    return _export_response(chunks, pages, export_format, filename)
+
+
+def export_group_by_stream(request, pages, entity_name="works"):
+    """Export the groups in `pages` (a core.shared_view.GroupByPages) as NDJSON or
+    gzipped NDJSON, one `{key, key_display_name, count}` object per line; bounded
+    and resumed like `export_stream`."""
+    export_format = request.args.get("format").lower()
+    filename = f"openalex-{entity_name}-group-by-{get_timestamp()}.{export_format}"
+
+    chunks = _group_ndjson_chunks(pages)
+    if export_format == "jsonl.gz":
+        chunks = _gzip_chunks(chunks)
+    return _export_response(chunks, pages, export_format, filename)
+
+
+def _export_response(chunks, pages, export_format, filename):
+    """The export response for `chunks`. When `pages` stopped before the end of
+    the results, its `next_cursor` goes out as the X-Next-Cursor header: request
+    the same URL with `cursor=<X-Next-Cursor>` for the next part of the export."""
+    body = b"".join(
+        chunk.encode() if isinstance(chunk, str) else chunk for chunk in chunks
+    )
+    response = Response(body, mimetype=STREAM_EXPORT_FORMATS[export_format])
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    if pages.next_cursor:
+        response.headers["X-Next-Cursor"] = pages.next_cursor
+        response.headers["Access-Control-Expose-Headers"] = "X-Next-Cursor"
+    return response
+
+
+def _group_ndjson_chunks(pages):
+    for groups in pages:
+        yield "".join(
+            json.dumps(
+                {
+                    "key": group["key"],
+                    "key_display_name": group["key_display_name"],
+                    "count": group["doc_count"],
+                }
+            )
+            + "\n"
+            for group in groups
+        )
+
+
+def _csv_chunks(pages, schema_class, only):
+    schema = get_compiled_schema(schema_class, only=only).schema
+    columns = [
+        field.data_key or name for name, field in schema.dump_fields.items()
+    ]
+    string_io = io.StringIO()
+    csv_writer = csv.DictWriter(string_io, fieldnames=columns, extrasaction="ignore")
+    csv_writer.writeheader()
+    for hits in pages:
+        for row in compiled_dump(schema_class, hits, only=only, many=True):
+            csv_writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        yield _drain(string_io)
+    yield _drain(string_io)
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _drain(string_io):
+    value = string_io.getvalue()
+    string_io.seek(0)
+    string_io.truncate()
+    return value
+
+
+def _ndjson_chunks(pages, schema_class, only):
+    for hits in pages:
+        rows = compiled_dump(schema_class, hits, only=only, many=True)
+        yield "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 def export_group_by(result, request):
     group_by_key = request.args.get("group_by") or request.args.get("group-by")
     if group_by_key:
@@ -1,3 +1,4 @@
+import copy
 import datetime
 import re
 from abc import ABC, abstractmethod
@@ -323,6 +324,24 @@ class Field(ABC):
         # shape doesn't match any users-api entity_type).
         self.entity_type = entity_type
 
+    def bind(self, value):
+        """Return a per-request copy of this field carrying `value`.
+
+        The Field objects in each entity's `fields_dict` are module-level
+        singletons shared by every request (and every thread, under threaded
+        workers). `build_query()` reads — and some subclasses normalize in
+        place — `self.value`, so callers must never set `value` on the shared
+        instance; they build from a bound copy instead:
+
+            q = field.bind(value).build_query()
+
+        The copy is shallow: only `value` is request-specific, every other
+        attribute is boot-static and safely shared.
+        """
+        bound = copy.copy(self)
+        bound.value = value
+        return bound
+
     @abstractmethod
     def build_query(self):
         pass
@@ -680,8 +699,7 @@ class OpenAlexIDField(Field):
         polymorphically across field classes."""
         formatted_values = []
         for val in values:
-            self.value = val
-            formatted = self._get_formatted_value()
+            formatted = self.bind(val)._get_formatted_value()
             if formatted is None:
                 raise APIQueryParamsError(
                     f"'{val}' is not a valid OpenAlex ID."
@@ -950,8 +968,7 @@ class TermField(Field):
         if "continent" in self.param:
             all_country_codes = []
             for val in values:
-                self.value = val
-                country_codes = self.get_country_codes()
+                country_codes = self.bind(val).get_country_codes()
                 all_country_codes.extend(country_codes)
             # Remove duplicates while preserving order
             formatted_values = list(dict.fromkeys(all_country_codes))
@@ -959,8 +976,7 @@ class TermField(Field):
             # Format all values according to the field type
             formatted_values = []
             for val in values:
-                self.value = val
-                formatted_val = self._get_formatted_value()
+                formatted_val = self.bind(val)._get_formatted_value()
                 formatted_values.append(formatted_val)
 
             # For DOI, we need to handle both v1 (full URL) and v2 (short form)
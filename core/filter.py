@@ -45,8 +45,7 @@ def filter_records(fields_dict, filter_params, s, sample=None):
 
             # everything else is a normal and query
             else:
-                field.value = value
-                q = field.build_query()
+                q = field.bind(value).build_query()
                 if sample and "search" in field.param:
                     s = s.filter(q)
                 elif "search" in field.param:
@@ -93,8 +92,7 @@ def handle_or_query(field, fields_dict, s, value, sample):
         # negate everything in values after !, like: NOT (42 or 43)
         for or_value in value.split("|"):
             or_value = or_value.replace("!", "")
-            field.value = or_value
-            q = field.build_query()
+            q = field.bind(or_value).build_query()
             not_query = ~Q("bool", must=q)
             if sample and "search" in field.param:
                 s = s.filter(not_query)
@@ -132,8 +130,7 @@ def handle_or_query(field, fields_dict, s, value, sample):
                         f"like /works?filter=concepts.id:!C144133560|C15744967, meaning NOT (C144133560 or C15744967). Problem "
                         f"value: {or_value}"
                     )
-                field.value = or_value
-                q = field.build_query()
+                q = field.bind(or_value).build_query()
                 or_queries.append(q)
             combined_or_query = Q("bool", should=or_queries, minimum_should_match=1)
             if sample and "search" in field.param:
@@ -156,8 +153,7 @@ def handle_and_query(field, s, value):
         )
 
     for and_value in value.split(" "):
-        field.value = and_value
-        q = field.build_query()
+        q = field.bind(and_value).build_query()
         and_queries.append(q)
     combined_and_query = Q("bool", must=and_queries)
     s = s.filter(combined_and_query)
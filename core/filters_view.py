@@ -89,8 +89,7 @@ def filter_records_filters_view(fields_dict, filter_params, ms, index_name):
                     # negate everything in values after !, like: NOT (42 or 43)
                     for or_value in value.split("|"):
                         or_value = or_value.replace("!", "")
-                        field.value = or_value
-                        q = field.build_query()
+                        q = field.bind(or_value).build_query()
                         not_query = ~Q("bool", must=q)
                         s = s.query(not_query)
                 else:
@@ -102,8 +101,7 @@ def filter_records_filters_view(fields_dict, filter_params, ms, index_name):
                                 f"like /works?filter=concepts.id:!C144133560|C15744967, meaning NOT (C144133560 or C15744967). Problem "
                                 f"value: {or_value}"
                             )
-                        field.value = or_value
-                        q = field.build_query()
+                        q = field.bind(or_value).build_query()
                         or_queries.append(q)
                     combined_or_query = Q(
                         "bool", should=or_queries, minimum_should_match=1
@@ -113,13 +111,12 @@ def filter_records_filters_view(fields_dict, filter_params, ms, index_name):
             # everything else is an AND query
             else:
                 field_meta = {"key": key, "type": type(field).__name__, "values": []}
-                field.value = value
-                if field.value.startswith("!"):
+                if value.startswith("!"):
                     field_meta["is_negated"] = True
-                    display_value = field.value.replace("!", "")
+                    display_value = value.replace("!", "")
                 else:
                     field_meta["is_negated"] = False
-                    display_value = field.value
+                    display_value = value
                 field_meta["values"].append(
                     {
                         "value": display_value,
@@ -127,7 +124,7 @@ def filter_records_filters_view(fields_dict, filter_params, ms, index_name):
                         # "url": set_url(search_param, key, or_value, index_name),
                     }
                 )
-                q = field.build_query()
+                q = field.bind(value).build_query()
                 s = s.query(q)
                 meta_results.append(field_meta)
     ms = ms.add(s)
@@ -157,8 +154,7 @@ def filter_records_filters_view(fields_dict, filter_params, ms, index_name):
                                 # "url": set_url(search_param, key, or_value, index_name),
                             }
                         )
-                        field.value = or_value
-                        q = field.build_query()
+                        q = field.bind(or_value).build_query()
                         not_query = ~Q("bool", must=q)
                         or_s[i] = or_s[i].query(not_query)
                         ms = ms.add(or_s[i])
@@ -182,8 +178,7 @@ def filter_records_filters_view(fields_dict, filter_params, ms, index_name):
                                 # "url": set_url(search_param, key, or_value, index_name),
                             }
                         )
-                        field.value = or_value
-                        q = field.build_query()
+                        q = field.bind(or_value).build_query()
                         or_s[i] = or_s[i].query(q)
                         ms = ms.add(or_s[i])
                         i = i + 1
@@ -5,6 +5,10 @@ from flask import current_app as app
 import settings
 from core.cursor import decode_group_by_cursor
 from core.exceptions import APIQueryParamsError
+from core.group_by.custom_results import (
+    get_custom_group_by_filters,
+    is_custom_group_by,
+)
 from core.group_by.utils import get_bucket_keys
 from core.validate import validate_group_by
 from core.preference import clean_preference
@@ -69,19 +73,27 @@ def create_group_by_buckets(fields_dict, group_by, include_unknown, s, params):
     field = get_field(fields_dict, group_by)
     validate_group_by(field, params)
 
-    if field.param in ["best_open_version", "version"] or "continent" in field.param:
-        return s
+    bucket_keys = get_bucket_keys(group_by)
 
-    group_by_field = field.alias if field.alias else field.es_sort_field()
+    if is_custom_group_by(field):
+        return create_custom_group_by_buckets(field, bucket_keys, s)
 
-    bucket_keys = get_bucket_keys(group_by)
+    group_by_field = field.alias if field.alias else field.es_sort_field()
 
     missing = get_missing(field)
     shard_size = determine_shard_size(q)
 
     s = filter_by_repository_or_journal(field, s)
 
-    if sort_params:
+    if uses_composite_buckets(field, params):
+        if cursor and cursor != "*":
+            after_key = decode_group_by_cursor(cursor)
+        else:
+            after_key = None
+        create_pagination_group_by_buckets(
+            bucket_keys, group_by_field, include_unknown, missing, params, s, after_key
+        )
+    elif sort_params:
         create_sorted_group_by_buckets(
             bucket_keys,
             group_by_field,
@@ -102,14 +114,6 @@ def create_group_by_buckets(fields_dict, group_by, include_unknown, s, params):
         create_boolean_group_by_buckets(bucket_keys, group_by_field, s)
     elif field.param == "mag_only":
         create_mag_only_group_by_buckets(bucket_keys, s)
-    elif cursor:
-        if cursor and cursor != "*":
-            after_key = decode_group_by_cursor(cursor)
-        else:
-            after_key = None
-        create_pagination_group_by_buckets(
-            bucket_keys, group_by_field, include_unknown, missing, params, s, after_key
-        )
     else:
         create_default_group_by_buckets(
             bucket_keys,
@@ -124,6 +128,33 @@ def create_group_by_buckets(fields_dict, group_by, include_unknown, s, params):
     return s
 
 
+def uses_composite_buckets(field, params):
+    """Cursor paging enumerates every bucket with a `composite` agg, in key order
+    (`sort=key:asc|desc`), so `next_cursor` can walk arbitrarily deep. Top-N
+    pages -- no cursor, or sorted by count or a metric -- stay on `terms` aggs,
+    as do the fixed-bucket shapes (custom, boolean, global south, mag_only)."""
+    if not params.get("cursor"):
+        return False
+    sort_params = params.get("sort") or {}
+    if any(key != "key" for key in sort_params):
+        return False
+    return not (
+        is_custom_group_by(field)
+        or "is_global_south" in field.param
+        or field.param in settings.EXTERNAL_ID_FIELDS
+        or field.param in settings.BOOLEAN_TEXT_FIELDS
+        or field.param == "mag_only"
+    )
+
+
+def create_custom_group_by_buckets(field, bucket_keys, s):
+    """Continent / version / best_open_version: one keyed `filters` agg on the
+    main search, so their counts need no extra ES round trips."""
+    a = A("filters", filters=get_custom_group_by_filters(field))
+    s.aggs.bucket(bucket_keys["default"], a)
+    return s
+
+
 def create_sorted_group_by_buckets(
     bucket_keys,
     group_by_field,
@@ -249,6 +280,9 @@ def create_pagination_group_by_buckets(
     terms_source = {"field": group_by_field}
     if include_unknown and missing is not None:
         terms_source["missing_bucket"] = True
+    key_order = (params.get("sort") or {}).get("key")
+    if key_order:
+        terms_source["order"] = key_order
     sources = [{"sub_key": {"terms": terms_source}}]
 
     composite_agg = A("composite", sources=sources, size=params["per_page"])
@@ -1,24 +1,68 @@
-from elasticsearch_dsl import MultiSearch, Search, Q
+from elasticsearch_dsl import Q
 
 import settings
-from core.filter import filter_records
-from core.search import full_search_query, scoped_search_query, full_search_query_exact, SearchOpenAlex
+from core.group_by.utils import get_bucket_keys
 from country_list import COUNTRIES_BY_CONTINENT
 
 
-def group_by_continent(field, index_name, params, fields_dict):
-    group_by_results = []
-    took = 0
-    ms = MultiSearch(index=index_name)
-    for continent in COUNTRIES_BY_CONTINENT:
-        s = search_and_filter(fields_dict, index_name, params)
-        country_codes = [c["country_code"] for c in COUNTRIES_BY_CONTINENT[continent]]
-        s = s.filter("terms", **{field.es_field(): country_codes})
-        ms = ms.add(s)
+"""
+Custom group_bys (continent / version / best_open_version) have a fixed set of
+buckets that aren't plain terms on one field. Each bucket is a clause in a
+keyed `filters` aggregation attached to the main search (see
+core/group_by/buckets.create_custom_group_by_buckets), so the counts come back
+with the primary query in a single ES round trip and share its exact
+query/filter context. The functions below turn those buckets into results.
+"""
+
+BEST_OPEN_VERSIONS = ["any", "acceptedOrPublished", "published"]
+
+
+def is_custom_group_by(field):
+    return field.param in ["best_open_version", "version"] or "continent" in field.param
+
+
+def get_custom_group_by_filters(field):
+    """Return {bucket_name: Q} for the `filters` aggregation of a custom group_by."""
+    if "continent" in field.param:
+        filters = {}
+        for continent in COUNTRIES_BY_CONTINENT:
+            country_codes = [
+                c["country_code"] for c in COUNTRIES_BY_CONTINENT[continent]
+            ]
+            filters[continent] = Q("terms", **{field.es_field(): country_codes})
+        filters["unknown"] = ~Q("exists", field=field.es_field())
+        return filters
+    elif field.param == "version":
+        filters = {}
+        for version in settings.VERSIONS:
+            if version == "null":
+                filters[version] = ~Q("exists", field="locations.version")
+            else:
+                filters[version] = Q("term", **{"locations.version": version})
+        return filters
+    elif field.param == "best_open_version":
+        submitted_query = Q("term", best_oa_location__version="submittedVersion")
+        accepted_query = Q("term", best_oa_location__version="acceptedVersion")
+        published_query = Q("term", best_oa_location__version="publishedVersion")
+        return {
+            "any": submitted_query | accepted_query | published_query,
+            "acceptedOrPublished": accepted_query | published_query,
+            "published": published_query,
+        }
+    return {}
 
-    responses = ms.execute()
 
-    for continent, response in zip(COUNTRIES_BY_CONTINENT.keys(), responses):
+def get_custom_bucket_counts(response, group_by):
+    """{bucket_name: doc_count} from the custom group_by `filters` aggregation."""
+    buckets = response.aggregations[get_bucket_keys(group_by)["default"]].buckets
+    return {name: bucket["doc_count"] for name, bucket in buckets.to_dict().items()}
+
+
+def group_by_continent(group_by, params, response):
+    group_by_results = []
+    counts = get_custom_bucket_counts(response, group_by)
+
+    for continent in COUNTRIES_BY_CONTINENT:
         if not params["q"] or params["q"] and params["q"].lower() in continent.lower():
             group_by_results.append(
                 {
@@ -26,16 +70,12 @@ def group_by_continent(field, index_name, params, fields_dict):
                         continent.lower().replace(" ", "_")
                     ),
                     "key_display_name": continent,
-                    "doc_count": response.hits.total.value,
+                    "doc_count": counts[continent],
                 }
             )
-        took = took + response.took
 
     # get unknown
-    s = search_and_filter(fields_dict, index_name, params)
-    s = s.query(~Q("exists", field=field.es_field()))
-    response = s.execute()
-    unknown_count = response.hits.total.value
+    unknown_count = counts["unknown"]
     if (unknown_count and not params["q"]) or (
         unknown_count and params["q"] and params["q"].lower() in "unknown"
     ):
@@ -46,7 +86,6 @@ def group_by_continent(field, index_name, params, fields_dict):
                 "doc_count": unknown_count,
             }
         )
-    took = took + response.took
 
     # sort by count
     group_by_results = sorted(
@@ -55,22 +94,12 @@ def group_by_continent(field, index_name, params, fields_dict):
     return group_by_results
 
 
-def group_by_version(field, index_name, params, include_unknown, fields_dict):
+def group_by_version(group_by, params, include_unknown, response):
     group_by_results = []
-    took = 0
-    ms = MultiSearch(index=index_name)
-    for version in settings.VERSIONS:
-        s = search_and_filter(fields_dict, index_name, params)
-        if version == "null":
-            s = s.filter(~Q("exists", field="locations.version"))
-        else:
-            kwargs1 = {"locations.version": version}
-            s = s.query(Q("term", **kwargs1))
-        ms = ms.add(s)
-
-    responses = ms.execute()
+    counts = get_custom_bucket_counts(response, group_by)
 
-    for version, response in zip(settings.VERSIONS, responses):
+    for version in settings.VERSIONS:
+        doc_count = counts[version]
         version = "unknown" if version == "null" else version
         key_display_name = "unknown" if version == "null" else version
         if key_display_name == "unknown" and not include_unknown:
@@ -80,10 +109,9 @@ def group_by_version(field, index_name, params, include_unknown, fields_dict):
                 {
                     "key": version,
                     "key_display_name": key_display_name,
-                    "doc_count": response.hits.total.value,
+                    "doc_count": doc_count,
                 }
             )
-        took = took + response.took
 
     # sort by count
     group_by_results = sorted(
@@ -92,37 +120,20 @@ def group_by_version(field, index_name, params, include_unknown, fields_dict):
     return group_by_results
 
 
-def group_by_best_open_version(field, index_name, params, fields_dict):
+def group_by_best_open_version(group_by, params, response):
     group_by_results = []
-    took = 0
-    ms = MultiSearch(index=index_name)
-    versions = ["any", "acceptedOrPublished", "published"]
-    for version in versions:
-        s = search_and_filter(fields_dict, index_name, params)
-        submitted_query = Q("term", best_oa_location__version="submittedVersion")
-        accepted_query = Q("term", best_oa_location__version="acceptedVersion")
-        published_query = Q("term", best_oa_location__version="publishedVersion")
-        if version == "any":
-            query = submitted_query | accepted_query | published_query
-        elif version == "acceptedOrPublished":
-            query = accepted_query | published_query
-        elif version == "published":
-            query = published_query
-        ms = ms.add(s.filter(query))
-
-    responses = ms.execute()
+    counts = get_custom_bucket_counts(response, group_by)
 
-    for version, response in zip(versions, responses):
+    for version in BEST_OPEN_VERSIONS:
         key_display_name = version
         if not params["q"] or params["q"] and params["q"].lower() in version.lower():
             group_by_results.append(
                 {
                     "key": version,
                     "key_display_name": key_display_name,
-                    "doc_count": response.hits.total.value,
+                    "doc_count": counts[version],
                 }
             )
-        took = took + response.took
 
     # sort by count
     group_by_results = sorted(
@@ -130,49 +141,3 @@ def group_by_best_open_version(field, index_name, params, fields_dict):
     )
 
     return group_by_results
-
-
-def search_and_filter(fields_dict, index_name, params):
-    s = Search(index=index_name)
-    # OQO execution path (#323 Pattern G2): the OQO executor applies search/filters
-    # via pre-built Q objects (not params["search"]/["filters"], which it leaves
-    # unset), and stashes the main query's exact query+filter contexts here so this
-    # custom group_by sub-search (continent/version/best_open_version) honors the
-    # same filter instead of running global. Replicate those contexts and return.
-    # Strictly additive: the legacy URL path never sets these keys.
-    if "_oqo_filter_qs" in params:
-        oqo_search_q = params.get("_oqo_search_q")
-        if oqo_search_q is not None:
-            s = s.query(oqo_search_q)
-        for fq in params["_oqo_filter_qs"]:
-            s = s.filter(fq)
-        s = s.extra(track_total_hits=True)
-        return s
-    searches = params.get("searches", [])
-    if len(searches) > 1:
-        # Multi-search: build sub-queries without citation boost, AND them, wrap once
-        sub_queries = []
-        for search_item in searches:
-            query_str = search_item["search"]
-            search_scope = search_item["search_scope"]
-            search_type = search_item["search_type"]
-            if not query_str or query_str == '""':
-                continue
-            if search_scope:
-                sub_queries.append(scoped_search_query(query_str, search_scope, search_type, skip_citation_boost=True))
-            elif search_type == "exact":
-                sub_queries.append(full_search_query_exact(query_str, skip_citation_boost=True))
-            else:
-                sub_queries.append(full_search_query(index_name, query_str, skip_citation_boost=True))
-        if sub_queries:
-            combined = Q("bool", must=sub_queries)
-            s = s.query(SearchOpenAlex.citation_boost_query(combined))
-    elif params["search"] and params["search"] != '""':
-        # Single search — existing behavior unchanged
-        search_query = full_search_query(index_name, params["search"])
-        s = s.query(search_query)
-    # filter
-    if params["filters"]:
-        s = filter_records(fields_dict, params["filters"], s)
-    s = s.extra(track_total_hits=True)
-    return s
@@ -1,21 +1,121 @@
+import threading
+from collections import OrderedDict
+
 import pycountry
 from elasticsearch_dsl import Search, Q
 from iso4217 import Currency
 
 from core.utils import get_index_name_by_id, normalize_openalex_id
+from extensions import cache
 from settings import (
+    DISPLAY_NAME_CACHE_TIMEOUT,
     DOMAINS_INDEX,
     FIELDS_INDEX,
+    INSTITUTIONS_INDEX,
     KEYWORDS_INDEX,
     LICENSES_INDEX,
+    PUBLISHERS_INDEX,
     SUBFIELDS_INDEX
 )
 
 
 """
 Code to alter display names for group by fields.
+
+id -> display_name lookups go through a two-level cache: a process-local LRU,
+then Redis (`extensions.cache`), and only the ids missing from both are fetched
+from ES, in one `terms` query. Cache keys include the index name, and index
+names carry the version (e.g. `institutions-v8`), so bumping an index in
+settings invalidates every entry for it without a flush.
 """
 
+LOCAL_CACHE_MAX_SIZE = 50000
+DISPLAY_NAME_CACHE_PREFIX = "display_name"
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def _cache_key(index_name, openalex_id):
+    return f"{DISPLAY_NAME_CACHE_PREFIX}:{index_name}:{openalex_id}"
+
+
+def _get_local(keys):
+    found = {}
+    with _local_cache_lock:
+        for key in keys:
+            if key in _local_cache:
+                _local_cache.move_to_end(key)
+                found[key] = _local_cache[key]
+    return found
+
+
+def _set_local(mapping):
+    with _local_cache_lock:
+        for key, value in mapping.items():
+            _local_cache[key] = value
+            _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_MAX_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def _get_shared(keys):
+    """Bulk read from Redis; a backend failure reads as all-miss."""
+    try:
+        values = cache.get_many(*keys)
+    except Exception:
+        return {}
+    return {key: value for key, value in zip(keys, values) if value is not None}
+
+
+def _set_shared(mapping):
+    try:
+        cache.set_many(mapping, timeout=DISPLAY_NAME_CACHE_TIMEOUT)
+    except Exception:
+        pass
+
+
+def _search_display_names(index_name, ids, connection):
+    """Fetch display names for `ids` from ES in a single terms query."""
+    s = Search(index=index_name, using=connection)
+    s = s.extra(size=len(ids))
+    s = s.source(["id", "display_name"])
+    s = s.filter(Q("terms", id=ids))
+    response = s.execute()
+    return {item.id: item.display_name for item in response}
+
+
+def lookup_display_names(ids, index_name, connection='default'):
+    """Return {id: display_name} for `ids` in `index_name`, ES only for cache misses."""
+    ids = list(dict.fromkeys(i for i in ids if i and i != "unknown"))
+    if not ids:
+        return {}
+    keys = {openalex_id: _cache_key(index_name, openalex_id) for openalex_id in ids}
+
+    found = _get_local(keys.values())
+    missing_keys = [key for key in keys.values() if key not in found]
+    if missing_keys:
+        shared = _get_shared(missing_keys)
+        if shared:
+            _set_local(shared)
+            found.update(shared)
+
+    results = {
+        openalex_id: found[key] for openalex_id, key in keys.items() if key in found
+    }
+    misses = [openalex_id for openalex_id in ids if openalex_id not in results]
+    if misses:
+        fetched = _search_display_names(index_name, misses, connection)
+        if fetched:
+            to_cache = {
+                _cache_key(index_name, openalex_id): display_name
+                for openalex_id, display_name in fetched.items()
+            }
+            _set_local(to_cache)
+            _set_shared(to_cache)
+        results.update(fetched)
+    return results
+
 
 # Static mapping of SDG IDs to display names
 # These 17 SDGs are permanent and never change
@@ -67,43 +167,22 @@ def get_id_display_names(ids, connection='default'):
         index_name = get_index_name_by_id(ids[1], connection=connection)
     else:
         index_name = get_index_name_by_id(ids[0], connection=connection)
-    s = Search(index=index_name, using=connection)
-    s = s.extra(size=500)
-    s = s.source(["id", "display_name"])
-
-    results = {}
-    or_queries = []
-    for openalex_id in ids:
-        or_queries.append(Q("term", id=openalex_id))
-    combined_or_query = Q("bool", should=or_queries, minimum_should_match=1)
-    s = s.query(combined_or_query)
-    response = s.execute()
-
-    for item in response:
-        results[item.id] = item.display_name
-    return results
+    return lookup_display_names(ids, index_name, connection)
 
 
 def get_display_names_host_organization(ids, connection='default'):
-    """Host organization is a special case because it can be an institution or a publisher."""
-    institution_ids = []
-    publisher_ids = []
+    """Host organization is a special case because it can be an institution or a publisher.
+
+    Both indexes are searched together, so the misses cost one ES round trip.
+    """
+    host_ids = []
     for openalex_id in ids:
         clean_id = normalize_openalex_id(openalex_id)
-        if clean_id and clean_id.startswith("I"):
-            institution_ids.append(openalex_id)
-        elif clean_id and clean_id.startswith("P"):
-            publisher_ids.append(openalex_id)
-    institution_names = get_id_display_names(institution_ids, connection)
-    publisher_names = get_id_display_names(publisher_ids, connection)
-
-    # merge the two dictionaries
-    results = {}
-    if institution_names:
-        results.update(institution_names)
-    if publisher_names:
-        results.update(publisher_names)
-    return results
+        if clean_id and clean_id[0] in ("I", "P"):
+            host_ids.append(openalex_id)
+    return lookup_display_names(
+        host_ids, f"{INSTITUTIONS_INDEX},{PUBLISHERS_INDEX}", connection
+    )
 
 
 def get_display_names_sdgs(ids, connection='default'):
@@ -124,21 +203,7 @@ def get_display_names_keywords_licenses_topics(ids, connection='default'):
         return None
 
     index = f"{FIELDS_INDEX},{SUBFIELDS_INDEX},{DOMAINS_INDEX},{KEYWORDS_INDEX},{LICENSES_INDEX}"
-    s = Search(index=index, using=connection)
-    s = s.extra(size=500)
-    s = s.source(["id", "display_name"])
-
-    results = {}
-    or_queries = []
-    for integer_id in ids:
-        or_queries.append(Q("term", id=integer_id))
-    combined_or_query = Q("bool", should=or_queries, minimum_should_match=1)
-    s = s.query(combined_or_query)
-    response = s.execute()
-
-    for item in response:
-        results[item.id] = item.display_name
-    return results
+    return lookup_display_names(ids, index, connection)
 
 
 def get_key_display_name(b, group_by):
@@ -33,21 +33,22 @@ def get_group_by_results(
     fields_dict,
     response,
     connection='default',
+    zero_values=True,
 ):
     """
     Top level function for getting boolean, custom, or default group by results.
+    `zero_values=False` skips padding the page with zero-count groups (streamed
+    exports walk every bucket, so padding each page would repeat keys).
     """
     field = get_field(fields_dict, group_by)
     if is_boolean_group_by(group_by):
         return get_boolean_group_by_results(response, group_by)
     elif "continent" in field.param:
-        results = group_by_continent(field, index_name, params, fields_dict)
+        results = group_by_continent(group_by, params, response)
     elif field.param == "version":
-        results = group_by_version(
-            field, index_name, params, include_unknown, fields_dict
-        )
+        results = group_by_version(group_by, params, include_unknown, response)
     elif field.param == "best_open_version":
-        results = group_by_best_open_version(field, index_name, params, fields_dict)
+        results = group_by_best_open_version(group_by, params, response)
     # temp function until topics propagation done
     elif field.param in (
         "topics.domain.id",
@@ -62,7 +63,10 @@ def get_group_by_results(
         results = get_default_group_by_results(
             group_by, response, index_name, connection, get_metric_result_key(params)
         )
-    results = add_zero_values(results, include_unknown, index_name, group_by, params, connection)
+    if zero_values:
+        results = add_zero_values(
+            results, include_unknown, index_name, group_by, params, connection
+        )
 
     # support new id formats so duplicates do not show up with 0 values
     if (
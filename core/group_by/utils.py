@@ -1,8 +1,23 @@
+import threading
+import time
+
 from elasticsearch import NotFoundError
 from elasticsearch_dsl import Search
 
 from core.exceptions import APIQueryParamsError
-from settings import GROUPBY_VALUES_INDEX
+from settings import GROUPBY_VALUES_INDEX, GROUPBY_VALUES_REFRESH_SECONDS
+
+# In-memory copy of the `groupby_values` index, per connection:
+# {connection: {(entity, group_by): [{"key", "key_display_name"}, ...]}}.
+# The index only changes when indexes are rebuilt, so it is loaded once at boot
+# (before fork under gunicorn --preload, so workers share the pages) and
+# refreshed in a background thread once it is older than
+# GROUPBY_VALUES_REFRESH_SECONDS. Until a table is loaded, lookups fall back to
+# a per-request ES search.
+_groupby_values_tables = {}
+_groupby_values_loaded_at = {}
+_groupby_values_refreshing = set()
+_groupby_values_lock = threading.Lock()
 
 
 def get_bucket_keys(group_by):
@@ -49,11 +64,53 @@ def parse_group_by(group_by):
     return group_by, include_unknown
 
 
-def get_all_groupby_values(entity, field, connection='default'):
-    # temp fix for best_oa_location.license
-    if field == "best_oa_location.license":
-        field = "locations.license"
+def fetch_groupby_values_table(connection='default'):
+    """Read the whole groupby_values index into a dict keyed by (entity, group_by)."""
+    table = {}
+    s = Search(index=GROUPBY_VALUES_INDEX, using=connection)
+    for hit in s.scan():
+        key = (hit.entity, hit.group_by)
+        if key in table:
+            # keep the first doc, as the per-request search did
+            continue
+        buckets = hit.to_dict().get("buckets") or []
+        table[key] = [
+            {"key": b["key"], "key_display_name": b.get("key_display_name")}
+            for b in buckets
+        ]
+    return table
+
+
+def load_groupby_values(connection='default'):
+    """Load (or reload) the in-memory groupby_values table. Returns True on success."""
+    try:
+        table = fetch_groupby_values_table(connection)
+    except Exception:
+        return False
+    with _groupby_values_lock:
+        _groupby_values_tables[connection] = table
+        _groupby_values_loaded_at[connection] = time.monotonic()
+    return True
+
+
+def refresh_groupby_values_in_background(connection='default'):
+    """Reload the table in a daemon thread; at most one refresh per connection at a time."""
+    with _groupby_values_lock:
+        if connection in _groupby_values_refreshing:
+            return
+        _groupby_values_refreshing.add(connection)
 
+    def run():
+        try:
+            load_groupby_values(connection)
+        finally:
+            with _groupby_values_lock:
+                _groupby_values_refreshing.discard(connection)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def search_groupby_values(entity, field, connection='default'):
     s = Search(index=GROUPBY_VALUES_INDEX, using=connection)
     s = s.filter("term", entity=entity)
     s = s.filter("term", group_by=field)
@@ -64,3 +121,19 @@ def get_all_groupby_values(entity, field, connection='default'):
     except (NotFoundError, IndexError):
         # Nothing found for this entity/groupby combination
         return []
+
+
+def get_all_groupby_values(entity, field, connection='default'):
+    # temp fix for best_oa_location.license
+    if field == "best_oa_location.license":
+        field = "locations.license"
+
+    table = _groupby_values_tables.get(connection)
+    if table is None:
+        refresh_groupby_values_in_background(connection)
+        return search_groupby_values(entity, field, connection)
+
+    age = time.monotonic() - _groupby_values_loaded_at[connection]
+    if age > GROUPBY_VALUES_REFRESH_SECONDS:
+        refresh_groupby_values_in_background(connection)
+    return table.get((entity, field), [])
@@ -0,0 +1,44 @@
+"""Late `meta` fields, added while a response payload is first serialized.
+
+Some `meta` fields are only known at the edge, not by the view: the gateway
+sends the metered request cost in `X-Cost-USD`, echoed as `meta.cost_usd`.
+Instead of parsing the finished JSON body back and dumping it again (a second
+full pass over multi-MB works pages), the app's JSON encoder merges these fields
+into the top-level `meta` as the payload is encoded, for both dict returns and
+explicit `jsonify()` calls.
+"""
+from flask import has_request_context, request
+from flask.json import JSONEncoder
+
+
+def get_late_meta():
+    """Late meta fields for the current request ({} outside a request)."""
+    if not has_request_context():
+        return {}
+    cost_header = request.headers.get("X-Cost-USD")
+    if cost_header is None:
+        return {}
+    try:
+        return {"cost_usd": float(cost_header)}
+    except ValueError:
+        return {}
+
+
+def with_late_meta(data, late_meta):
+    """Shallow copy of `data` with `late_meta` merged into its `meta` dict.
+
+    Returns `data` itself when there is nothing to merge, so views' own dicts
+    (which may be cached) are never mutated.
+    """
+    if not late_meta or not isinstance(data, dict) or not isinstance(data.get("meta"), dict):
+        return data
+    data = dict(data)
+    data["meta"] = {**data["meta"], **late_meta}
+    return data
+
+
+class LateMetaJSONEncoder(JSONEncoder):
+    """Flask JSON encoder that adds `get_late_meta()` to the top-level payload."""
+
+    def encode(self, o):
+        return super().encode(with_late_meta(o, get_late_meta()))
@@ -1,6 +1,6 @@
 from core.paginate import get_per_page
 from core.utils import map_filter_params, map_sort_params, set_number_param
-from core.validate import validate_export_format, validate_params
+from core.validate import validate_count_mode, validate_export_format, validate_params
 
 
 def parse_params(request):
@@ -14,6 +14,7 @@ def parse_params(request):
     params = {
         "apc_sum": request.args.get("apc_sum"),
         "cited_by_count_sum": request.args.get("cited_by_count_sum"),
+        "count_mode": validate_count_mode(request.args.get("count_mode")),
         "cursor": request.args.get("cursor"),
         "format": validate_export_format(request.args.get("format")),
         "filters": map_filter_params(request.args.get("filter")),
@@ -23,6 +24,7 @@ def parse_params(request):
         "per_page": get_per_page(request),
         "sample": request.args.get("sample", type=int),
         "seed": request.args.get("seed"),
+        "slice": request.args.get("slice"),
         "q": request.args.get("q"),
         "search": search_query,
         "search_type": search_type,
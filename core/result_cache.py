@@ -0,0 +1,152 @@
+"""Response-level cache for `shared_view`.
+
+Identical list queries (dashboards replay the same facet queries all day) are
+served from `extensions.cache` instead of going back to Elasticsearch. The key
+is a fingerprint of the *parsed* params, not the raw query string, so spelling
+variants of one query share an entry:
+
+  - filters are sorted (a comma-separated filter list is an AND, order-free)
+  - alias filter keys (`alternate_of`, e.g. `is_oa`) fold into their canonical key
+  - server-injected defaults (e.g. `is_xpac:false`) are already merged into
+    `params["filters"]`, so `/works` and `/works?filter=is_xpac:false` collide
+  - view-only params (`select`, `mailto`, `format`) are left out; they are
+    applied after `shared_view` returns (`select` only enters through the
+    `_source` includes it pushes down, which are part of the key)
+
+TTLs depend on the response shape: aggregations are cheap to keep and rarely
+change between index rebuilds, hit pages are kept briefly. Requests whose result
+is not a pure function of the params — `sample` without `seed`, `collection:`
+filters (resolved against users-api), semantic search — bypass the cache.
+
+The cache is best-effort: any backend failure is swallowed and the request goes
+to Elasticsearch as if the entry were missing.
+"""
+import hashlib
+import json
+
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+import settings
+from core.filter import _value_has_collection_ref
+from extensions import cache
+
+CACHE_KEY_PREFIX = "shared_view"
+
+# Marker for a hit page whose `results` were stored as the raw ES response body.
+_RAW_RESPONSE_KEY = "_es_response"
+
+
+def is_result_cacheable(request, params):
+    """Whether this request may be read from / written to the result cache."""
+    if settings.DEBUG or request.args.get("bypass_cache") == "true":
+        return False
+    if params.get("sample") and not params.get("seed"):
+        return False
+    if params.get("search_type") == "semantic":
+        return False
+    if params.get("cursor") and not params.get("group_by") and settings.CURSOR_PIT:
+        # each cursor page opens or extends its own point in time
+        return False
+    for f in params.get("filters") or []:
+        for key, value in f.items():
+            if key == "collection" or _value_has_collection_ref(value):
+                return False
+    return True
+
+
+def get_cache_timeout(params):
+    """Per-shape TTL: long for aggregations, short for hit pages."""
+    if params.get("group_by") or params.get("group_bys"):
+        return settings.RESULT_CACHE_GROUP_BY_TIMEOUT
+    return settings.RESULT_CACHE_HITS_TIMEOUT
+
+
+def canonical_filter_key(fields_dict, key):
+    """Fold an alternate key spelling into its canonical key.
+
+    Only folds when both keys resolve to the same field type and ES field, so
+    the two spellings are guaranteed to build the same query.
+    """
+    field = fields_dict.get(key)
+    if field is None or not field.alternate_of:
+        return key
+    canonical = fields_dict.get(field.alternate_of)
+    if (
+        canonical is not None
+        and type(canonical) is type(field)
+        and canonical.es_field() == field.es_field()
+    ):
+        return canonical.param
+    return key
+
+
+def get_fingerprint(params, fields_dict, index_name, connection):
+    """Normalized description of everything that affects the result; filter and
+    search order are ignored, sort key order is not."""
+    filters = sorted(
+        (canonical_filter_key(fields_dict, key), value)
+        for f in params.get("filters") or []
+        for key, value in f.items()
+    )
+    searches = sorted(
+        (s["search"], s["search_type"] or "", s["search_scope"] or "")
+        for s in params.get("searches") or []
+    )
+    return {
+        "index": index_name,
+        "connection": connection,
+        "filters": filters,
+        "searches": searches,
+        "search": params.get("search"),
+        "search_type": params.get("search_type"),
+        "search_scope": params.get("search_scope"),
+        "group_by": params.get("group_by"),
+        "group_bys": params.get("group_bys"),
+        # sort key order is the ES sort's tie-break order — keep it
+        "sort": list((params.get("sort") or {}).items()),
+        "page": params.get("page"),
+        "per_page": params.get("per_page"),
+        "cursor": params.get("cursor"),
+        "sample": params.get("sample"),
+        "seed": params.get("seed"),
+        "q": params.get("q"),
+        "apc_sum": params.get("apc_sum"),
+        "cited_by_count_sum": params.get("cited_by_count_sum"),
+        "source_includes": params.get("source_includes"),
+        "count_mode": params.get("count_mode"),
+    }
+
+
+def get_cache_key(params, fields_dict, index_name, connection):
+    fingerprint = get_fingerprint(params, fields_dict, index_name, connection)
+    encoded = json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")
+    return f"{CACHE_KEY_PREFIX}:{hashlib.sha1(encoded).hexdigest()}"
+
+
+def get_cached_result(key, index_name, connection):
+    """Return the cached result for `key`, or None on a miss or backend error."""
+    try:
+        cached = cache.get(key)
+    except Exception:
+        return None
+    if not cached:
+        return None
+    result = dict(cached)
+    result["meta"] = dict(result["meta"])
+    if isinstance(result.get("results"), dict) and _RAW_RESPONSE_KEY in result["results"]:
+        # Rebuild the Response so schemas can read hits and `hit.meta` as usual.
+        s = Search(index=index_name, using=connection)
+        result["results"] = Response(s, result["results"][_RAW_RESPONSE_KEY])
+    return result
+
+
+def set_cached_result(key, result, params):
+    """Store `result` under `key` with a shape-dependent TTL (best-effort)."""
+    to_store = dict(result)
+    if isinstance(to_store.get("results"), Response):
+        to_store["results"] = {_RAW_RESPONSE_KEY: to_store["results"].to_dict()}
+    try:
+        cache.set(key, to_store, timeout=get_cache_timeout(params))
+    except Exception:
+        pass
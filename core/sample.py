@@ -0,0 +1,97 @@
+"""`sample=` via an indexed per-document random key (SAMPLE_RANDOM_KEY_FIELD).
+
+`sort_with_sample` wraps the query in `function_score`/`random_score`, which
+scores every matching doc. When works carry a uniform random key in [0, 1), a
+sample is instead the matching docs in key order starting at an offset and
+wrapping around at 1:
+
+    [offset, 1) ascending, then [0, offset) ascending
+
+The offset is a hash of `seed` (so seeded samples stay reproducible) or random
+per request. Each page is a sorted range query, which ES answers from doc
+values without scoring:
+
+  - head query: a `post_filter` for key >= offset, plus filter aggs counting
+    the head and the tail (together, the total)
+  - tail query, only when the page runs past the head: key < offset
+"""
+import hashlib
+import random
+
+from elasticsearch_dsl import Q
+from elasticsearch_dsl.response import Response
+
+import settings
+from core.paginate import get_pagination
+
+HEAD_COUNT_AGG = "sample_head_count"
+TAIL_COUNT_AGG = "sample_tail_count"
+
+
+def get_random_key_field(params, index_name):
+    """The random key field to sample with, or None for `sort_with_sample`."""
+    field = settings.SAMPLE_RANDOM_KEY_FIELD
+    if (
+        not field
+        or not params.get("sample")
+        or params.get("cursor")
+        or params.get("group_by")
+        or not index_name.startswith("works")
+    ):
+        return None
+    return field
+
+
+def get_sample_offset(seed):
+    if not seed:
+        return random.random()
+    digest = hashlib.sha1(str(seed).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+def sort_with_random_key(s, field):
+    return s.sort(field, "id")
+
+
+def execute_random_key_sample(s, params, field):
+    """One page of the sample, as a single Response: hits in wraparound key
+    order, `hits.total` the full match count."""
+    paginate = get_pagination(params)
+    start, end = paginate.start, paginate.end
+    offset = get_sample_offset(params.get("seed"))
+
+    head_range = Q("range", **{field: {"gte": offset}})
+    tail_range = Q("range", **{field: {"lt": offset}})
+    # aggs see the whole query (post_filter only narrows the hits), so the two
+    # counts give the head size and the total
+    head = s.post_filter(head_range).extra(track_total_hits=False)
+    head.aggs.bucket(HEAD_COUNT_AGG, "filter", head_range)
+    head.aggs.bucket(TAIL_COUNT_AGG, "filter", tail_range)
+    response = head[start:end].execute()
+
+    raw = response.to_dict()
+    aggs = raw["aggregations"]
+    head_count = aggs.pop(HEAD_COUNT_AGG)["doc_count"]
+    tail_count = aggs.pop(TAIL_COUNT_AGG)["doc_count"]
+    if not aggs:
+        del raw["aggregations"]
+    raw["hits"]["total"] = {"value": head_count + tail_count, "relation": "eq"}
+
+    if end > head_count and tail_count:
+        tail = s.filter(tail_range).extra(track_total_hits=False)
+        tail_response = tail[max(0, start - head_count):end - head_count].execute()
+        raw["hits"]["hits"].extend(tail_response.to_dict()["hits"]["hits"])
+        raw["took"] += tail_response.took
+
+    return Response(s, raw)
+
+
+def random_key_document(s, field):
+    """Search for one random document: the first at or after a random offset,
+    wrapping around to the lowest key."""
+    offset = random.random()
+    s = sort_with_random_key(s, field).extra(size=1)
+    response = s.filter(Q("range", **{field: {"gte": offset}})).execute()
+    if not response.hits:
+        response = s.execute()
+    return response
@@ -10,6 +10,8 @@ _GROUP_BY_METRIC_PREFIXES = ("mean_", "sum_", "min_", "max_")
 
 class MetaSchema(Schema):
     count = fields.Int()
+    # Only with count_mode=lower_bound: whether `count` is exact or a lower bound.
+    count_is_exact = fields.Bool()
     q = fields.Str()
     db_response_time_ms = fields.Int()
     page = fields.Int()
@@ -9,13 +9,17 @@ Usage:
     GET /works?search.semantic=climate+change&filter=is_oa:true
 """
 
+import hashlib
 import threading
 import time
+from array import array
+from collections import OrderedDict
 
 import requests as http_requests
 
 import settings
 from core.exceptions import APIQueryParamsError
+from extensions import cache
 
 # Databricks embedding model config
 EMBEDDING_MODEL = "databricks-gte-large-en"
@@ -29,6 +33,20 @@ _token_lock = threading.Lock()
 _cached_access_token = None
 _cached_token_expires_at = 0.0
 
+# Query embedding cache: normalized query text -> float32 bytes (4 KB per
+# 1024-dim vector), in a process-local LRU backed by Redis. Paging through a
+# semantic query, or repeating a popular one, skips the embedding call.
+EMBEDDING_CACHE_MAX_SIZE = 2000
+EMBEDDING_CACHE_PREFIX = "embedding"
+
+_embedding_cache = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+# Identical queries embedded concurrently share one outbound call: the first
+# caller fetches, the others wait on its _InFlight.
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
 
 def _get_access_token() -> str:
     global _cached_access_token, _cached_token_expires_at
@@ -63,15 +81,72 @@ def _get_access_token() -> str:
         return _cached_access_token
 
 
+def normalize_query_text(query_text: str) -> str:
+    """Collapse whitespace and truncate to stay within model limits."""
+    return " ".join(query_text.split())[:2000]
+
+
+def _embedding_cache_key(text):
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return f"{EMBEDDING_CACHE_PREFIX}:{EMBEDDING_MODEL}:{digest}"
+
+
+def _pack(embedding):
+    return array("f", embedding).tobytes()
+
+
+def _unpack(packed):
+    return array("f", packed).tolist()
+
+
+def _get_cached_embedding(key):
+    with _embedding_cache_lock:
+        packed = _embedding_cache.get(key)
+        if packed is not None:
+            _embedding_cache.move_to_end(key)
+            return packed
+    try:
+        packed = cache.get(key)
+    except Exception:
+        packed = None
+    if packed is not None:
+        _set_local_embedding(key, packed)
+    return packed
+
+
+def _set_local_embedding(key, packed):
+    with _embedding_cache_lock:
+        _embedding_cache[key] = packed
+        _embedding_cache.move_to_end(key)
+        while len(_embedding_cache) > EMBEDDING_CACHE_MAX_SIZE:
+            _embedding_cache.popitem(last=False)
+
+
+def _set_cached_embedding(key, packed):
+    _set_local_embedding(key, packed)
+    try:
+        cache.set(key, packed, timeout=settings.EMBEDDING_CACHE_TIMEOUT)
+    except Exception:
+        pass
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.packed = None
+        self.error = None
+
+
 def embed_query(query_text: str) -> list:
     """
     Embed query text using Databricks GTE model via Foundation Model API.
 
-    Uses direct REST API call to model serving endpoint for low latency
-    (typically <200ms vs 1-2s via SQL warehouse).
+    Embeddings are cached by normalized query text (local LRU, then Redis), and
+    concurrent requests for the same text wait on a single outbound call.
+    Vectors are stored as float32, the precision of the ES dense_vector field.
 
     Args:
-        query_text: Text to embed (will be truncated to 2000 chars)
+        query_text: Text to embed (whitespace-collapsed, truncated to 2000 chars)
 
     Returns:
         List of floats (1024-dimensional embedding)
@@ -82,9 +157,45 @@ def embed_query(query_text: str) -> list:
     if not query_text or not query_text.strip():
         raise APIQueryParamsError("Search query is required for semantic search")
 
-    # Truncate to stay within model limits
-    truncated = query_text[:2000]
+    text = normalize_query_text(query_text)
+    key = _embedding_cache_key(text)
+
+    packed = _get_cached_embedding(key)
+    if packed is not None:
+        return _unpack(packed)
+
+    with _in_flight_lock:
+        in_flight = _in_flight.get(key)
+        is_leader = in_flight is None
+        if is_leader:
+            in_flight = _in_flight[key] = _InFlight()
+
+    if not is_leader:
+        if not in_flight.done.wait(timeout=30):
+            raise APIQueryParamsError("Failed to embed query: timed out")
+        if in_flight.error is not None:
+            raise in_flight.error
+        return _unpack(in_flight.packed)
 
+    try:
+        in_flight.packed = _pack(_fetch_embedding(text))
+        _set_cached_embedding(key, in_flight.packed)
+        return _unpack(in_flight.packed)
+    except Exception as e:
+        in_flight.error = e
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        in_flight.done.set()
+
+
+def _fetch_embedding(text: str) -> list:
+    """Call the model serving endpoint directly.
+
+    Direct REST API call for low latency (typically <200ms vs 1-2s via SQL
+    warehouse).
+    """
     host = settings.DATABRICKS_HOST
     if not host:
         raise APIQueryParamsError("Semantic search is not configured")
@@ -99,7 +210,7 @@ def embed_query(query_text: str) -> list:
         "Content-Type": "application/json"
     }
 
-    payload = {"model": EMBEDDING_MODEL, "input": truncated}
+    payload = {"model": EMBEDDING_MODEL, "input": text}
 
     try:
         response = http_requests.post(url, headers=headers, json=payload, timeout=30)
@@ -109,5 +220,3 @@ def embed_query(query_text: str) -> list:
         return [float(x) for x in embedding]
     except Exception as e:
         raise APIQueryParamsError(f"Failed to embed query: {str(e)}")
-
-
@@ -1,10 +1,22 @@
+import json
+import logging
+import threading
+import time
 from collections import OrderedDict
 
-from elasticsearch.exceptions import RequestError
-from elasticsearch_dsl import Search
+from elasticsearch.exceptions import NotFoundError, RequestError
+from elasticsearch_dsl import Search, connections
 
 import settings
-from core.cursor import get_next_cursor, handle_cursor
+from core.cursor import (
+    decode_pit_cursor,
+    encode_cursor,
+    encode_pit_cursor,
+    get_group_by_after_key,
+    get_next_cursor,
+    handle_cursor,
+    parse_cursor_slice,
+)
 from core.exceptions import APIPaginationError, APIQueryParamsError
 from core.filter import filter_records
 from core.group_by.results import (
@@ -15,6 +27,7 @@ from core.group_by.results import (
 )
 from core.group_by.filter import filter_group_by
 from core.group_by.utils import (
+    get_bucket_keys,
     parse_group_by,
     parse_group_by_dimensions,
     is_multi_dim_group_by,
@@ -24,23 +37,48 @@ from core.group_by.buckets import (
     add_meta_sums,
     create_group_by_buckets,
     create_nested_group_by_buckets,
+    uses_composite_buckets,
 )
+from core.admission import admit_query
 from core.knn import KNNQueryWithFilter
 from core.paginate import get_pagination
 from core.params import parse_params
 from core.preference import clean_preference, combine_preferences, set_preference_for_filter_search
+from core.result_cache import (
+    get_cache_key,
+    get_cached_result,
+    is_result_cacheable,
+    set_cached_result,
+)
+from core.sample import execute_random_key_sample, get_random_key_field, sort_with_random_key
 from core.search import SearchOpenAlex, check_is_search_query, full_search_query, full_search_query_exact, scoped_search_query, strip_singleton_wildcard_quotes, validate_search_terms, validate_top_level_search_wildcard
 from core.semantic_search import embed_query, VECTOR_FIELD
 from core.sort import get_sort_fields, sort_with_cursor, sort_with_sample
 from core.utils import get_data_version_connection, get_field
 from core.vector_index import vector_semantic_search
 
+logger = logging.getLogger(__name__)
+
 
-def shared_view(request, fields_dict, index_name, default_sort, connection=None, default_filters=None):
-    """Primary function used to search, filter, and aggregate across all entities."""
+def shared_view(request, fields_dict, index_name, default_sort, connection=None, default_filters=None, source_includes=None, default_count_mode=None):
+    """Primary function used to search, filter, and aggregate across all entities.
+
+    `source_includes` (see core.utils.get_source_includes) narrows the `_source`
+    ES returns for hits to what the caller's `select=` will serialize.
+    `default_count_mode` is the route's count mode when the request sets no
+    `count_mode` (else DEFAULT_COUNT_MODE, see get_count_mode).
+    """
     if connection is None:
         connection = get_data_version_connection(request)
     params = parse_params(request)
+    params["source_includes"] = source_includes
+    params["count_mode"] = params["count_mode"] or default_count_mode
+    export_format = (request.args.get("format") or "").lower()
+    if export_format in ("ndjson", "jsonl.gz"):
+        # only the /works list and single group_by exports stream (works/views.py)
+        raise APIQueryParamsError(
+            f"format={export_format} is only supported for /works lists and single group_by exports."
+        )
 
     # Merge default filters with user filters
     if default_filters:
@@ -60,15 +98,403 @@ def shared_view(request, fields_dict, index_name, default_sort, connection=None,
     if is_semantic and settings.USE_VECTOR_INDEX:
         return vector_semantic_search(params, index_name, connection)
 
+    cache_key = None
+    if is_result_cacheable(request, params):
+        cache_key = get_cache_key(params, fields_dict, index_name, connection)
+        result = get_cached_result(cache_key, index_name, connection)
+        if result is not None:
+            attach_x_query(result, request, index_name)
+            return result
+
+    result = get_lakebase_id_list_result(request, params, index_name, default_sort)
+    if result is not None:
+        attach_x_query(result, request, index_name)
+        return result
+
     s = construct_query(params, fields_dict, index_name, default_sort, connection)
-    response = execute_search(s, params)
-    result = format_response(response, params, index_name, fields_dict, s, connection)
+    s = set_point_in_time(params, s, index_name, connection)
+    try:
+        response = execute_search(s, params)
+        result = format_response(response, params, index_name, fields_dict, s, connection)
+    except Exception:
+        # no cursor will carry a PIT this request opened; don't leave it open
+        # for the keep-alive
+        if params.get("pit") and params["cursor"] == "*":
+            close_point_in_time(params, connection)
+        raise
+    if cache_key and not result["meta"].get("timed_out"):
+        set_cached_result(cache_key, result, params)
     attach_x_query(result, request, index_name)
     if settings.DEBUG:
         print(s.to_dict())
     return result
 
 
+def shared_export_view(request, fields_dict, index_name, default_sort, connection=None, default_filters=None, source_includes=None, max_rows=None):
+    """Pages of hits for one response of a list export (core/export.py).
+
+    The query is built and validated up front, so bad params still 400. The
+    returned PitPages then walks point-in-time `search_after` pages of
+    EXPORT_BATCH_SIZE hits for at most `max_rows` rows or EXPORT_TIME_BUDGET
+    seconds; `cursor=<X-Next-Cursor>` resumes the export where the previous
+    response stopped.
+    """
+    if connection is None:
+        connection = get_data_version_connection(request)
+    params = parse_params(request)
+    params["source_includes"] = source_includes
+
+    if default_filters:
+        if params["filters"] is None:
+            params["filters"] = default_filters
+        else:
+            params["filters"] = default_filters + params["filters"]
+
+    if params["group_by"] or params["group_bys"]:
+        raise APIQueryParamsError("Streamed exports do not support group_by.")
+    if params["sample"]:
+        raise APIQueryParamsError("Streamed exports do not support sample.")
+    if params["page"] != 1:
+        raise APIPaginationError(
+            "Exports page with the cursor parameter; remove the page parameter."
+        )
+    state = None
+    if params["cursor"] and params["cursor"] != "*":
+        state = decode_pit_cursor(params["cursor"])
+        if state is None:
+            raise APIPaginationError(
+                "To resume an export, pass the X-Next-Cursor header of its previous response as cursor."
+            )
+    if params.get("search_type") == "semantic" or any(
+        search["search_type"] == "semantic" for search in params.get("searches") or []
+    ):
+        raise APIQueryParamsError("Streamed exports do not support search.semantic.")
+    # order like cursor paging: explicit sort plus the default sort as tiebreakers
+    params["cursor"] = "*"
+
+    s = construct_query(params, fields_dict, index_name, default_sort, connection)
+    return PitPages(s, index_name, connection, max_rows, state)
+
+
+def shared_group_by_export_view(request, fields_dict, index_name, default_sort, connection=None, default_filters=None, max_rows=None):
+    """Pages of groups for one response of a single-field group_by's NDJSON
+    export (core.export.export_group_by_stream).
+
+    The group_by runs as a cursor walk over its `composite` agg (see
+    core.group_by.buckets.uses_composite_buckets), EXPORT_BATCH_SIZE buckets per
+    page, for at most `max_rows` groups or EXPORT_TIME_BUDGET seconds;
+    `cursor=<X-Next-Cursor>` resumes the export after the last group returned.
+    Bad params 400 up front.
+    """
+    if connection is None:
+        connection = get_data_version_connection(request)
+    params = parse_params(request)
+
+    if default_filters:
+        if params["filters"] is None:
+            params["filters"] = default_filters
+        else:
+            params["filters"] = default_filters + params["filters"]
+
+    if params["group_bys"] or is_multi_dim_group_by(params["group_by"]):
+        raise APIQueryParamsError(
+            "Streamed group_by exports support a single group_by field."
+        )
+    if params["sample"]:
+        raise APIQueryParamsError("Streamed exports do not support sample.")
+    if params["page"] != 1:
+        raise APIPaginationError(
+            "Exports page with the cursor parameter; remove the page parameter."
+        )
+    # a resumed export starts after the cursor's key (create_group_by_buckets)
+    params["cursor"] = params["cursor"] or "*"
+    params["per_page"] = settings.EXPORT_BATCH_SIZE
+
+    group_by, include_unknown = parse_group_by(params["group_by"])
+    if not uses_composite_buckets(get_field(fields_dict, group_by), params):
+        raise APIQueryParamsError(
+            f"Streamed exports of group_by={group_by} support sort=key:asc|desc only."
+        )
+
+    s = construct_query(params, fields_dict, index_name, default_sort, connection)
+    return GroupByPages(
+        s, params, group_by, include_unknown, index_name, fields_dict, connection, max_rows
+    )
+
+
+class GroupByPages:
+    """Pages of formatted groups in one export response, following the composite
+    agg's `after_key` until the buckets run out, `max_rows` buckets are read or
+    EXPORT_TIME_BUDGET seconds have gone by. In the latter two cases
+    `next_cursor` is then the group_by cursor of the last bucket read. Each page
+    is admission-controlled (core/admission.py)."""
+
+    def __init__(self, s, params, group_by, include_unknown, index_name, fields_dict, connection, max_rows=None):
+        self.s = s
+        self.params = params
+        self.group_by = group_by
+        self.include_unknown = include_unknown
+        self.index_name = index_name
+        self.fields_dict = fields_dict
+        self.connection = connection
+        self.max_rows = max_rows
+        self.next_cursor = None
+
+    def __iter__(self):
+        s = self.s
+        agg_name = get_bucket_keys(self.group_by)["default"]
+        deadline = time.monotonic() + settings.EXPORT_TIME_BUDGET
+        remaining = self.max_rows
+        while True:
+            # ask for no more buckets than the response has room for, so none
+            # are read and then dropped
+            size = self.params["per_page"]
+            if remaining is not None:
+                size = min(size, remaining)
+            s.aggs[agg_name].size = size
+            # the same Search is re-run with a new `after`; skip its cached response
+            with admit_query(s):
+                response = s.execute(ignore_cache=True)
+            groups = get_group_by_results(
+                self.group_by, self.include_unknown, self.params, self.index_name,
+                self.fields_dict, response, self.connection, zero_values=False,
+            )
+            if groups:
+                yield groups
+            after_key = get_group_by_after_key(self.params["group_by"], response)
+            n_buckets = len(response.aggregations[agg_name].buckets)
+            if after_key is None or n_buckets < size:
+                return
+            if remaining is not None:
+                remaining -= n_buckets
+            if remaining == 0 or time.monotonic() >= deadline:
+                self.next_cursor = encode_cursor(after_key)
+                return
+            s.aggs[agg_name].after = {"sub_key": after_key}
+
+
+class PitPages:
+    """Pages of hits for `s` in one export response, walking `search_after` under
+    a point in time so an export's pages -- across responses too -- are one
+    consistent snapshot.
+
+    Iterating stops at the end of the results, after `max_rows` hits, or once
+    EXPORT_TIME_BUDGET seconds have gone by; in the latter two cases
+    `next_cursor` is then the cursor that resumes the export, and the PIT is
+    kept open for it (it expires after EXPORT_PIT_KEEP_ALIVE). The PIT is closed
+    when the export ends, or when this response opened it and the walk fails or
+    its consumer stops early. Each page is admission-controlled (core/admission.py).
+    """
+
+    def __init__(self, s, index_name, connection, max_rows=None, state=None):
+        self.s = s
+        self.index_name = index_name
+        self.connection = connection
+        self.max_rows = max_rows
+        self.state = state
+        self.next_cursor = None
+
+    def __iter__(self):
+        batch_size = settings.EXPORT_BATCH_SIZE
+        keep_alive = settings.EXPORT_PIT_KEEP_ALIVE
+        deadline = time.monotonic() + settings.EXPORT_TIME_BUDGET
+        es = connections.get_connection(self.connection)
+        if self.state is None:
+            pit_id = es.open_point_in_time(index=self.index_name, keep_alive=keep_alive)["id"]
+            search_after = None
+        else:
+            pit_id, search_after = self.state["pit"], self.state["search_after"]
+
+        # PIT searches name no index and accept no preference; the hit count isn't
+        # needed per page.
+        s = self.s.index().params(preference=None).extra(track_total_hits=False)
+        remaining = self.max_rows
+        close = self.state is None
+        try:
+            while True:
+                size = batch_size if remaining is None else min(batch_size, remaining)
+                page = s.extra(size=size, pit={"id": pit_id, "keep_alive": keep_alive})
+                if search_after is not None:
+                    page = page.extra(search_after=search_after)
+                with admit_query(page, hits=size):
+                    response = page.execute()
+                pit_id = response.to_dict().get("pit_id", pit_id)
+                hits = list(response)
+                if hits:
+                    yield hits
+                if len(hits) < size:
+                    close = True
+                    return
+                if remaining is not None:
+                    remaining -= len(hits)
+                search_after = list(hits[-1].meta.sort)
+                if remaining == 0 or time.monotonic() >= deadline:
+                    self.next_cursor = encode_pit_cursor(pit_id, search_after, None)
+                    close = False
+                    return
+        finally:
+            if close:
+                try:
+                    es.close_point_in_time(id=pit_id)
+                except Exception:
+                    # expires on its own after keep_alive
+                    logger.info("export_pit_close_failed index=%s", self.index_name)
+
+
+# Filter keys that select works by OpenAlex ID (works/fields.py), and the only
+# other filter an ID-list request may carry (the injected corpus default).
+_ID_LIST_FILTER_KEYS = {"ids.openalex", "openalex", "openalex_id"}
+
+
+def get_id_list_work_ids(params, index_name):
+    """Work ids (ints) when the request is just `filter=ids.openalex:W1|W2|...`.
+
+    Returns None unless the result is exactly those docs in default-sort order:
+    a single OR'd ID filter (plus an optional `is_xpac`), first page, and no
+    search, sort, sample, cursor, grouping or sums.
+    """
+    if not index_name.startswith("works"):
+        return None
+    if (
+        params.get("search")
+        or params.get("searches")
+        or params.get("sort")
+        or params.get("sample")
+        or params.get("cursor")
+        or params.get("group_by")
+        or params.get("group_bys")
+        or params.get("q")
+        or params.get("apc_sum")
+        or params.get("cited_by_count_sum")
+        or params.get("page") != 1
+    ):
+        return None
+
+    id_values = None
+    for f in params.get("filters") or []:
+        for key, value in f.items():
+            if key in _ID_LIST_FILTER_KEYS and id_values is None:
+                id_values = value.split("|")
+            elif key != "is_xpac" or value not in ("true", "false"):
+                return None
+    if not id_values or len(id_values) > params["per_page"]:
+        return None
+
+    from works.lakebase import parse_work_id
+
+    work_ids = [parse_work_id(v) for v in id_values]
+    if None in work_ids:
+        return None
+    return list(dict.fromkeys(work_ids))
+
+
+def _sort_docs_like_es(docs, sort_fields):
+    """Order docs the way ES would for `sort_fields` (missing values last)."""
+
+    def get_value(doc, path):
+        for part in path.split("."):
+            if not isinstance(doc, dict):
+                return None
+            doc = doc.get(part)
+        return doc
+
+    docs = list(docs)
+    for sort_field in reversed(sort_fields):
+        path = sort_field.lstrip("-")
+        present = [d for d in docs if get_value(d, path) is not None]
+        missing = [d for d in docs if get_value(d, path) is None]
+        present.sort(key=lambda d: get_value(d, path), reverse=sort_field.startswith("-"))
+        docs = present + missing
+    return docs
+
+
+def get_lakebase_id_list_result(request, params, index_name, default_sort):
+    """Serve an ID-list works request from Lakebase (oxjob #576), or return None.
+
+    Falls through to ES on any error, or if any requested id is missing from
+    Lakebase (it may still exist in ES).
+    """
+    # Imported lazily: the `works` package imports its views, which import
+    # this module.
+    from works import lakebase
+
+    if not lakebase.should_route(request):
+        return None
+    work_ids = get_id_list_work_ids(params, index_name)
+    if not work_ids:
+        return None
+
+    t0 = time.time()
+    try:
+        docs = lakebase.get_work_docs(work_ids)
+    except Exception:
+        logger.exception("lakebase_lookup backend=lakebase outcome=error id_kind=id_list; falling back to ES")
+        return None
+    fetch_ms = (time.time() - t0) * 1000
+    if None in docs:
+        logger.info("lakebase_lookup backend=es_fallback outcome=miss id_kind=id_list fetch_ms=%.1f", fetch_ms)
+        return None
+    logger.info("lakebase_lookup backend=lakebase outcome=hit id_kind=id_list fetch_ms=%.1f", fetch_ms)
+
+    for f in params["filters"]:
+        if "is_xpac" in f:
+            want = f["is_xpac"] == "true"
+            docs = [d for d in docs if d.get("is_xpac") is want]
+    docs = _sort_docs_like_es(docs, default_sort)
+
+    result = OrderedDict()
+    result["meta"] = {
+        "count": len(docs),
+        "db_response_time_ms": int(fetch_ms),
+        "page": 1,
+        "per_page": params["per_page"],
+        "groups_count": None,
+    }
+    if get_count_mode(params) == "lower_bound":
+        # every requested doc was found, so the count is exact (cf. format_meta)
+        result["meta"]["count_is_exact"] = True
+    result["group_by"] = []
+    result["results"] = [lakebase.LakebaseHit(d) for d in docs]
+    return result
+
+
+# Request args `attach_x_query` reads; together with the entity type they fully
+# determine the echo, so they are its memo key.
+_X_QUERY_ARGS = (
+    "filter",
+    "sort",
+    "sample",
+    "group_by",
+    "group-by",
+    "group_bys",
+    "group-bys",
+    "select",
+    "seed",
+    "per-page",
+    "per_page",
+    "page",
+    "cursor",
+    "search",
+    "search.semantic",
+    "search.exact",
+    "search.title",
+    "search.title.exact",
+    "search.title_and_abstract",
+    "search.title_and_abstract.exact",
+    "include_xpac",
+    "include-xpac",
+)
+
+_x_query_cache = OrderedDict()
+_x_query_cache_lock = threading.Lock()
+_X_QUERY_MISS = object()
+
+
+def is_x_query_requested(request):
+    """`x_query=false` opts a client out of the echo (and its cost)."""
+    return (request.args.get("x_query") or "").lower() != "false"
+
+
 def attach_x_query(result, request, index_name):
     """Attach the private `meta.x_query` echo {oql, oqo, url} so the GUI can source
     its chip state from the server's canonical query object instead of re-parsing
@@ -83,80 +509,116 @@ def attach_x_query(result, request, index_name):
     server-injected defaults (e.g. `is_xpac:false`), but x_query must mirror the
     user's own query so the chips match what the user typed.
 
-    `entity_resolver` is left as None (default) on this path — resolving entity
-    display names would add per-request ES lookups to every SERP call. The
-    legacy-path `oql` therefore renders bare IDs; that's fine because the client
-    sources chips from `url`, and the "too complex → view as OQL" card (which is
-    the only consumer of `oql`) only appears when `url is None`, which never
-    happens for a query that arrived as a URL.
+    The echo is a pure function of (entity type, raw args), so it is memoized
+    in a bounded in-process LRU (X_QUERY_CACHE_MAX_SIZE). Entries are stored as
+    JSON and decoded per response, so no response shares (or can mutate) another's
+    `meta.x_query`. Skipped when the client passes `x_query=false`.
 
     Known gap: the two-phase semantic search path returns earlier and never
-    reaches here. (The scoped-search family — `search.exact`, `search.title`,
-    `search.title_and_abstract`, and their `.exact` variants — IS threaded
-    since oxjob #633; before that a scoped search echoed as bare `works`, a
-    whole-corpus silent mis-scope for every x_query consumer.)
+    reaches here.
     """
     try:
         if not isinstance(result, dict) or "meta" not in result:
             return
-        # Imported lazily, at request time: `query_translation/__init__` imports
-        # `views`, which imports back from `core.shared_view`, so a module-level
-        # import here deadlocks when shared_view is the entry point of the import
-        # graph. By call time everything is fully initialized.
-        from query_translation.url_parser import parse_url_to_oqo
-        from query_translation.x_query import build_x_query
-
+        if not is_x_query_requested(request):
+            return
         entity_type = index_name.split("-")[0]
         if not entity_type:
             return
-        group_by_string = (
-            request.args.get("group_by") or request.args.get("group-by")
-            or request.args.get("group_bys") or request.args.get("group-bys")
-        )
-        oqo = parse_url_to_oqo(
-            entity_type=entity_type,
-            filter_string=request.args.get("filter"),
-            sort_string=request.args.get("sort"),
-            sample=request.args.get("sample", type=int),
-            group_by_string=group_by_string,
-            select_string=request.args.get("select"),
-            seed=request.args.get("seed"),
-            per_page=request.args.get("per-page", type=int)
-            or request.args.get("per_page", type=int),
-            page=request.args.get("page", type=int),
-            cursor=request.args.get("cursor"),
-            search_string=request.args.get("search"),
-            semantic_search_string=request.args.get("search.semantic"),
-            # The scoped-search family (validate.py 400s any other `search.*`
-            # spelling before we get here, so this can't pick up junk keys).
-            # `search.semantic` is excluded — it's threaded separately above.
-            scoped_searches={
-                p: request.args.get(p)
-                for p in (
-                    "search.exact",
-                    "search.title",
-                    "search.title.exact",
-                    "search.title_and_abstract",
-                    "search.title_and_abstract.exact",
-                )
-                if request.args.get(p)
-            }
-            or None,
-            include_xpac=(
-                request.args.get("include_xpac") == "true"
-                or request.args.get("include-xpac") == "true"
-            ),
-        )
-        result["meta"]["x_query"] = build_x_query(oqo)
+
+        key = (entity_type,) + tuple(request.args.get(arg) for arg in _X_QUERY_ARGS)
+        with _x_query_cache_lock:
+            x_query = _x_query_cache.get(key, _X_QUERY_MISS)
+            if x_query is not _X_QUERY_MISS:
+                _x_query_cache.move_to_end(key)
+        if x_query is _X_QUERY_MISS:
+            try:
+                x_query = build_request_x_query(request, entity_type)
+                if x_query is not None:
+                    x_query = json.dumps(x_query)
+            except Exception:
+                # deterministic for the key, so cache the miss too
+                x_query = None
+            with _x_query_cache_lock:
+                _x_query_cache[key] = x_query
+                while len(_x_query_cache) > settings.X_QUERY_CACHE_MAX_SIZE:
+                    _x_query_cache.popitem(last=False)
+        if x_query is not None:
+            result["meta"]["x_query"] = json.loads(x_query)
     except Exception:
         # Additive metadata only — never let it break the results response.
         pass
 
 
+def build_request_x_query(request, entity_type):
+    """Build the `meta.x_query` triple for a legacy entity request.
+
+    `entity_resolver` is left as None (default) on this path — resolving entity
+    display names would add per-request ES lookups to every SERP call. The
+    legacy-path `oql` therefore renders bare IDs; that's fine because the client
+    sources chips from `url`, and the "too complex → view as OQL" card (which is
+    the only consumer of `oql`) only appears when `url is None`, which never
+    happens for a query that arrived as a URL.
+
+    The scoped-search family — `search.exact`, `search.title`,
+    `search.title_and_abstract`, and their `.exact` variants — IS threaded
+    since oxjob #633; before that a scoped search echoed as bare `works`, a
+    whole-corpus silent mis-scope for every x_query consumer.
+
+    Every arg read here must be listed in `_X_QUERY_ARGS` (the memo key).
+    """
+    # Imported lazily, at request time: `query_translation/__init__` imports
+    # `views`, which imports back from `core.shared_view`, so a module-level
+    # import here deadlocks when shared_view is the entry point of the import
+    # graph. By call time everything is fully initialized.
+    from query_translation.url_parser import parse_url_to_oqo
+    from query_translation.x_query import build_x_query
+
+    group_by_string = (
+        request.args.get("group_by") or request.args.get("group-by")
+        or request.args.get("group_bys") or request.args.get("group-bys")
+    )
+    oqo = parse_url_to_oqo(
+        entity_type=entity_type,
+        filter_string=request.args.get("filter"),
+        sort_string=request.args.get("sort"),
+        sample=request.args.get("sample", type=int),
+        group_by_string=group_by_string,
+        select_string=request.args.get("select"),
+        seed=request.args.get("seed"),
+        per_page=request.args.get("per-page", type=int)
+        or request.args.get("per_page", type=int),
+        page=request.args.get("page", type=int),
+        cursor=request.args.get("cursor"),
+        search_string=request.args.get("search"),
+        semantic_search_string=request.args.get("search.semantic"),
+        # The scoped-search family (validate.py 400s any other `search.*`
+        # spelling before we get here, so this can't pick up junk keys).
+        # `search.semantic` is excluded — it's threaded separately above.
+        scoped_searches={
+            p: request.args.get(p)
+            for p in (
+                "search.exact",
+                "search.title",
+                "search.title.exact",
+                "search.title_and_abstract",
+                "search.title_and_abstract.exact",
+            )
+            if request.args.get(p)
+        }
+        or None,
+        include_xpac=(
+            request.args.get("include_xpac") == "true"
+            or request.args.get("include-xpac") == "true"
+        ),
+    )
+    return build_x_query(oqo)
+
+
 def construct_query(params, fields_dict, index_name, default_sort, connection):
     s = Search(index=index_name, using=connection)
 
-    s = set_source(index_name, s)
+    s = set_source(index_name, s, params.get("source_includes"))
 
     s = set_size(params, s)
 
@@ -188,7 +650,9 @@ def construct_query(params, fields_dict, index_name, default_sort, connection):
     return s
 
 
-def set_source(index_name, s):
+def set_source(index_name, s, includes=None):
+    if includes:
+        s = s.source(includes=includes)
     if index_name.startswith("works"):
         s = s.source(
             excludes=[
@@ -205,20 +669,119 @@ def set_source(index_name, s):
 
 
 def set_size(params, s):
-    # Set track_total_hits to true to get accurate counts beyond 10k for all queries
+    track_total_hits = get_track_total_hits(params)
     if params["group_by"]:
-        s = s.extra(size=0, track_total_hits=True)
+        s = s.extra(size=0, track_total_hits=track_total_hits)
     else:
-        s = s.extra(size=params["per_page"], track_total_hits=True)
+        s = s.extra(size=params["per_page"], track_total_hits=track_total_hits)
     return s
 
 
+def get_track_total_hits(params):
+    """`track_total_hits` for a query's count mode.
+
+    `exact` counts every match, so `meta.count` is accurate beyond 10k.
+    `lower_bound` stops counting at LOWER_BOUND_COUNT_THRESHOLD; `meta.count`
+    is then a lower bound and `meta.count_is_exact` says which it is.
+    (Point-in-time cursor pages after the first skip counting entirely, see
+    set_point_in_time.)
+    """
+    if get_count_mode(params) == "lower_bound":
+        return settings.LOWER_BOUND_COUNT_THRESHOLD
+    return True
+
+
+def get_count_mode(params):
+    return params.get("count_mode") or settings.DEFAULT_COUNT_MODE
+
+
+def is_count_exact(params, response):
+    pit = params.get("pit")
+    if pit and pit["count"] is not None:
+        return pit.get("count_is_exact", True)
+    total = response.hits.total
+    if total.relation == "eq":
+        return True
+    # a sample count below the tracked lower bound is still exact
+    return bool(params.get("sample") and params["sample"] <= total.value)
+
+
 def set_cursor_pagination(params, s):
     if not params["group_by"]:
         s = handle_cursor(params["cursor"], params["page"], s)
     return s
 
 
+def set_point_in_time(params, s, index_name, connection):
+    """Run cursor pages against an ES point in time (CURSOR_PIT).
+
+    `cursor=*` opens a PIT (optionally walking one `slice=<id>/<max>` of it) and
+    counts hits once; `next_cursor` then carries the PIT id, sort values, count
+    and slice (core.cursor.encode_pit_cursor), so every later page reads the same
+    snapshot and skips the total-hits count. Plain search_after cursors keep
+    running against the live index. Sets `params["pit"]` for format_meta.
+    """
+    cursor = params.get("cursor")
+    if params["group_by"] or not cursor or not settings.CURSOR_PIT:
+        if params.get("slice"):
+            raise APIPaginationError("The slice parameter requires cursor=*.")
+        return s
+
+    cursor_slice = parse_cursor_slice(params.get("slice"))
+    count = None
+    count_is_exact = True
+    if cursor == "*":
+        es = connections.get_connection(connection)
+        pit_id = es.open_point_in_time(
+            index=index_name, keep_alive=settings.CURSOR_PIT_KEEP_ALIVE
+        )["id"]
+    else:
+        state = decode_pit_cursor(cursor)
+        if state is None:
+            if cursor_slice:
+                raise APIPaginationError(
+                    "The slice parameter starts a sliced cursor and requires cursor=*."
+                )
+            return s
+        # Clients usually keep `slice` in the URL and only swap in next_cursor;
+        # the cursor carries the slice, so the param just has to agree with it.
+        state_slice = state.get("slice")
+        if cursor_slice and list(cursor_slice) != state_slice:
+            raise APIPaginationError(
+                f"slice={params['slice']} doesn't match the slice this cursor walks. "
+                "Keep the slice from the cursor=* request, or drop the parameter."
+            )
+        pit_id, count = state["pit"], state.get("count")
+        cursor_slice = state_slice
+        count_is_exact = state.get("count_is_exact", True)
+        if count is not None:
+            s = s.extra(track_total_hits=False)
+
+    params["pit"] = {
+        "id": pit_id,
+        "count": count,
+        "count_is_exact": count_is_exact,
+        "slice": cursor_slice,
+    }
+    # PIT searches name no index and accept no preference.
+    s = s.index().params(preference=None).extra(
+        pit={"id": pit_id, "keep_alive": settings.CURSOR_PIT_KEEP_ALIVE}
+    )
+    if cursor_slice:
+        s = s.extra(slice={"id": cursor_slice[0], "max": cursor_slice[1]})
+    return s
+
+
+def close_point_in_time(params, connection):
+    """Release a cursor's PIT once its last page has been served."""
+    try:
+        es = connections.get_connection(connection)
+        es.close_point_in_time(id=params["pit"]["id"])
+    except Exception:
+        # expires on its own after CURSOR_PIT_KEEP_ALIVE
+        logger.info("cursor_pit_close_failed")
+
+
 def citation_boost_needed(params):
     """Whether the citation boost can affect the response.
 
@@ -472,7 +1035,13 @@ def apply_sorting(params, fields_dict, default_sort, index_name, s):
             default_sort, fields_dict, params["group_by"], s, params["sort"]
         )
     elif params["sample"]:
-        s = sort_with_sample(s, params["seed"])
+        random_key_field = get_random_key_field(params, index_name)
+        if random_key_field:
+            # execute_search pages it as a random-key sample
+            params["random_key_field"] = random_key_field
+            s = sort_with_random_key(s, random_key_field)
+        else:
+            s = sort_with_sample(s, params["seed"])
     elif params["sort"]:
         sort_fields = get_sort_fields(fields_dict, params["group_by"], params["sort"])
 
@@ -556,26 +1125,37 @@ def execute_search(s, params):
     # than hard-cancelling. Applies to both search and group_by aggregations below.
     s = s.params(timeout='5s')
 
-    if params["group_by"]:
-        return s.execute()
-    else:
-        try:
-            return s[paginate.start:paginate.end].execute()
-        except RequestError as e:
-            if "search_after has" in str(e) and "sort has" in str(e):
-                raise APIPaginationError("Cursor value is invalid.")
-            # Defense-in-depth: the app->ES request line overflowing ES's
-            # http.max_initial_line_length (4096 B) used to surface as a raw
-            # 500. The preference value is now hashed (core/preference.py) so
-            # this should not fire for search, but if any path still produces
-            # an over-long ES request line, return a clear 4xx, not a 500.
-            if "too_long_http_line" in str(e):
-                raise APIQueryParamsError(
-                    "Your query is too long. Split a large Boolean query into "
-                    "smaller chunks, request each separately, and combine the "
-                    "returned IDs client-side."
-                )
-            raise e
+    # Expensive queries (sample, group_by, deep pages, many ids/wildcards) wait
+    # for a slot in a bounded pool, or 429 (core/admission.py).
+    with admit_query(s, 0 if params["group_by"] else paginate.end):
+        if params.get("random_key_field"):
+            return execute_random_key_sample(s, params, params["random_key_field"])
+        if params["group_by"]:
+            return s.execute()
+        else:
+            try:
+                return s[paginate.start:paginate.end].execute()
+            except NotFoundError as e:
+                if params.get("pit"):
+                    raise APIPaginationError(
+                        "Cursor has expired. Restart paging with cursor=*."
+                    )
+                raise e
+            except RequestError as e:
+                if "search_after has" in str(e) and "sort has" in str(e):
+                    raise APIPaginationError("Cursor value is invalid.")
+                # Defense-in-depth: the app->ES request line overflowing ES's
+                # http.max_initial_line_length (4096 B) used to surface as a raw
+                # 500. The preference value is now hashed (core/preference.py) so
+                # this should not fire for search, but if any path still produces
+                # an over-long ES request line, return a clear 4xx, not a 500.
+                if "too_long_http_line" in str(e):
+                    raise APIQueryParamsError(
+                        "Your query is too long. Split a large Boolean query into "
+                        "smaller chunks, request each separately, and combine the "
+                        "returned IDs client-side."
+                    )
+                raise e
 
 
 def format_response(response, params, index_name, fields_dict, s, connection='default'):
@@ -597,6 +1177,9 @@ def format_response(response, params, index_name, fields_dict, s, connection='de
     if params["q"] and params["q"] != "''":
         result = search_group_by_strings_with_q(params, result)
 
+    if params.get("pit") and not result["meta"].get("next_cursor"):
+        close_point_in_time(params, connection)
+
     return result
 
 
@@ -615,12 +1198,18 @@ def format_meta(response, params, s):
         else None,
     }
 
+    if get_count_mode(params) == "lower_bound":
+        meta["count_is_exact"] = is_count_exact(params, response)
+
     # oxjob #521: surface partial results when the 5s ES timeout fires, so callers
     # don't treat an incomplete result/count as authoritative.
     if getattr(response, "timed_out", False):
         meta["timed_out"] = True
 
     if params.get("cursor"):
+        if params.get("pit"):
+            params["pit"]["count"] = meta["count"]
+            params["pit"]["count_is_exact"] = meta.get("count_is_exact", True)
         meta["next_cursor"] = get_next_cursor(params, response)
 
     if (
@@ -672,6 +1261,10 @@ def format_group_bys(response, params, index_name, fields_dict, connection='defa
 
 
 def calculate_sample_or_default_count(params, response):
+    pit = params.get("pit")
+    if pit and pit["count"] is not None:
+        # later point-in-time cursor pages skip the count; it rides in the cursor
+        return pit["count"]
     count = response.hits.total.value
     if params.get("sample") and params["sample"] < count:
         return params["sample"]
@@ -1,6 +1,9 @@
 import re
+import threading
+import time
 
-from elasticsearch_dsl import Search
+from elasticsearch_dsl import MultiSearch, Search
+from marshmallow import fields
 
 import settings
 from core.exceptions import APIQueryParamsError
@@ -228,6 +231,30 @@ def process_only_fields(request, schema):
     return only_fields
 
 
+def get_source_includes(request, schema):
+    """ES `_source` includes covering the fields in `select=`, or None for all.
+
+    A schema field reads `_source` at its `attribute` (default: its name) unless
+    it declares `metadata={"es_source": [...]}`. Method/Function fields can read
+    anything, so one without a declaration turns the pushdown off.
+    """
+    select = request.args.get("select")
+    if not select:
+        return None
+    includes = set()
+    for name in select.split(","):
+        field = schema._declared_fields.get(name.strip())
+        if field is None:
+            return None
+        if "es_source" in field.metadata:
+            includes.update(field.metadata["es_source"])
+        elif isinstance(field, (fields.Method, fields.Function)):
+            return None
+        else:
+            includes.add(field.attribute or name.strip())
+    return sorted(includes) or None
+
+
 def dump_field_names_recurse(field, collected=None, prefix=None):
     if collected is None:
         collected = []
@@ -273,11 +300,22 @@ def get_display_name(openalex_id):
     return display_name
 
 
+# Per-connection (counts, fetched_at). Served stale while a background thread
+# refreshes, so /counts and /entities only wait on ES for the first request
+# after boot.
+_entity_counts_cache = {}
+_entity_counts_refreshing = set()
+_entity_counts_lock = threading.Lock()
+
+
 def get_entity_counts(request=None, connection=None):
     """
     Get counts for all entity types from Elasticsearch.
     Returns a dictionary mapping entity type names to their counts.
 
+    All indexes are counted in a single _msearch, and the result is cached per
+    connection for ENTITY_COUNTS_CACHE_SECONDS, then refreshed in the background.
+
     Args:
         request: Flask request object (preferred - will auto-detect data version)
         connection: The Elasticsearch connection to use ('default' or 'walden') - only if request not provided
@@ -310,9 +348,49 @@ def get_entity_counts(request=None, connection=None):
         "keywords": settings.KEYWORDS_INDEX,
     }
 
-    results = {}
-    for name, index in entities_to_indices.items():
-        s = Search(using=connection, index=index)
-        results[name] = s.count()
+    cached = _entity_counts_cache.get(connection)
+    if cached is None:
+        return _load_entity_counts(connection, entities_to_indices)
+
+    counts, fetched_at = cached
+    if time.monotonic() - fetched_at > settings.ENTITY_COUNTS_CACHE_SECONDS:
+        _refresh_entity_counts_in_background(connection, entities_to_indices)
+    return dict(counts)
+
+
+def fetch_entity_counts(connection, entities_to_indices):
+    """Count every index in one _msearch (size 0, exact totals)."""
+    ms = MultiSearch(using=connection)
+    for index in entities_to_indices.values():
+        ms = ms.add(Search(index=index).extra(size=0, track_total_hits=True))
+    responses = ms.execute()
+    return {
+        name: response.hits.total.value
+        for name, response in zip(entities_to_indices.keys(), responses)
+    }
+
 
-    return results
+def _load_entity_counts(connection, entities_to_indices):
+    counts = fetch_entity_counts(connection, entities_to_indices)
+    with _entity_counts_lock:
+        _entity_counts_cache[connection] = (counts, time.monotonic())
+    return dict(counts)
+
+
+def _refresh_entity_counts_in_background(connection, entities_to_indices):
+    with _entity_counts_lock:
+        if connection in _entity_counts_refreshing:
+            return
+        _entity_counts_refreshing.add(connection)
+
+    def run():
+        try:
+            _load_entity_counts(connection, entities_to_indices)
+        except Exception:
+            # keep serving the previous counts; the next request retries
+            pass
+        finally:
+            with _entity_counts_lock:
+                _entity_counts_refreshing.discard(connection)
+
+    threading.Thread(target=run, daemon=True).start()
@@ -28,6 +28,7 @@ def validate_params(request):
         "api_key",
         "cited_by_count_sum",
         "cursor",
+        "count_mode",
         "data_version",
         "data-version",
         "filter",
@@ -39,6 +40,7 @@ def validate_params(request):
         "group_bys",
         "group-bys",
         "mailto",
+        "max_rows",
         "page",
         "per_page",
         "per-page",
@@ -47,8 +49,10 @@ def validate_params(request):
         "seed",
         "search",
         "select",
+        "slice",
         "sort",
         "warm",
+        "x_query",
     ]
     hidden_valid_params = ["bypass_cache"]
     for arg in request.args:
@@ -218,8 +222,20 @@ def _parse_search_param_name(param_name):
     return rest, "default"
 
 
+COUNT_MODES = ["exact", "lower_bound"]
+
+
+def validate_count_mode(count_mode):
+    """`count_mode=exact|lower_bound` (see core.shared_view.get_track_total_hits)."""
+    if count_mode is None:
+        return None
+    if count_mode.lower() not in COUNT_MODES:
+        raise APIQueryParamsError(f"Valid count modes are {', '.join(COUNT_MODES)}")
+    return count_mode.lower()
+
+
 def validate_export_format(export_format):
-    valid_formats = ["csv", "json", "xlsx"]
+    valid_formats = ["csv", "json", "jsonl.gz", "ndjson", "xlsx"]
     if export_format and export_format.lower() not in valid_formats:
         raise APIQueryParamsError(f"Valid formats are {', '.join(valid_formats)}")
 
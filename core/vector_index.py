@@ -7,16 +7,25 @@ Phase 2: mget full docs from works-v32, merge scores, citation rescore
 This replaces single-index kNN on works-v32 (72 shards, HNSW can't stay warm).
 """
 
+import hashlib
+import json
 import logging
 import math
+import threading
+import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 from elasticsearch_dsl import connections
+from flask import has_request_context, request
 
 import settings
-from core.exceptions import APIQueryParamsError
-from core.semantic_search import embed_query, VECTOR_FIELD
+from core.cursor import decode_cursor, encode_cursor
+from core.exceptions import APIPaginationError, APIQueryParamsError
+from core.semantic_search import embed_query, normalize_query_text, VECTOR_FIELD
 from core.utils import get_full_openalex_id
+from extensions import cache
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +97,18 @@ _SEARCH_FILTER_KEYS = {
 # Max results for semantic search (kNN returns at most this many candidates)
 MAX_SEMANTIC_RESULTS = 50
 
+# Large fields the serializer never reads; dropped from hydrated docs.
+_HYDRATE_SOURCE_EXCLUDES = ["abstract", "embeddings", "fulltext", "authorships_full", "vector_embedding"]
+
+# Ranked candidate pools (see get_candidate_pool_key) live in extensions.cache.
+CANDIDATE_POOL_CACHE_PREFIX = "vector_pool"
+
+# Worker threads for the text-boost phase, which runs concurrently with kNN.
+TEXT_BOOST_MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
 
 def validate_vector_filters(params):
     """Check that all filter params are supported on the vector index.
@@ -298,15 +319,20 @@ def _translate_filter_for_works(filter_dict):
     return result if result["bool"] else None
 
 
-def _text_boost_search(query_text, k=20, connection="walden", filter_dict=None):
+def _text_boost_search(query_text, k=20, connection="walden", filter_dict=None, request_timeout=None):
     """Fetch top-cited works matching query text from works-v33.
 
     Used to inject highly cited candidates into the kNN pool for short queries,
     where embedding geometry bias causes generic low-citation works to dominate.
 
+    `request_timeout` (seconds) overrides the connection's client timeout, so a
+    boost abandoned by its caller doesn't keep a pool thread busy for long.
+
     Returns list of (work_id, synthetic_knn_score, cited_by_count) tuples.
     """
     es = connections.get_connection(connection)
+    if request_timeout:
+        es = es.options(request_timeout=request_timeout)
 
     match_query = {
         "match": {
@@ -351,22 +377,15 @@ def _text_boost_search(query_text, k=20, connection="walden", filter_dict=None):
     return results
 
 
-def hydrate_results(vector_results, connection="walden"):
-    """Fetch full work docs from works-v32 via mget, merge scores.
+def rank_candidates(vector_results):
+    """Apply the citation rescore to the candidate pool and order it.
 
     Args:
         vector_results: list of (work_id, knn_score, cited_by_count) tuples
-        connection: ES connection name
 
     Returns:
-        List of ES hit-like dicts with _source and injected meta.score
+        List of (work_id, score) tuples sorted by rescored score (descending)
     """
-    if not vector_results:
-        return []
-
-    es = connections.get_connection(connection)
-    work_ids = [r[0] for r in vector_results]
-
     # Build score map with citation rescore.
     #
     # We use a saturation function with a relevance gate to combine kNN
@@ -406,36 +425,297 @@ def hydrate_results(vector_results, connection="walden"):
     max_boost = settings.CITATION_MAX_BOOST
     knn_floor = settings.CITATION_KNN_FLOOR
 
-    score_map = {}
+    ranked = []
     for work_id, knn_score, cited_by in vector_results:
         citation_signal = cited_by / (cited_by + pivot) if cited_by > 0 else 0.0
         relevance_strength = max(0.0, min(1.0, (knn_score - knn_floor) / (1.0 - knn_floor)))
         citation_factor = 1.0 + max_boost * relevance_strength * citation_signal
-        score_map[work_id] = knn_score * citation_factor
+        ranked.append((work_id, knn_score * citation_factor))
+
+    ranked.sort(key=lambda r: r[1], reverse=True)
+    return ranked
 
-    # mget full docs from works-v32
+
+def _mget_docs(work_ids, connection):
+    """mget `_source`s from works-v32 -> {work_id: source} for the docs found."""
+    es = connections.get_connection(connection)
     response = es.mget(
         index=settings.WORKS_INDEX_WALDEN,
         body={"ids": work_ids},
-        _source_excludes=["abstract", "embeddings", "fulltext", "authorships_full", "vector_embedding"],
+        _source_excludes=_HYDRATE_SOURCE_EXCLUDES,
     )
+    return {
+        doc["_id"]: doc["_source"] for doc in response["docs"] if doc.get("found")
+    }
+
+
+def _existing_ids(work_ids, connection):
+    """The ids among `work_ids` that have a doc in works-v32 (no `_source`)."""
+    es = connections.get_connection(connection)
+    response = es.mget(
+        index=settings.WORKS_INDEX_WALDEN, body={"ids": work_ids}, _source=False
+    )
+    return {doc["_id"] for doc in response["docs"] if doc.get("found")}
+
+
+def _lakebase_docs(work_ids):
+    """Batch-fetch docs from Lakebase -> {work_id: source}; misses (and any
+    error) are simply absent, for the caller to fill from ES."""
+    # Imported lazily: the `works` package imports its views, which import
+    # back into core.shared_view -> core.vector_index.
+    from works import lakebase
+
+    parsed = {work_id: lakebase.parse_work_id(work_id) for work_id in work_ids}
+    lookup_ids = [work_id for work_id, n in parsed.items() if n is not None]
+    if not lookup_ids:
+        return {}
+    t0 = time.time()
+    try:
+        docs = lakebase.get_work_docs([parsed[work_id] for work_id in lookup_ids])
+    except Exception:
+        logger.exception("lakebase_lookup backend=lakebase outcome=error id_kind=batch; falling back to ES")
+        return {}
+    found = {}
+    for work_id, doc in zip(lookup_ids, docs):
+        if doc is not None:
+            for key in _HYDRATE_SOURCE_EXCLUDES:
+                doc.pop(key, None)
+            found[work_id] = doc
+    logger.info("lakebase_lookup backend=lakebase outcome=batch id_kind=batch hits=%d misses=%d fetch_ms=%.1f",
+                len(found), len(work_ids) - len(found), (time.time() - t0) * 1000)
+    return found
+
+
+def _route_to_lakebase():
+    from works import lakebase
+
+    return has_request_context() and lakebase.should_route(request)
+
+
+def fetch_docs(ranked, connection="walden", use_lakebase=False):
+    """Fetch full work docs for a ranked slice, from Lakebase and/or works-v32.
+
+    Args:
+        ranked: list of (work_id, score) tuples, already in display order
+        connection: ES connection name
+        use_lakebase: batch-fetch from Lakebase first; only its misses go to mget
+
+    Returns:
+        List of ES hit-like dicts with _source and injected _score, in the
+        order of `ranked` (ids found in neither store are skipped)
+    """
+    if not ranked:
+        return []
+
+    work_ids = [work_id for work_id, _ in ranked]
+    docs = _lakebase_docs(work_ids) if use_lakebase else {}
+    missing = [work_id for work_id in work_ids if work_id not in docs]
+    if missing:
+        docs.update(_mget_docs(missing, connection))
 
     # Build hit objects that work with WorksSchema serialization
     hits = []
-    for doc in response["docs"]:
-        if not doc.get("found"):
+    for work_id, score in ranked:
+        source = docs.get(work_id)
+        if source is None:
             continue
-        hit = doc["_source"]
-        hit["_id"] = doc["_id"]
-        hit["_score"] = score_map.get(doc["_id"], 0)
+        hit = dict(source)
+        hit["_id"] = work_id
+        hit["_score"] = score
         hits.append(hit)
 
-    # Sort by rescored score (descending)
-    hits.sort(key=lambda h: h.get("_score", 0), reverse=True)
-
     return hits
 
 
+def hydrate_results(vector_results, connection="walden"):
+    """Rescore the whole candidate pool and fetch every doc in it.
+
+    Args:
+        vector_results: list of (work_id, knn_score, cited_by_count) tuples
+        connection: ES connection name
+
+    Returns:
+        List of ES hit-like dicts with _source and injected meta.score
+    """
+    return fetch_docs(rank_candidates(vector_results), connection)
+
+
+def get_candidate_pool_key(params, connection):
+    """Cache key for the ranked candidate pool of one semantic query.
+
+    Derived from everything that shapes the pool: the normalized query text, the
+    (order-independent) filters, the data-version connection its docs were
+    checked against, and the rescore/text-boost tuning knobs. Page, per_page and
+    cursor are left out so every page of a query shares one pool.
+    """
+    filters = sorted(
+        (key, str(value))
+        for f in params.get("filters") or []
+        for key, value in f.items()
+    )
+    fingerprint = {
+        "search": normalize_query_text(params["search"]),
+        "filters": filters,
+        "connection": connection,
+        "vector_index": settings.WORKS_VECTOR_INDEX,
+        "works_index": settings.WORKS_INDEX_WALDEN,
+        "text_boost": settings.SEMANTIC_TEXT_BOOST,
+        "rescore": [
+            settings.CITATION_PIVOT,
+            settings.CITATION_MAX_BOOST,
+            settings.CITATION_KNN_FLOOR,
+        ],
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+    return f"{CANDIDATE_POOL_CACHE_PREFIX}:{hashlib.sha1(encoded).hexdigest()}"
+
+
+def get_cached_candidate_pool(key):
+    """Return the cached ranked pool as (work_id, score) tuples, or None."""
+    try:
+        cached = cache.get(key)
+    except Exception:
+        return None
+    if cached is None:
+        return None
+    return [(work_id, score) for work_id, score in cached]
+
+
+def set_cached_candidate_pool(key, ranked):
+    try:
+        cache.set(
+            key,
+            [[work_id, score] for work_id, score in ranked],
+            timeout=settings.SEMANTIC_POOL_CACHE_TIMEOUT,
+        )
+    except Exception:
+        pass
+
+
+def _get_executor():
+    """Shared thread pool for the text-boost phase.
+
+    Created lazily so it is never started in the gunicorn master (--preload)
+    and inherited half-initialized by forked workers.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=TEXT_BOOST_MAX_WORKERS,
+                    thread_name_prefix="text-boost",
+                )
+    return _executor
+
+
+def _merge_text_boost(vector_results, text_boost_results):
+    """Inject text-boost hits missing from the kNN pool, in place.
+
+    We assign them the median kNN score so they start competitive and the
+    citation rescorer can push highly-cited ones to the top.
+    """
+    # Use median kNN score so text-boost results aren't buried
+    knn_scores = sorted([r[1] for r in vector_results], reverse=True)
+    median_knn_score = knn_scores[len(knn_scores) // 2] if knn_scores else 0.55
+
+    existing_ids = {r[0] for r in vector_results}
+    for work_id, _, cited_by in text_boost_results:
+        if work_id not in existing_ids:
+            vector_results.append((work_id, median_knn_score, cited_by))
+            existing_ids.add(work_id)
+
+
+def build_candidate_pool(params, connection):
+    """Embed, run kNN (+ text boost for short queries) and rescore.
+
+    Returns (ranked, complete): the full ranked pool as a list of
+    (work_id, score) tuples, and False if the text boost was dropped or failed
+    (such a pool is served but not cached). Candidates without a works doc are
+    dropped here, so the pool's size is the result count and every page
+    hydrates in full.
+    """
+    try:
+        # Embed query
+        query_vector = embed_query(params["search"])
+
+        # Build filter
+        filter_dict = build_vector_filter(params)
+    except Exception:
+        import traceback; print(f"VECTOR_ERR embed/filter: {traceback.format_exc()}", flush=True)
+        raise
+
+    # Text-boost injection for short queries (≤ 3 words).
+    # Injects highly-cited boolean-match results into the kNN pool so that
+    # landmark papers aren't drowned out by low-citation embedding neighbors.
+    # It hits the works cluster while kNN hits the vector cluster, so it runs on
+    # a worker thread alongside kNN and only joins for the median-score merge.
+    text_boost_future = None
+    if settings.SEMANTIC_TEXT_BOOST and len(params["search"].split()) <= 3:
+        deadline_seconds = settings.SEMANTIC_TEXT_BOOST_DEADLINE_MS / 1000
+        text_boost_deadline = time.monotonic() + deadline_seconds
+        text_boost_future = _get_executor().submit(
+            _text_boost_search,
+            params["search"],
+            k=20,
+            connection=connection,
+            filter_dict=filter_dict,
+            request_timeout=deadline_seconds,
+        )
+
+    # Execute kNN on vector index (on the request thread)
+    k = MAX_SEMANTIC_RESULTS
+    num_candidates = max(k * 2, 75)
+    try:
+        vector_results = execute_vector_search(query_vector, filter_dict, k=k, num_candidates=num_candidates)
+    except Exception as e:
+        import traceback; print(f"VECTOR_ERR kNN filter={filter_dict}: {type(e).__name__}: {e}", flush=True)
+        raise
+
+    complete = True
+    if text_boost_future is not None:
+        complete = False
+        try:
+            text_boost_results = text_boost_future.result(
+                timeout=max(0.0, text_boost_deadline - time.monotonic())
+            )
+            _merge_text_boost(vector_results, text_boost_results)
+            complete = True
+        except FuturesTimeoutError:
+            # Past its deadline: drop it rather than hold up the response.
+            print(f"VECTOR_ERR text_boost: dropped after {settings.SEMANTIC_TEXT_BOOST_DEADLINE_MS}ms deadline", flush=True)
+        except Exception:
+            import traceback; print(f"VECTOR_ERR text_boost: {traceback.format_exc()}", flush=True)
+            # Non-fatal: continue with kNN results only
+
+    ranked = rank_candidates(vector_results)
+    existing = _existing_ids([work_id for work_id, _ in ranked], connection) if ranked else set()
+    return [r for r in ranked if r[0] in existing], complete
+
+
+def _get_page_bounds(params, per_page):
+    """Resolve page/cursor into (page, start, end) offsets into the ranked pool.
+
+    Semantic cursors are opaque offsets into the cached pool: "*" starts at 0 and
+    each response's next_cursor points just past its last result.
+    """
+    page = params.get("page", 1) or 1
+    cursor = params.get("cursor")
+    if not cursor:
+        start = (page - 1) * per_page
+        return page, start, start + per_page
+
+    if page != 1:
+        raise APIPaginationError("Cannot use page parameter with cursor.")
+    start = 0
+    if cursor != "*":
+        decoded = decode_cursor(cursor)
+        if len(decoded) != 1 or not isinstance(decoded[0], int) or decoded[0] < 0:
+            raise APIPaginationError("Invalid cursor value")
+        start = decoded[0]
+    return page, start, start + per_page
+
+
 def vector_semantic_search(params, index_name, connection):
     """Execute two-phase semantic search and return formatted result.
 
@@ -449,13 +729,6 @@ def vector_semantic_search(params, index_name, connection):
             "Use group_by with regular search instead."
         )
 
-    # Reject cursor pagination (not supported for semantic search)
-    if params.get("cursor"):
-        raise APIQueryParamsError(
-            "Cursor pagination is not supported with semantic search. "
-            "Use page/per_page pagination instead (max 50 results)."
-        )
-
     # Cap per_page for semantic search
     per_page = params.get("per_page", 25) or 25
     if per_page > MAX_SEMANTIC_RESULTS:
@@ -473,65 +746,30 @@ def vector_semantic_search(params, index_name, connection):
     # Validate filters
     validate_vector_filters(params)
 
-    import time
-    t0 = time.time()
-
-    try:
-        # Embed query
-        query_vector = embed_query(params["search"])
-
-        # Build filter
-        filter_dict = build_vector_filter(params)
-    except Exception:
-        import traceback; print(f"VECTOR_ERR embed/filter: {traceback.format_exc()}", flush=True)
-        raise
-
-    # Execute kNN on vector index
-    k = MAX_SEMANTIC_RESULTS
-    num_candidates = max(k * 2, 75)
-    try:
-        vector_results = execute_vector_search(query_vector, filter_dict, k=k, num_candidates=num_candidates)
-    except Exception as e:
-        import traceback; print(f"VECTOR_ERR kNN filter={filter_dict}: {type(e).__name__}: {e}", flush=True)
-        raise
-
-    # Text-boost injection for short queries (≤ 3 words).
-    # Injects highly-cited boolean-match results into the kNN pool so that
-    # landmark papers aren't drowned out by low-citation embedding neighbors.
-    # We assign them the median kNN score so they start competitive and the
-    # citation rescorer can push highly-cited ones to the top.
-    if settings.SEMANTIC_TEXT_BOOST and len(params["search"].split()) <= 3:
-        try:
-            text_boost_results = _text_boost_search(params["search"], k=20, connection=connection, filter_dict=filter_dict)
+    page, start, end = _get_page_bounds(params, per_page)
 
-            # Use median kNN score so text-boost results aren't buried
-            knn_scores = sorted([r[1] for r in vector_results], reverse=True)
-            median_knn_score = knn_scores[len(knn_scores) // 2] if knn_scores else 0.55
+    t0 = time.time()
 
-            existing_ids = {r[0] for r in vector_results}
-            for work_id, _, cited_by in text_boost_results:
-                if work_id not in existing_ids:
-                    vector_results.append((work_id, median_knn_score, cited_by))
-                    existing_ids.add(work_id)
-        except Exception:
-            import traceback; print(f"VECTOR_ERR text_boost: {traceback.format_exc()}", flush=True)
-            # Non-fatal: continue with kNN results only
+    # The ranked pool is cached, so later pages (and cursor follow-ups) skip
+    # embedding, kNN and text boost and only hydrate their own slice.
+    pool_key = get_candidate_pool_key(params, connection)
+    ranked = get_cached_candidate_pool(pool_key)
+    if ranked is None:
+        ranked, complete = build_candidate_pool(params, connection)
+        if complete:
+            set_cached_candidate_pool(pool_key, ranked)
 
-    # Hydrate full docs from works-v33
+    # Hydrate the page's docs from works-v33
     try:
-        hits = hydrate_results(vector_results, connection)
+        page_hits = fetch_docs(
+            ranked[start:end], connection, use_lakebase=_route_to_lakebase()
+        )
     except Exception as e:
         import traceback; print(f"VECTOR_ERR hydrate: {type(e).__name__}: {e}", flush=True)
         raise
 
     db_response_time_ms = int((time.time() - t0) * 1000)
 
-    # Paginate
-    page = params.get("page", 1) or 1
-    start = (page - 1) * per_page
-    end = start + per_page
-    page_hits = hits[start:end]
-
     # Convert raw dicts to hit-like objects for WorksSchema
     from elasticsearch_dsl.utils import AttrDict
     result_objects = []
@@ -543,13 +781,16 @@ def vector_semantic_search(params, index_name, connection):
 
     # Build response in same format as shared_view
     result = OrderedDict()
-    result["meta"] = {
-        "count": len(hits),
+    meta = {
+        "count": len(ranked),
         "db_response_time_ms": db_response_time_ms,
-        "page": page,
+        "page": page if not params.get("cursor") else None,
         "per_page": per_page,
         "groups_count": None,
     }
+    if params.get("cursor"):
+        meta["next_cursor"] = encode_cursor([end]) if end < len(ranked) else None
+    result["meta"] = meta
     result["group_by"] = []
     result["results"] = result_objects
 
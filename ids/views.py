@@ -9,7 +9,9 @@ import settings
 from works import lakebase
 
 logger = logging.getLogger(__name__)
-from core.utils import get_data_version_connection
+from core.compiled_schema import compiled_dump
+from core.sample import random_key_document
+from core.utils import get_data_version_connection, get_source_includes
 from authors.schemas import AuthorsSchema
 from awards.schemas import AwardsSchema
 from concepts.schemas import ConceptsSchema
@@ -90,6 +92,11 @@ def get_merged_into_id(connection, merge_index, full_id):
 def works_random_get():
     s = Search(index=settings.WORKS_INDEX_LEGACY)
     only_fields = process_id_only_fields(request, WorksSchema)
+    works_schema = WorksSchema(context={"display_relevance": False}, only=only_fields)
+
+    if settings.SAMPLE_RANDOM_KEY_FIELD:
+        response = random_key_document(s, settings.SAMPLE_RANDOM_KEY_FIELD)
+        return works_schema.dump(response[0])
 
     # divide queries into year groups to limit how much work the random function_score has to do
     year_groups = [
@@ -113,7 +120,6 @@ def works_random_get():
     )
     s = s.query(random_query).extra(size=1)
     response = s.execute()
-    works_schema = WorksSchema(context={"display_relevance": False}, only=only_fields)
     return works_schema.dump(response[0])
 
 
@@ -125,6 +131,9 @@ def works_id_get(id):
 
     s = Search(index=index_name, using=connection)
     only_fields = process_id_only_fields(request, WorksSchema)
+    source_includes = get_source_includes(request, WorksSchema)
+    if source_includes:
+        s = s.source(includes=source_includes)
     # oxjob #576: (kind, key) for the Lakebase point-lookup path; None = ES-only id form
     lakebase_lookup = None
 
@@ -184,11 +193,12 @@ def works_id_get(id):
         if doc is not None:
             logger.info("lakebase_lookup backend=lakebase outcome=hit id_kind=%s fetch_ms=%.1f",
                         lakebase_lookup[0], (time.time() - t0) * 1000)
-            works_schema = WorksSchema(
-                context={"display_relevance": False, "single_record": True},
+            return compiled_dump(
+                WorksSchema,
+                lakebase.LakebaseHit(doc),
                 only=only_fields,
+                context={"display_relevance": False, "single_record": True},
             )
-            return works_schema.dump(lakebase.LakebaseHit(doc))
         logger.info("lakebase_lookup backend=es_fallback outcome=miss id_kind=%s fetch_ms=%.1f",
                     lakebase_lookup[0], (time.time() - t0) * 1000)
 
@@ -196,16 +206,21 @@ def works_id_get(id):
 
     if not response:
         abort(404)
-    works_schema = WorksSchema(
-        context={"display_relevance": False, "single_record": True}, only=only_fields
+    return compiled_dump(
+        WorksSchema,
+        response[0],
+        only=only_fields,
+        context={"display_relevance": False, "single_record": True},
     )
-    return works_schema.dump(response[0])
 
 
 @blueprint.route("/v2/works/<path:id>")
 def works_v2_id_get(id):
     s = Search(index=settings.WORKS_INDEX_WALDEN, using="walden")
     only_fields = process_id_only_fields(request, WorksSchema)
+    source_includes = get_source_includes(request, WorksSchema)
+    if source_includes:
+        s = s.source(includes=source_includes)
 
     if is_openalex_id(id):
         clean_id = normalize_openalex_id(id)
@@ -104,6 +104,9 @@ DIAGNOSTICS: Dict[str, DiagnosticSpec] = {
         _spec("OQL_UNTERMINATED_ANNOTATION", ERROR, PARSE,
               "a [...] annotation was opened but never closed",
               "add a closing bracket (])"),
+        _spec("OQL_UNMATCHED_BRACKET", ERROR, PARSE,
+              "a ] appears with no [ annotation open",
+              'remove the "]", or open the annotation with "["'),
         # -- top-level structure --------------------------------------------------
         _spec("OQL_EMPTY", ERROR, PARSE,
               "the query (or a where-condition) is empty",
@@ -8,10 +8,15 @@ playground's CodeMirror editor:
   GET /validate?q=<oql>                  full OQL -> diagnostics + canonical formats,
                                          for inline linting. Always 200.
 
+Both take an optional `session=<id>` (any stable per-buffer string, e.g. a document
+hash the editor mints when it opens the buffer): consecutive keystrokes on the same
+session re-lex and re-parse only from the edited clause onward (`ParseSession`).
+
 Kept in a **separate blueprint** (not `query_translation/views.py`) so it doesn't
 collide with the in-flight execution/translation reorg in that file (#384). It reuses
-the pure OQL engine + the existing validator; `render_all_formats` is imported lazily
-to avoid import-time coupling to `views.py`.
+the pure OQL engine + the existing validator through the memoized translation cache
+(`translation_cache.py`, which imports `render_all_formats` lazily to avoid
+import-time coupling to `views.py`).
 """
 from flask import Blueprint, jsonify, request
 
@@ -20,14 +25,18 @@ from query_translation.diagnostics import (
 )
 from query_translation.oql_context import parse_context as _parse_context
 from query_translation.oql_lang import (
-    parse as _engine_parse, parse_collecting as _engine_parse_collecting,
-    entity_type_for_column,
+    parse_collecting as _engine_parse_collecting,
+    entity_type_for_column, get_parse_session,
 )
+from query_translation.oql_parser import OQLParseError
 from query_translation.oql_renderer import config_vocab_items
-from query_translation.validator import validate_oqo, CLOSED_VOCAB_NAMESPACE
+from query_translation.translation_cache import translate_oql
+from query_translation.validator import CLOSED_VOCAB_NAMESPACE
 
 blueprint = Blueprint("oql_editor", __name__)
 
+MAX_SESSION_ID_LENGTH = 128
+
 # Closed-vocab value autocomplete (#357): a column's dropdown namespace derives
 # from the registry — `entity_type_for_column` composed with the validator's
 # CLOSED_VOCAB_NAMESPACE (oxjob #565; formerly a 6-entry hand map here that
@@ -40,6 +49,14 @@ blueprint = Blueprint("oql_editor", __name__)
 # have no config table and contribute nothing here (the live route serves them).
 
 
+def _editor_session():
+    """The incremental ParseSession for `?session=`, or None (one-shot parsing)."""
+    session_id = request.args.get("session")
+    if not session_id or len(session_id) > MAX_SESSION_ID_LENGTH:
+        return None
+    return get_parse_session(session_id)
+
+
 def _enum_slugs(column, entity=None):
     """The closed-vocab slug suggestions for an OQL field column, or [] if the column
     has no `config/*.yaml` values list. Each entry carries a display-name `detail`
@@ -99,7 +116,8 @@ def parse_context_route():
             pos = int(pos_arg)
         except (TypeError, ValueError):
             pos = None
-    return jsonify(_enrich_enum_suggestions(_parse_context(q, pos))), 200
+    context = _parse_context(q, pos, session=_editor_session())
+    return jsonify(_enrich_enum_suggestions(context)), 200
 
 
 @blueprint.route("/validate", methods=["GET"])
@@ -123,22 +141,26 @@ def validate_oql_route():
     just the first), so the editor can squiggle the whole document at once.
     """
     oql = request.args.get("q", "")
-    # Parse with the engine directly (preserves code + fixit + position that
-    # oql_parser.parse_oql_to_oqo flattens away). The happy path stays on strict
-    # `parse()` so a valid query is byte-identical to production parsing.
-    try:
-        oqo = _engine_parse(oql)
-    except _OQLError:
-        # The query is broken — re-run in recover mode to collect EVERY clause-level
-        # parse error, so the editor squiggles the whole doc instead of just the first
-        # error (oxjob #363, multi-error /validate). Always 200; verdict in the body.
-        _oqo, diags = _engine_parse_collecting(oql)
+    # The happy path stays on strict `parse()` so a valid query is byte-identical to
+    # production parsing — it is the same memoized Translation (parse + validation +
+    # formats) the /query/oql route and `GET /?oql=` share.
+    session = _editor_session()
+    translation = translate_oql(oql, session=session)
+    error = translation.error
+    if isinstance(error, OQLParseError) and isinstance(error.__cause__, _OQLError):
+        # The query is broken — re-run the engine in recover mode to collect EVERY
+        # clause-level parse error (with the code + fixit + position that
+        # OQLParseError flattens away), so the editor squiggles the whole doc instead
+        # of just the first error (oxjob #363, multi-error /validate). Always 200;
+        # verdict in the body.
+        parse_collecting = session.parse_collecting if session is not None else _engine_parse_collecting
+        _oqo, diags = parse_collecting(oql)
         return jsonify(_parse_error_body([parse_diagnostic(d) for d in diags])), 200
-    except Exception as e:  # any other engine failure -> one generic diagnostic
+    if error is not None:  # any other engine failure -> one generic diagnostic
         return jsonify(_parse_error_body(
-            [parse_diagnostic(_OQLError("OQL_PARSE_ERROR", str(e)))])), 200
+            [parse_diagnostic(_OQLError("OQL_PARSE_ERROR", str(error)))])), 200
 
-    vr = validate_oqo(oqo)
+    oqo, vr = translation.oqo, translation.validation
     # Validator errors/warnings flow through the shared registry, so they pick up the
     # canonical fix-it + severity their (type, message, location) shape never carried.
     # #474: also resolve each location to the offending node's decimal address (path).
@@ -158,13 +180,12 @@ def validate_oql_route():
         for w in vr.warnings
     ]
 
-    from query_translation.views import render_all_formats  # lazy: avoid import cycle
     # The editor is OQL-TEXT input → preserve the user's given clause/value order
     # (decision 30; same as the /query/oql + /query/oqo display routes). Sorting here
     # would reorder terms in the canonical `oql`/`oql_oneline` the editor echoes back —
     # jarring on the tidy button and, for live regroup (#587), it would scramble what the
     # user just typed out from under the cursor. Only URL/NL input sorts.
-    formats = render_all_formats(oqo, vr, sort_operands=False)
+    formats = translation.formats()
     return jsonify({
         "valid": vr.valid,
         "oql": formats.get("oql"),
@@ -33,21 +33,25 @@ from core.shared_view import (
     apply_sorting,
     execute_search,
     format_response,
+    get_track_total_hits,
+    set_point_in_time,
     set_source,
 )
 from core.utils import get_data_version_connection, map_filter_params, map_sort_params
+from core.validate import validate_count_mode
 from core.vector_index import vector_semantic_search
 from query_translation.oqo import OQO, SortBy, canonicalize_oqo_column_ids
 from query_translation.oqo_to_es import (
     OQOTranslationError,
     oqo_to_search_and_filter_q,
 )
-from query_translation.oql_parser import OQLParseError, parse_oql_to_oqo
+from query_translation.oql_parser import OQLParseError
 from query_translation.url_renderer import (
     URLRenderError,
     _extract_semantic,
     render_filters,
 )
+from query_translation.translation_cache import translate_oql
 from query_translation.validator import validate_oqo, _has_search_clause
 
 # Shared response/render helpers. `build_x_query` lives in the dependency-light
@@ -238,6 +242,7 @@ def _build_params_from_oqo(oqo: OQO, request):
     return {
         "apc_sum": None,
         "cited_by_count_sum": None,
+        "count_mode": validate_count_mode(request.args.get("count_mode")),
         "cursor": cursor,
         "format": None,
         "filters": None,
@@ -297,15 +302,17 @@ def execute_oql_string(oql_str, view_params=None):
     """Public entry point: execute an OQL string → Flask response."""
     if not oql_str or not oql_str.strip():
         return _error_response("Empty OQL query.", "invalid_oql", status=400)
-    try:
-        oqo = parse_oql_to_oqo(oql_str)
-    except OQLParseError as e:  # surface position + context (#373)
+    # Memoized: the parse (and, absent view params, the validation) is shared
+    # with the /query translation routes and the editor.
+    translation = translate_oql(oql_str)
+    e = translation.error
+    if isinstance(e, OQLParseError):  # surface position + context (#373)
         return _oql_parse_error_response(e)
-    except Exception as e:  # any other parse failure → 400, never 500
+    if e is not None:  # any other parse failure → 400, never 500
         return _error_response(
             f"Failed to parse OQL: {e}", "parse_error", status=400
         )
-    return _execute_oqo(oqo, view_params=view_params)
+    return _execute_oqo(translation.oqo, view_params=view_params, translation=translation)
 
 
 def _merge_view_params(oqo: OQO, request, body_params=None) -> OQO:
@@ -404,11 +411,13 @@ def _merge_view_params(oqo: OQO, request, body_params=None) -> OQO:
     return canonicalize_oqo_column_ids(replace(oqo, **updates))
 
 
-def _execute_oqo(oqo_or_dict, view_params=None):
+def _execute_oqo(oqo_or_dict, view_params=None, translation=None):
     """Shared body for the POST and GET-path-form handlers. Accepts a parsed
     OQO (the OQL path — already canonicalized at the parse boundary) or a raw
     dict (the OQO-JSON paths). `view_params` = sibling view keys from a POST
-    body (#661); the GET forms pass None and rely on query-string args."""
+    body (#661); the GET forms pass None and rely on query-string args.
+    `translation` = the OQL path's memoized Translation, whose validation is
+    reused when the view params leave the OQO unchanged."""
     if isinstance(oqo_or_dict, OQO):
         oqo = oqo_or_dict
     else:
@@ -433,7 +442,10 @@ def _execute_oqo(oqo_or_dict, view_params=None):
 
     # Validate the OQO against the field registry (including per-leaf operator
     # validity). Returns structured errors.
-    validation = validate_oqo(oqo)
+    if translation is not None and oqo == translation.oqo:
+        validation = translation.validation
+    else:
+        validation = validate_oqo(oqo)
     if not validation.valid:
         return jsonify(
             {
@@ -516,18 +528,10 @@ def _execute_oqo(oqo_or_dict, view_params=None):
         if not _oqo_mentions_column(oqo.filter_rows, "works_count"):
             extra_qs.append(Q("range", works_count={"gt": 0}))
 
-    # Custom group_by results (continent / version / best_open_version) are
-    # computed at format time by core/group_by/custom_results.py, which rebuilds a
-    # fresh Search from params["filters"]/params["search"] via search_and_filter().
-    # The OQO path leaves those params unset (it applies filters/search via the
-    # pre-built Qs above), so without this those sub-searches would run UNFILTERED
-    # → global bucket counts (#323 Pattern G2). Stash the exact query/filter
-    # contexts of the main search so the custom path can replicate them. extra_qs
-    # (the is_xpac:false default) is folded into the filter list so bucket totals
-    # match meta.count. Plain dict keys; legacy never sets them, so it's untouched.
+    # Custom group_by results (continent / version / best_open_version) are a
+    # `filters` agg on this same search (core/group_by/buckets.py), so they share
+    # the OQO query/filter contexts below, extra_qs included (#323 Pattern G2).
     s = Search(index=index_name, using=connection)
-    params["_oqo_search_q"] = search_q
-    params["_oqo_filter_qs"] = ([filter_q] if filter_q is not None else []) + extra_qs
     s = set_source(index_name, s)
     s = _set_size(params, s)
     s = _set_cursor_pagination(params, s)
@@ -540,6 +544,7 @@ def _execute_oqo(oqo_or_dict, view_params=None):
     s = _apply_search_preference(oqo, s)
     s = apply_sorting(params, fields_dict, default_sort, index_name, s)
     s = apply_grouping(params, fields_dict, s)
+    s = set_point_in_time(params, s, index_name, connection)
 
     # Execute + format.
     try:
@@ -799,9 +804,10 @@ def _effective_corpus(oqo, connection):
 
 
 def _set_size(params, s):
+    track_total_hits = get_track_total_hits(params)
     if params["group_by"]:
-        return s.extra(size=0, track_total_hits=True)
-    return s.extra(size=params["per_page"], track_total_hits=True)
+        return s.extra(size=0, track_total_hits=track_total_hits)
+    return s.extra(size=params["per_page"], track_total_hits=track_total_hits)
 
 
 def _set_cursor_pagination(params, s):
@@ -29,7 +29,7 @@ editor never offers a field the parser would then reject.
 from typing import List, Optional, Dict, Any
 
 from query_translation.oql_lang import (
-    lex, Tok, OQLError, Field, _Parser,
+    lex, Tok, OQLError, Field, _Parser, ParseSession,
     _ALIAS, _FIELDS, ENTITY_TYPES, _CONNECTIVES,
     match_field, match_operator, namespace_for_column,
     CTX_ENTITY, CTX_FIELD, CTX_OPERATOR, CTX_VERB, CTX_VALUE, CTX_CONNECTIVE,
@@ -285,8 +285,10 @@ def _leading_entity(q: str) -> Optional[str]:
 
 
 # --- main entry ---------------------------------------------------------------
-def parse_context(q: str, pos: Optional[int] = None) -> Dict[str, Any]:
-    """Resolve the grammar context at `pos` (code-point offset) in OQL string `q`."""
+def parse_context(q: str, pos: Optional[int] = None,
+                  session: Optional[ParseSession] = None) -> Dict[str, Any]:
+    """Resolve the grammar context at `pos` (code-point offset) in OQL string `q`.
+    With an editor `session`, the lex and the cursor-prefix parse are incremental."""
     if pos is None:
         pos = len(q)
     cpos = max(0, min(pos, len(q)))
@@ -295,7 +297,7 @@ def parse_context(q: str, pos: Optional[int] = None) -> Dict[str, Any]:
     # inside/after the broken token; otherwise classify against the clean prefix.
     diagnostic = None
     try:
-        toks = lex(q)
+        toks = session.lex(q) if session is not None else lex(q)
     except OQLError as e:
         if e.position is not None and cpos > e.position:
             return _suppressed(_leading_entity(q), e)
@@ -328,7 +330,10 @@ def parse_context(q: str, pos: Optional[int] = None) -> Dict[str, Any]:
         prior = [t for t in toks if _tok_end(t) <= cpos]
 
     # (C) classify via the production parser (single source of grammar truth)
-    raw = _classify_via_engine(prior)
+    if session is not None:
+        raw = session.parse_for_context(prior)
+    else:
+        raw = _classify_via_engine(prior)
     # Multiword-VALUE widening (#357 iter-3 bug 1): if the cursor word is the tail of a
     # partially-typed multi-word value (`institution is university of fl`, `country is
     # united ki`), strict classification of the full prefix mis-reads the first value
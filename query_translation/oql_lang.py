@@ -22,7 +22,11 @@ Design anchors (see docs/oql-spec.md for prose, oxjob #330 EXPLORE.md for the wh
 from __future__ import annotations
 
 import contextvars
+import os
 import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
 from dataclasses import dataclass, replace
 from typing import Dict, List, Optional, Tuple
 
@@ -516,11 +520,16 @@ def is_numeric_column(column_id) -> bool:
     return bool(fld and fld.kind == "num")
 
 
-# alias-string -> Field, and the max alias word-length for greedy matching
+# alias-string -> Field, and every word-prefix of an alias (`open`, `open access`)
+# so greedy matching stops at the first word no alias continues with
 _ALIAS = {}
 for _spellings, _fld in _FIELDS:
     for s in _spellings:
         _ALIAS[s] = _fld
+_ALIAS_PREFIXES = frozenset(
+    " ".join(_words[:_k])
+    for _words in (_a.split(" ") for _a in _ALIAS)
+    for _k in range(1, len(_words) + 1))
 
 # Parser entity vocabulary. Single source of truth is the OQO validator's
 # `oqo.VALID_ENTITY_TYPES` (hyphenated canonical forms, e.g. `source-types`,
@@ -571,81 +580,84 @@ def _render_stemmed_search_value(value: str) -> str:
 # ---------------------------------------------------------------------------
 # Lexer
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class Tok:
-    kind: str   # WORD | STRING | ANNOT | LP | RP | COMMA | OP | SEMI
+    kind: str   # WORD | STRING | ANNOT | LP | RP | COMMA | OP | SEMI | BANG
     val: str
     pos: int
 
 
 _WORD_BREAK = set(' \t\n"[](),;!')
+_BREAKS = re.escape("".join(sorted(_WORD_BREAK)))
+
+# The lexer is one compiled alternation run by `findall`, which hands back plain
+# (leading whitespace, token text) string pairs: token positions are running sums
+# of their lengths and the kind is read off the first character. Only whitespace
+# (space/tab/newline) separates tokens and every other character starts exactly one
+# branch, so the matches tile the input (up to trailing whitespace, cut via endpos).
+_TOKEN_RE = re.compile(
+    r"([ \t\n]*)("
+    # WORD: a run of non-break chars. `<`/`>` can't start one (they're OP) but may
+    # appear inside (`a>b` is one word).
+    rf"[^{_BREAKS}<>][^{_BREAKS}]*"
+    r"|[<>]=?"
+    # `!` is the within-`.search`-value WoS NOT operator: `A!B` = A AND NOT B (#432).
+    # Only meaningful infix inside a `has` value group; the parser
+    # (_parse_search_operand) consumes it. A literal `!` must be quoted.
+    r"|[(),;!]"
+    # STRING: a run of 2+ opening/closing quotes collapses to a single delimiter, so
+    # `"""universiteit maastricht"""` lexes as ONE string (the literal the user
+    # meant) rather than three; the token's pos is the run's first quote. The
+    # lookahead keeps the opening run whole, so `""` is unterminated, not empty,
+    # and the lookbehind stops a long run from being retried at every quote.
+    # (oxjob #363)
+    r'|(?<!")"+(?=[^"])[^"]*"+'
+    r"|\[[^\]]*\]"
+    # a lone `"` / `[` is unterminated; a lone `]` closes nothing
+    r'|["\[\]])'
+)
+_FIRST_CHAR_KINDS = {"(": "LP", ")": "RP", ",": "COMMA", ";": "SEMI", "!": "BANG",
+                     "<": "OP", ">": "OP", '"': "STRING", "[": "ANNOT", "]": "]"}
 
 
-def lex(s: str) -> List[Tok]:
+def lex(s: str, start: int = 0) -> List[Tok]:
+    # `start` resumes lexing at a token boundary (ParseSession's incremental re-lex).
     # Coerce curly/smart double-quotes to ASCII (1:1, length-preserving so token
-    # positions stay exact). Multi-quote runs (`"""x"""`) are collapsed
-    # position-preservingly in the STRING branch below. (oxjob #363)
+    # positions stay exact). (oxjob #363)
     s = s.translate(CURLY_DQUOTE_MAP)
     toks: List[Tok] = []
-    i, n = 0, len(s)
-    while i < n:
-        c = s[i]
-        if c in ' \t\n':
-            i += 1
-            continue
-        if c == '"':
-            # Collapse a run of 2+ opening/closing quotes to a single delimiter,
-            # so `"""universiteit maastricht"""` lexes as ONE string (the literal
-            # the user meant) rather than three. Positions reference the ORIGINAL
-            # offsets (no rewrite), so diagnostics stay accurate. (oxjob #363)
-            start = i
-            while i + 1 < n and s[i + 1] == '"':
-                i += 1                       # skip extra opening quotes
-            j = s.find('"', i + 1)
-            if j == -1:
+    append = toks.append
+    kind_of = _FIRST_CHAR_KINDS.get
+    pos = start
+    end = len(s.rstrip(" \t\n"))
+    if s.find("[", s.rfind("]") + 1, end) == -1:
+        pairs = _TOKEN_RE.findall(s, start, end)
+    else:
+        # An unterminated annotation ahead: every later `[` would rescan the tail,
+        # so match lazily and stop at the first error instead.
+        pairs = (m.groups() for m in _TOKEN_RE.finditer(s, start, end))
+    for ws, text in pairs:
+        pos += len(ws)
+        kind = kind_of(text[0], "WORD")
+        if kind == "STRING":
+            if len(text) == 1:
                 raise oql_error("OQL_UNTERMINATED_STRING",
-                               f'unterminated string starting at position {start}',
-                               'add a closing double-quote (")', start)
-            content = s[i + 1:j]
-            i = j
-            while i + 1 < n and s[i + 1] == '"':
-                i += 1                       # skip extra closing quotes
-            toks.append(Tok("STRING", content, start))
-            i += 1
-            continue
-        if c == '[':
-            j = s.find(']', i + 1)
-            if j == -1:
+                               f'unterminated string starting at position {pos}',
+                               'add a closing double-quote (")', pos)
+            append(Tok(kind, text.strip('"'), pos))
+        elif kind == "ANNOT":
+            if len(text) == 1:
                 raise oql_error("OQL_UNTERMINATED_ANNOTATION",
-                               f'unterminated annotation [ starting at position {i}',
-                               'add a closing bracket (])', i)
-            toks.append(Tok("ANNOT", s[i + 1:j], i))
-            i = j + 1
-            continue
-        if c == '(':
-            toks.append(Tok("LP", c, i)); i += 1; continue
-        if c == ')':
-            toks.append(Tok("RP", c, i)); i += 1; continue
-        if c == ',':
-            toks.append(Tok("COMMA", c, i)); i += 1; continue
-        if c == ';':
-            toks.append(Tok("SEMI", c, i)); i += 1; continue
-        if c in '><':
-            op = c
-            if i + 1 < n and s[i + 1] == '=':
-                op += '='
-            toks.append(Tok("OP", op, i)); i += len(op); continue
-        if c == '!':
-            # within-`.search`-value WoS NOT operator: `A!B` = A AND NOT B (#432).
-            # Only meaningful infix inside a `has` value group; the parser
-            # (_parse_search_operand) consumes it. A literal `!` must be quoted.
-            toks.append(Tok("BANG", c, i)); i += 1; continue
-        # WORD: run until a break char
-        j = i
-        while j < n and s[j] not in _WORD_BREAK:
-            j += 1
-        toks.append(Tok("WORD", s[i:j], i))
-        i = j
+                               f'unterminated annotation [ starting at position {pos}',
+                               'add a closing bracket (])', pos)
+            append(Tok(kind, text[1:-1], pos))
+        elif kind == "]":
+            raise oql_error("OQL_UNMATCHED_BRACKET",
+                           f'"]" at position {pos} closes no annotation',
+                           'remove the "]", or open the annotation with "["', pos)
+        else:
+            append(Tok(kind, text, pos))
+        pos += len(text)
     return toks
 
 
@@ -739,6 +751,8 @@ def match_field(toks: List[Tok], i: int) -> Optional[Tuple[str, "Field", int]]:
             break
         parts.append(t.val)
         key = " ".join(parts).lower()
+        if key not in _ALIAS_PREFIXES:
+            break
         if key in _ALIAS:
             best = _ALIAS[key]
             best_len = k + 1
@@ -1490,6 +1504,13 @@ class _Parser:
         # first error.
         self._recover_mode = False
         self._diagnostics: List[OQLError] = []
+        # --- incremental (ParseSession) state ---
+        # `_prev` is the previous parse of the same editor buffer in the same mode;
+        # `_record` collects this parse's top-level operands for the next one. Both
+        # None outside a session, so `_parse_expr` never resumes on the normal path.
+        self._prev: Optional[_ParseRecord] = None
+        self._record: Optional[_ParseRecord] = None
+        self._changed_at = 0      # first token index that differs from `_prev`
 
     # -- editor-context hook (no-op in strict mode) --
     def _want(self, category, **payload):
@@ -1505,7 +1526,11 @@ class _Parser:
     # -- token helpers --
     def peek(self, k=0) -> Optional[Tok]:
         j = self.i + k
-        return self.toks[j] if j < len(self.toks) else None
+        if j < len(self.toks):
+            return self.toks[j]
+        if self._record is not None:
+            self.toks.note_read(j)  # seeing the end is a read too (ParseSession)
+        return None
 
     def next(self) -> Tok:
         t = self.toks[self.i]
@@ -1522,8 +1547,9 @@ class _Parser:
             self.i += 1
 
     def word_is(self, *words, k=0) -> bool:
+        # `words` are lowercase keywords
         t = self.peek(k)
-        return bool(t and t.kind == "WORD" and t.val.lower() in {w.lower() for w in words})
+        return bool(t and t.kind == "WORD" and t.val.lower() in words)
 
     # -- entry --
     def parse(self) -> OQO:
@@ -1774,8 +1800,14 @@ class _Parser:
 
     # -- boolean expression; mixed and/or resolved by precedence (AND > OR) --
     def _parse_expr(self, top=False) -> FilterType:
-        operands = [self._operand_tracked()]
+        operands: List[FilterType] = []
         conns: List[str] = []
+        top = top and self._record is not None
+        if top:
+            self._record.conns = conns
+            self._resume_top_operands(operands, conns)
+        if not operands:
+            self._append_operand(operands, conns, top)
         while True:
             self._skip_annot()
             # A complete operand with the cursor right after it: the slot wants a
@@ -1788,7 +1820,7 @@ class _Parser:
                 # NOT at a connective position means "a NOT b" with no AND/OR.
                 if self._recover_mode:
                     self._diagnostics.append(self._adjacency_err(t))
-                    operands.append(self._operand_tracked())  # recover: implicit AND
+                    self._append_operand(operands, conns, top)  # recover: implicit AND
                     continue
                 self._adjacency_error(t)
             if t.kind == "WORD" and t.val.lower() in _CONNECTIVES:
@@ -1807,7 +1839,7 @@ class _Parser:
                 self._want(CTX_FIELD, after_connective=conn, sibling_fld=sib_fld,
                            sibling_simple=sib_simple, sibling_clause_span=sib_span,
                            sibling_value_start=sib_val_start)
-                operands.append(self._operand_tracked())
+                self._append_operand(operands, conns, top)
                 continue
             # directive keywords end the where-expression
             if t.kind == "WORD" and t.val.lower() in ("group", "sample"):
@@ -1815,7 +1847,7 @@ class _Parser:
             # anything else with no connective = implicit adjacency
             if self._recover_mode:
                 self._diagnostics.append(self._adjacency_err(t))
-                operands.append(self._operand_tracked())  # recover: implicit AND
+                self._append_operand(operands, conns, top)  # recover: implicit AND
                 continue
             self._adjacency_error(t)
         # Mixed and/or at one level is NOT an error — it's resolved by the standard
@@ -1823,6 +1855,40 @@ class _Parser:
         # render re-parenthesizes the grouping so it's never implicit on the page.
         return _precedence_tree(operands, conns)
 
+    def _append_operand(self, operands: List[FilterType], conns: List[str], top: bool):
+        """Parse the next operand onto `operands`; at the top level of a session parse,
+        also record it (with the parser state after it) for the next keystroke."""
+        operands.append(self._operand_tracked())
+        if top:
+            self._record.operands.append(_RecordedOperand(
+                end=self.i, high_water=self.toks.high_water, result=operands[-1],
+                n_conns=len(conns), n_diagnostics=len(self._diagnostics),
+                state=(self._cur_fld, self._in_list, self._last_operand_span,
+                       self._last_operand_simple, self._last_value_start_i)))
+
+    def _resume_top_operands(self, operands: List[FilterType], conns: List[str]):
+        """Restore the previous parse's leading top-level operands that can't have
+        changed: every token they read — lookahead included — precedes the first
+        edited token, with one token to spare for `j < len(toks)` end checks."""
+        prev = self._prev
+        if prev is None or not prev.operands:
+            return
+        n = 0
+        while (n < len(prev.operands)
+               and prev.operands[n].high_water + 1 < self._changed_at):
+            n += 1
+        if n == 0:
+            return
+        last = prev.operands[n - 1]
+        operands.extend(op.result for op in prev.operands[:n])
+        conns.extend(prev.conns[:last.n_conns])
+        self._record.operands.extend(prev.operands[:n])
+        self._diagnostics[:] = prev.diagnostics[:last.n_diagnostics]
+        (self._cur_fld, self._in_list, self._last_operand_span,
+         self._last_operand_simple, self._last_value_start_i) = last.state
+        self.i = last.end
+        self.toks.high_water = max(self.toks.high_water, last.high_water)
+
     def _adjacency_error(self, t: Tok):
         raise self._adjacency_err(t)
 
@@ -2989,7 +3055,7 @@ def parse(oql: str) -> OQO:
     """OQL text -> OQO. Raises OQLError (with .code/.fixit) on any error case."""
     toks = lex(oql)
     if not toks:
-        raise oql_error("OQL_EMPTY", "empty query", 'e.g. "works where year >= (2020)"')
+        raise _empty_query_error()
     p = _Parser(toks)
     oqo = p.parse()
     return oqo
@@ -3009,11 +3075,158 @@ def parse_collecting(oql: str) -> Tuple[Optional[OQO], List[OQLError]]:
     except OQLError as e:
         return None, [e]
     if not toks:
-        return None, [oql_error("OQL_EMPTY", "empty query",
-                                'e.g. "works where year >= (2020)"')]
+        return None, [_empty_query_error()]
     return _Parser(toks).parse_collecting()
 
 
+def _empty_query_error() -> OQLError:
+    return oql_error("OQL_EMPTY", "empty query", 'e.g. "works where year >= (2020)"')
+
+
+# ---------------------------------------------------------------------------
+# Incremental parsing (editor sessions)
+# ---------------------------------------------------------------------------
+# The editor calls /validate and /parse-context on every keystroke, and a long saved
+# query (hundreds of clauses) re-lexed and re-parsed from scratch each time makes it
+# lag. A `ParseSession` holds one buffer's previous tokens and top-level operand
+# parses, keyed by a client-supplied session id: a keystroke re-lexes from the token
+# the edit touches and re-parses from the first top-level operand that read an
+# edited token onward. Results are identical to the one-shot functions; a session
+# only skips work whose inputs haven't changed.
+MAX_PARSE_SESSIONS = 256   # LRU bound on live editor sessions (per worker)
+
+
+class _TrackedToks(list):
+    """A token list that remembers the highest index the parser has read."""
+    high_water = -1
+
+    def note_read(self, j: int):
+        if j > self.high_water:
+            self.high_water = j
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            self.note_read(len(self) if key.stop is None else key.stop - 1)
+        else:
+            self.note_read(len(self) if key < 0 else key)
+        return list.__getitem__(self, key)
+
+
+@dataclass
+class _RecordedOperand:
+    end: int               # token index after the operand
+    high_water: int        # highest token index read so far in the parse
+    result: FilterType
+    n_conns: int           # connectives seen so far at the top level
+    n_diagnostics: int     # recover-mode diagnostics so far
+    state: tuple           # bookkeeping restored on resume (see _append_operand)
+
+
+class _ParseRecord:
+    """One session parse: its tokens and top-level `where` operands."""
+
+    def __init__(self, toks: List[Tok]):
+        self.toks = toks
+        self.operands: List[_RecordedOperand] = []
+        self.conns: List[str] = []
+        self.diagnostics: List[OQLError] = []
+
+
+class ParseSession:
+    """Incremental lex + parse of one editor buffer across keystrokes.
+
+    `parse`, `parse_collecting` and `parse_for_context` return exactly what the
+    module-level `parse` / `parse_collecting` / `_Parser.parse_for_context` return
+    for the same input. Each mode keeps its own record, since recover and context
+    mode parse the same tokens differently. Calls on one session are serialized."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._text: Optional[str] = None
+        self._toks: List[Tok] = []
+        self._records: Dict[str, _ParseRecord] = {}
+
+    def lex(self, text: str) -> List[Tok]:
+        with self._lock:
+            return self._lex(text)
+
+    def parse(self, text: str) -> OQO:
+        with self._lock:
+            toks = self._lex(text)
+            if not toks:
+                raise _empty_query_error()
+            return self._run("strict", toks, _Parser.parse)
+
+    def parse_collecting(self, text: str) -> Tuple[Optional[OQO], List[OQLError]]:
+        with self._lock:
+            try:
+                toks = self._lex(text)
+            except OQLError as e:
+                return None, [e]
+            if not toks:
+                return None, [_empty_query_error()]
+            return self._run("recover", toks, _Parser.parse_collecting)
+
+    def parse_for_context(self, toks: List[Tok]) -> dict:
+        """`_Parser(toks).parse_for_context()` — `toks` is the editor's cursor
+        prefix, which grows keystroke by keystroke like the buffer does."""
+        with self._lock:
+            return self._run("context", list(toks), _Parser.parse_for_context)
+
+    def _lex(self, text: str) -> List[Tok]:
+        """`lex(text)`, re-lexing only from the last token that starts before the
+        first changed character (an edit can extend the token it follows)."""
+        if self._text is None:
+            toks = lex(text)
+        else:
+            common = len(os.path.commonprefix([self._text, text]))
+            keep = bisect_left([t.pos for t in self._toks], common) - 1
+            if keep <= 0:
+                toks = lex(text)
+            else:
+                toks = self._toks[:keep] + lex(text, self._toks[keep].pos)
+        self._text, self._toks = text, toks
+        return toks
+
+    def _run(self, mode: str, toks: List[Tok], entry):
+        p = _Parser(_TrackedToks(toks))
+        prev = self._records.get(mode)
+        if prev is not None:
+            p._prev = prev
+            p._changed_at = _first_changed_tok(prev.toks, toks)
+        p._record = _ParseRecord(toks)
+        try:
+            return entry(p)
+        finally:
+            p._record.diagnostics = p._diagnostics
+            self._records[mode] = p._record
+
+
+def _first_changed_tok(old: List[Tok], new: List[Tok]) -> int:
+    n = min(len(old), len(new))
+    for i in range(n):
+        if old[i] is not new[i] and old[i] != new[i]:
+            return i
+    return n
+
+
+_sessions: "OrderedDict[str, ParseSession]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def get_parse_session(session_id: str) -> ParseSession:
+    """The ParseSession for an editor buffer id, created on first use."""
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            session = _sessions[session_id] = ParseSession()
+            while len(_sessions) > MAX_PARSE_SESSIONS:
+                _sessions.popitem(last=False)
+        else:
+            _sessions.move_to_end(session_id)
+        return session
+
+
 # ---------------------------------------------------------------------------
 # Renderer  (OQO -> canonical OQL text)
 # ---------------------------------------------------------------------------
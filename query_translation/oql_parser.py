@@ -31,7 +31,7 @@ class OQLParseError(Exception):
         self.errors = errors or []
 
 
-def parse_oql_to_oqo(oql: str) -> OQO:
+def parse_oql_to_oqo(oql: str, session=None) -> OQO:
     """
     Parse an OQL string into an OQO object.
 
@@ -47,6 +47,7 @@ def parse_oql_to_oqo(oql: str) -> OQO:
 
     Args:
         oql: The OQL string to parse
+        session: optional editor `ParseSession` to parse incrementally with
 
     Returns:
         OQO object
@@ -55,7 +56,7 @@ def parse_oql_to_oqo(oql: str) -> OQO:
         OQLParseError: If parsing fails
     """
     try:
-        return _engine_parse(oql)
+        return session.parse(oql) if session is not None else _engine_parse(oql)
     except _OQLError as e:
         message = f"{e.message}  Fix: {e.fixit}" if e.fixit else e.message
         perr = ParseError(
@@ -185,11 +185,10 @@ def _translate_leaf(leaf: LeafFilter, fields_dict) -> Q:
         return q
 
     url_value = _encode_leaf_value(leaf)
-    # Field instances are stateful; build_query() reads self.value. This matches
-    # the existing core/filter.py:filter_records pattern.
-    field.value = url_value
+    # `fields_dict` holds shared singletons; build from a per-request bound copy
+    # (Field.bind), the same pattern as core/filter.py:filter_records.
     try:
-        q = field.build_query()
+        q = field.bind(url_value).build_query()
     except APIQueryParamsError:
         raise
     except Exception as e:
@@ -0,0 +1,98 @@
+"""Memoized query translation: parse -> validate -> render, shared by the routes.
+
+The GUI re-translates the same query on every chip change, and each of
+`/query/{oql,oxurl,oqo}/...`, `POST /query`, the editor's `/validate` and
+`GET /?oql=` used to parse it, validate the OQO against the property catalog
+and render every format from scratch. Parsing and validation are pure functions
+of the input and the boot-static catalog (`core/properties.py`), so each
+input's `Translation` is kept in a bounded in-process LRU keyed on
+(input format, text, sort_operands, properties fingerprint).
+
+Rendering is the one impure step — the annotated OQL resolves entity display
+names through ES (`x_query.safe_get_display_name`, which answers None on a
+failed lookup) — so entries expire after TRANSLATION_TIMEOUT seconds rather
+than pinning a name, or a missed lookup, for the life of the worker.
+
+Entries are shared between requests: treat a Translation, its OQO, validation
+and formats as read-only.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from core.properties import properties_fingerprint
+from query_translation.oql_parser import parse_oql_to_oqo
+from query_translation.validator import validate_oqo
+
+# LRU bound and entry lifetime (seconds) of the translation cache.
+MAX_TRANSLATIONS = 4096
+TRANSLATION_TIMEOUT = 300
+
+_translations = OrderedDict()
+_translations_lock = threading.Lock()
+
+
+class Translation:
+    """One input's parsed OQO (or parse error), its validation, and its rendered
+    formats. `error` is whatever the format's parse returned — an error string
+    for oxurl/oqo, the raised exception for oql."""
+
+    __slots__ = ("oqo", "error", "validation", "sort_operands", "_formats")
+
+    def __init__(self, oqo, error, sort_operands):
+        self.oqo = oqo
+        self.error = error
+        self.sort_operands = sort_operands
+        self.validation = validate_oqo(oqo) if error is None else None
+        self._formats = None
+
+    def formats(self):
+        """`render_all_formats(oqo, validation, sort_operands)`, rendered on first use."""
+        if self._formats is None:
+            from query_translation.views import render_all_formats  # lazy: avoid import cycle
+            self._formats = render_all_formats(
+                self.oqo, self.validation, sort_operands=self.sort_operands)
+        return self._formats
+
+
+def get_translation(input_format, text, sort_operands, parse):
+    """The Translation of `text`, built with `parse(text) -> (oqo, error)` on a
+    miss. Every caller of one `input_format` must parse it the same way — the
+    entry is shared between them."""
+    key = (input_format, text, sort_operands, properties_fingerprint())
+    now = time.monotonic()
+    with _translations_lock:
+        entry = _translations.get(key)
+        if entry is not None and entry[0] > now:
+            _translations.move_to_end(key)
+            return entry[1]
+
+    oqo, error = parse(text)
+    translation = Translation(oqo, error, sort_operands)
+    with _translations_lock:
+        _translations[key] = (now + TRANSLATION_TIMEOUT, translation)
+        _translations.move_to_end(key)
+        while len(_translations) > MAX_TRANSLATIONS:
+            _translations.popitem(last=False)
+    return translation
+
+
+def translate_oql(oql, session=None):
+    """The Translation of an OQL string. `error` is the exception
+    `parse_oql_to_oqo` raised (an `OQLParseError` chaining the engine's
+    `OQLError` for a malformed query). OQL text always keeps the user's operand
+    order (decision 30), so one entry serves the display routes, the editor and
+    execution. `session` (an editor `ParseSession`) only speeds up a miss."""
+    return get_translation("oql", oql, False, lambda text: _parse_oql(text, session))
+
+
+def _parse_oql(oql, session):
+    try:
+        return parse_oql_to_oqo(oql, session=session), None
+    except Exception as e:
+        # the exception is cached: don't pin the parser's frames with it
+        e.__traceback__ = None
+        if e.__cause__ is not None:
+            e.__cause__.__traceback__ = None
+        return None, e
@@ -17,8 +17,11 @@ applies it uniformly via `~q`, so it is NOT constrained here.
 """
 
 import difflib
+import heapq
 import re
+from collections import Counter
 from dataclasses import dataclass
+from itertools import chain
 from typing import Any, Dict, List, Optional
 
 from core.entities import entity_for_id_prefix, get_entity_type
@@ -225,8 +228,103 @@ _SUGGEST_CUTOFF = 0.8  # min edit-distance ratio; below this, suggest nothing
                        # (a spurious suggestion is worse than none — oxjob #423).
 
 
+class _ColumnSuggestIndex:
+    """A column-id set indexed for `_suggest_columns`, so a miss doesn't scan (and
+    SequenceMatcher) every registered column.
+
+    Tier 1 is a lookup by sorted segment multiset. Tier 2 narrows the
+    `difflib.get_close_matches` candidates to those that can still reach the cutoff,
+    then scores only those with the same SequenceMatcher ratio:
+      - length: `ratio <= 2*min(la, lb)/(la + lb)` (difflib's real_quick_ratio), so
+        only a band of lengths around the miss can qualify;
+      - bigrams: the matched characters M form in-order common blocks, and B blocks
+        leave at least B-1 unmatched characters, so the two strings share at least
+        `M - B >= 3M - (la + lb) - 1` bigrams — a bigram inverted index counts the
+        shared bigrams of just the columns that have any. Postings are keyed by
+        (bigram, occurrence number), so counting a column's hits over the miss's
+        keys is the size of the two bigram multisets' intersection;
+      - difflib's own quick_ratio (shared characters), before the full ratio.
+    All are necessary conditions, so the suggestions are exactly the linear scan's.
+    """
+
+    def __init__(self, column_ids):
+        self.column_ids = list(column_ids)
+        self.by_segments: Dict[tuple, List[str]] = {}
+        self.by_length: Dict[int, List[int]] = {}
+        self.bigrams: Dict[tuple, List[int]] = {}
+        for i, c in enumerate(self.column_ids):
+            self.by_segments.setdefault(tuple(sorted(c.split("."))), []).append(c)
+            self.by_length.setdefault(len(c), []).append(i)
+            for key in _bigram_keys(c):
+                self.bigrams.setdefault(key, []).append(i)
+
+    def permutations(self, bad_id: str) -> List[str]:
+        """Columns with `bad_id`'s dot-segments in a different order."""
+        return [
+            c for c in self.by_segments.get(tuple(sorted(bad_id.split("."))), ())
+            if c != bad_id
+        ]
+
+    def close_matches(self, bad_id: str, n: int, cutoff: float) -> List[str]:
+        """`difflib.get_close_matches(bad_id, column_ids, n, cutoff)`."""
+        la = len(bad_id)
+        lengths = [
+            lb for lb in self.by_length
+            if la + lb and 2.0 * min(la, lb) / (la + lb) >= cutoff
+        ]
+        if not lengths:
+            return []
+        shared = Counter(chain.from_iterable(
+            self.bigrams.get(key, ()) for key in _bigram_keys(bad_id)))
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(bad_id)
+        scored = []
+        for lb in lengths:
+            total = la + lb
+            # floor(): never above the least M that reaches the cutoff
+            need = 3 * int(cutoff * total / 2) - total - 1
+            for i in self.by_length[lb]:
+                if need > 0 and shared[i] < need:
+                    continue
+                matcher.set_seq1(self.column_ids[i])
+                if matcher.quick_ratio() < cutoff:
+                    continue
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scored.append((score, self.column_ids[i]))
+        return [c for _score, c in heapq.nlargest(n, scored)]
+
+
+def _bigram_keys(s: str) -> List[tuple]:
+    """`s`'s bigrams, each numbered by its occurrence: "abab" -> ab1 ba1 ab2."""
+    seen: Dict[str, int] = {}
+    keys = []
+    for i in range(len(s) - 1):
+        gram = s[i:i + 2]
+        seen[gram] = seen.get(gram, 0) + 1
+        keys.append((gram, seen[gram]))
+    return keys
+
+
+# id(column set) -> (column set, its index). The validator passes the boot-static
+# per-entity property dicts, so this holds one entry per entity.
+_suggest_indexes: Dict[int, tuple] = {}
+_MAX_SUGGEST_INDEXES = 64
+
+
+def _column_suggest_index(column_ids) -> _ColumnSuggestIndex:
+    entry = _suggest_indexes.get(id(column_ids))
+    if entry is None or entry[0] is not column_ids:
+        if len(_suggest_indexes) >= _MAX_SUGGEST_INDEXES:
+            _suggest_indexes.clear()
+        entry = (column_ids, _ColumnSuggestIndex(column_ids))
+        _suggest_indexes[id(column_ids)] = entry
+    return entry[1]
+
+
 def _suggest_columns(
-    bad_id: Any, column_ids: List[str], max_suggestions: int = 2
+    bad_id: Any, column_ids, max_suggestions: int = 2
 ) -> List[str]:
     """Closest registered column id(s) to a missed `bad_id`, for an
     `invalid_column` "did you mean" hint (oxjob #423). Pure; offline-testable.
@@ -239,18 +337,18 @@ def _suggest_columns(
       Tier 2 — plain edit-distance near-misses (typos: `pubilcation_year` ->
         `publication_year`) at ratio >= _SUGGEST_CUTOFF.
     Tier-1 hits rank ahead of tier-2; results are deduped and capped. Returns []
-    when nothing is close (e.g. a clearly-bogus `zzzzz`)."""
+    when nothing is close (e.g. a clearly-bogus `zzzzz`).
+
+    `column_ids` is indexed once per object (`_ColumnSuggestIndex`) — pass the
+    same long-lived collection (the entity's property dict) on every call."""
     if not isinstance(bad_id, str) or not bad_id:
         return []
-    bad_segs = bad_id.split(".")
+    index = _column_suggest_index(column_ids)
     ranked: List[str] = []
 
     # Tier 1: permutations of the same segment multiset (different order).
-    if len(bad_segs) > 1:
-        permutations = [
-            c for c in column_ids
-            if c != bad_id and sorted(c.split(".")) == sorted(bad_segs)
-        ]
+    if "." in bad_id:
+        permutations = index.permutations(bad_id)
         permutations.sort(
             key=lambda c: difflib.SequenceMatcher(None, bad_id, c).ratio(),
             reverse=True,
@@ -258,9 +356,7 @@ def _suggest_columns(
         ranked.extend(permutations)
 
     # Tier 2: edit-distance near-misses.
-    for c in difflib.get_close_matches(
-        bad_id, column_ids, n=max_suggestions, cutoff=_SUGGEST_CUTOFF
-    ):
+    for c in index.close_matches(bad_id, max_suggestions, _SUGGEST_CUTOFF):
         if c not in ranked:
             ranked.append(c)
 
@@ -575,7 +671,7 @@ class OQOValidator:
             # at _validate_closed_vocab. Makes the three causes of invalid_column
             # self-diagnosing — a wrong segment order (`<f>.exact.search`), a
             # plain typo, or a genuinely-unregistered field (no suggestion).
-            suggestions = _suggest_columns(f.column_id, list(columns.keys()))
+            suggestions = _suggest_columns(f.column_id, columns)
             hint = ""
             if suggestions:
                 names = " or ".join(f"'{s}'" for s in suggestions)
@@ -25,9 +25,10 @@ from flask import Blueprint, jsonify, request
 from core.properties import get_entity_properties, render_properties
 from query_translation.oqo import OQO
 from query_translation.oqo_canonicalizer import canonicalize_oqo
-from query_translation.oql_parser import parse_oql_to_oqo
 from query_translation.oql_renderer import make_engine_resolver
 from query_translation.oql_render_v2 import render_v2_and_oql
+from query_translation.translation_cache import get_translation
+from query_translation.translation_cache import translate_oql as _translate_oql
 from query_translation.url_parser import parse_url_to_oqo
 from query_translation.url_renderer import URLRenderError, render_oqo_to_url
 from query_translation.x_query import (
@@ -181,19 +182,16 @@ def post_query():
             "bad_request", status=400)
 
     if body.get("oql") is not None:
-        try:
-            oqo = parse_oql_to_oqo(body["oql"])
-        except Exception as e:  # OQLParseError and friends → 400
-            return _error_response(f"Failed to parse OQL: {e}", "parse_error", status=400)
-        return _translate_response(oqo, None, sort_operands=False)
+        return _translate_oql_response(body["oql"])
 
     if body.get("oqo") is not None:
-        oqo, err = parse_oqo_input(None, body["oqo"])
-        return _translate_response(oqo, err, sort_operands=False)
+        value = body["oqo"]
+        if not isinstance(value, str):
+            value = json.dumps(value, sort_keys=True)
+        return _translate_response(_translate_oqo_value(value))
 
     if body.get("oxurl") is not None:
-        oqo, err = _parse_oxurl_value(body["oxurl"])
-        return _translate_response(oqo, err)
+        return _translate_response(_translate_oxurl_value(body["oxurl"]))
 
     return _error_response(
         "POST /query needs a JSON body with one of: oql, oqo, oxurl.",
@@ -245,21 +243,44 @@ def _parse_oxurl_value(value: str):
     return parse_url_input(entity_type, input_data)
 
 
-def _translate_response(oqo, parse_error, sort_operands: bool = True):
+def _translate_oxurl_value(value: str):
+    """The (memoized) Translation of an oxurl string; oxurl input is machine-shaped,
+    so it renders sorted/canonical."""
+    return get_translation("oxurl", value, True, _parse_oxurl_value)
+
+
+def _translate_oqo_value(value: str):
+    """The (memoized) Translation of OQO JSON text; a builder/direct-OQO submit
+    keeps its given operand order (decision 30, #363)."""
+    return get_translation("oqo", value, False, lambda text: parse_oqo_input(None, text))
+
+
+def _translate_oql_response(oql: str):
+    translation = _translate_oql(oql)
+    if translation.error is not None:  # OQLParseError and friends → 400
+        return _error_response(
+            f"Failed to parse OQL: {translation.error}", "parse_error", status=400)
+    # decision 30 (#363): honor the order the user wrote — don't re-sort clauses/values.
+    return _translate_response(translation)
+
+
+def _translate_response(translation):
     """Shared tail for the translation routes: validate + render all formats.
 
-    `sort_operands=False` (the OQL-text / direct-OQO routes) preserves the user's
-    given operand order in the rendered output (decision 30, #363).
+    `translation` is a memoized `translation_cache.Translation` — its validation and
+    rendered formats are computed once per input and shared, so never mutate them.
+    The OQL-text / direct-OQO routes translate with `sort_operands=False`, which
+    preserves the user's given operand order in the rendered output (decision 30, #363).
     """
-    if parse_error:
-        return _error_response(parse_error, "parse_error", status=400)
+    if translation.error:
+        return _error_response(translation.error, "parse_error", status=400)
 
-    validation_result = validate_oqo(oqo)
+    validation_result = translation.validation
     if not validation_result.valid:
         return jsonify({
-            "oxurl": None, "oql": None, "oqo": oqo.to_dict(), "validation": validation_result.to_dict(), }), 400
+            "oxurl": None, "oql": None, "oqo": translation.oqo.to_dict(), "validation": validation_result.to_dict(), }), 400
 
-    return jsonify(render_all_formats(oqo, validation_result, sort_operands=sort_operands)), 200
+    return jsonify(translation.formats()), 200
 
 
 @blueprint.route("/query/oxurl/<path:value>", methods=["GET"])
@@ -270,8 +291,7 @@ def translate_oxurl(value: str):
     does NOT execute the query or touch ES. Execution lives at the root — see
     `query_translation/execution.py`.
     """
-    oqo, err = _parse_oxurl_value(_full_query_value(value))
-    return _translate_response(oqo, err)
+    return _translate_response(_translate_oxurl_value(_full_query_value(value)))
 
 
 @blueprint.route("/query/oql/<path:value>", methods=["GET"])
@@ -285,12 +305,7 @@ def translate_oql(value: str):
     them near '?mailto=…'") for any caller sending standard meta params (#428).
     Callers must URL-encode the OQL (the GUI does).
     """
-    try:
-        oqo = parse_oql_to_oqo(value)
-    except Exception as e:  # OQLParseError and friends → 400
-        return _error_response(f"Failed to parse OQL: {e}", "parse_error", status=400)
-    # decision 30 (#363): honor the order the user wrote — don't re-sort clauses/values.
-    return _translate_response(oqo, None, sort_operands=False)
+    return _translate_oql_response(value)
 
 
 @blueprint.route("/query/oqo/<path:value>", methods=["GET"])
@@ -300,9 +315,7 @@ def translate_oqo(value: str):
     Same contract as /query/oql: the value is only the path segment; request
     query params (`?mailto=…`) are never part of the OQO JSON (#428).
     """
-    oqo, err = parse_oqo_input(None, value)
-    # decision 30 (#363): a builder/direct-OQO submit keeps its given operand order.
-    return _translate_response(oqo, err, sort_operands=False)
+    return _translate_response(_translate_oqo_value(value))
 
 
 def parse_url_input(entity_type: str, input_data):
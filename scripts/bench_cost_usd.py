@@ -0,0 +1,94 @@
+"""Benchmark: meta.cost_usd injection on large works pages.
+
+Compares the old `inject_cost_usd` after_request hook (jsonify the page, then
+`response.get_json()` + `json.dumps` the whole body again to add one meta
+field) against `core/late_meta.LateMetaJSONEncoder`, which merges the field in
+while the page is first serialized. Offline: synthetic works-shaped results.
+
+Run:
+  PYTHONPATH=. python scripts/bench_cost_usd.py [per_page ...]
+"""
+import json
+import sys
+import timeit
+
+from flask import Flask, jsonify
+
+from core.late_meta import LateMetaJSONEncoder
+
+
+def fake_work(n):
+    return {
+        "id": f"https://openalex.org/W{n}",
+        "doi": f"https://doi.org/10.1234/{n}",
+        "title": f"A study of thing number {n}",
+        "display_name": f"A study of thing number {n}",
+        "publication_year": 2020,
+        "cited_by_count": n % 500,
+        "authorships": [
+            {
+                "author_position": "middle",
+                "author": {"id": f"https://openalex.org/A{n}{i}", "display_name": f"Author {i}"},
+                "institutions": [{"id": f"https://openalex.org/I{i}", "display_name": "Somewhere"}],
+                "raw_affiliation_strings": ["Department of Things, Somewhere University"],
+            }
+            for i in range(12)
+        ],
+        "referenced_works": [f"https://openalex.org/W{n + i}" for i in range(40)],
+        "abstract_inverted_index": {f"word{i}": [i, i + 50] for i in range(150)},
+        "counts_by_year": [{"year": 2012 + i, "cited_by_count": i} for i in range(12)],
+    }
+
+
+def make_app(json_encoder, reencode):
+    app = Flask(__name__)
+    app.config["JSON_SORT_KEYS"] = False
+    if json_encoder:
+        app.json_encoder = json_encoder
+    page = {}
+
+    @app.route("/works")
+    def works():
+        return jsonify(page["payload"])
+
+    if reencode:
+        @app.after_request
+        def inject_cost_usd(response):
+            data = response.get_json(silent=True)
+            data["meta"]["cost_usd"] = 0.0001
+            response.data = json.dumps(data, sort_keys=False)
+            return response
+
+    return app, page
+
+
+def bench(per_page, repeat=5, number=20):
+    payload = {"meta": {"count": 10**6, "per_page": per_page}, "results": [fake_work(n) for n in range(per_page)]}
+    rows = []
+    for label, encoder, reencode in (
+        ("re-encode hook", None, True),
+        ("late-meta encoder", LateMetaJSONEncoder, False),
+    ):
+        app, page = make_app(encoder, reencode)
+        page["payload"] = payload
+        client = app.test_client()
+        body = client.get("/works", headers={"X-Cost-USD": "0.0001"}).get_json()
+        assert body["meta"]["cost_usd"] == 0.0001
+        best = min(
+            timeit.repeat(
+                lambda: client.get("/works", headers={"X-Cost-USD": "0.0001"}),
+                repeat=repeat,
+                number=number,
+            )
+        )
+        rows.append((label, best / number * 1000))
+    size_kb = len(json.dumps(payload)) / 1024
+    print(f"per_page={per_page} body={size_kb:.0f} KB")
+    for label, ms in rows:
+        print(f"  {label:<18} {ms:8.2f} ms/request")
+    print(f"  saving             {rows[0][1] - rows[1][1]:8.2f} ms/request")
+
+
+if __name__ == "__main__":
+    for per_page in [int(a) for a in sys.argv[1:]] or [25, 100, 200]:
+        bench(per_page)
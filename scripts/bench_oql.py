@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark: OQL engine throughput over docs/oql/corpus.yaml.
+
+Times the pure engine (no Flask, no ES) on every corpus row with an `oql`:
+
+  lex               tokens/sec and queries/sec
+  parse             parses/sec (ok + hint rows; error rows raise)
+  parse_collecting  parses/sec over every row, errors included
+  render            renders/sec of the ok/hint rows' parsed OQO
+
+Each stage runs the whole corpus `repeats` times and reports the best pass,
+so a stray GC pause or scheduler hiccup doesn't skew the number.
+
+Run:
+  PYTHONPATH=. venv/bin/python scripts/bench_oql.py [repeats]
+"""
+import os
+import sys
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tests.oql._qt_loader  # noqa: F401,E402  (stub package, no Flask)
+
+from query_translation.oql_lang import (  # noqa: E402
+    OQLError, lex, parse, parse_collecting, render,
+)
+
+CORPUS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "docs", "oql", "corpus.yaml"
+)
+
+
+def load_queries():
+    with open(CORPUS) as fh:
+        rows = yaml.safe_load(fh)["rows"]
+    all_queries = [r["oql"] for r in rows if r.get("oql") and r["status"] != "out-of-scope"]
+    ok_queries = [r["oql"] for r in rows if r.get("oql") and r["status"] in ("ok", "hint")]
+    return all_queries, ok_queries
+
+
+def best_pass(fn, items, repeats):
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def safe_lex(q):
+    try:
+        return lex(q)
+    except OQLError:
+        return []
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    all_queries, ok_queries = load_queries()
+    oqos = [parse(q) for q in ok_queries]
+    n_tokens = sum(len(safe_lex(q)) for q in all_queries)
+    n_chars = sum(len(q) for q in all_queries)
+    print(f"corpus: {len(all_queries)} queries ({len(ok_queries)} ok/hint), "
+          f"{n_tokens} tokens, {n_chars} chars; best of {repeats}")
+
+    elapsed = best_pass(safe_lex, all_queries, repeats)
+    print(f"{'lex':<18} {n_tokens / elapsed:>12,.0f} tokens/s {len(all_queries) / elapsed:>10,.0f} /s")
+    for name, fn, items in [
+        ("parse", parse, ok_queries),
+        ("parse_collecting", parse_collecting, all_queries),
+        ("render", render, oqos),
+    ]:
+        elapsed = best_pass(fn, items, repeats)
+        print(f"{name:<18} {'':>21} {len(items) / elapsed:>10,.0f} /s "
+              f"({elapsed / len(items) * 1e6:,.0f} us each)")
+
+
+if __name__ == "__main__":
+    main()
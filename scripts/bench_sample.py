@@ -0,0 +1,65 @@
+"""Benchmark: `sample=` via function_score random_score vs the indexed random key.
+
+Boots the real app against the live walden ES and times the same sampled
+/works requests twice, once with SAMPLE_RANDOM_KEY_FIELD unset (every match is
+scored by random_score) and once with it set (core/sample.py: sorted range
+queries on the key). The key field must already be indexed on the works index.
+
+Run:
+  source ~/.zshenv  # for $ES_URL_WALDEN
+  SAMPLE_RANDOM_KEY_FIELD=random_key PYTHONPATH=. \\
+    venv/bin/python scripts/bench_sample.py [repeats]
+"""
+import os
+import statistics
+import sys
+import time
+
+import settings
+from app import create_app
+
+QUERIES = [
+    "/works?sample=25&seed=1",
+    "/works?sample=200&per-page=200&seed=2&filter=publication_year:2020",
+    "/works?sample=10000&per-page=200&seed=3&filter=is_oa:true",
+    "/works?sample=10000&per-page=200&page=50&seed=4&filter=type:article",
+]
+
+
+def time_query(client, url, repeats):
+    walls, dbs, ids = [], [], None
+    for _ in range(repeats):
+        # bypass_cache: time ES, not the result cache
+        t0 = time.perf_counter()
+        resp = client.get(f"{url}&bypass_cache=true")
+        walls.append((time.perf_counter() - t0) * 1000)
+        body = resp.get_json() or {}
+        dbs.append(body.get("meta", {}).get("db_response_time_ms") or 0)
+        page_ids = [r["id"] for r in body.get("results", [])]
+        if ids is not None and page_ids != ids:
+            print(f"  WARNING: seeded sample not reproducible for {url}")
+        ids = page_ids
+    return statistics.median(walls), statistics.median(dbs), resp.status_code
+
+
+def main():
+    field = os.environ.get("SAMPLE_RANDOM_KEY_FIELD")
+    if not field:
+        sys.exit("Set SAMPLE_RANDOM_KEY_FIELD to the indexed random key field.")
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    client = create_app().test_client()
+
+    print(f"{'query':<80} {'random_score':>22} {'random key':>22}")
+    for url in QUERIES:
+        settings.SAMPLE_RANDOM_KEY_FIELD = ""
+        old_wall, old_db, old_status = time_query(client, url, repeats)
+        settings.SAMPLE_RANDOM_KEY_FIELD = field
+        new_wall, new_db, new_status = time_query(client, url, repeats)
+        print(
+            f"{url:<80} {old_wall:8.1f}ms (es {old_db:5.0f}) {new_wall:8.1f}ms (es {new_db:5.0f})"
+            + ("" if old_status == new_status == 200 else f"  status {old_status}/{new_status}")
+        )
+
+
+if __name__ == "__main__":
+    main()
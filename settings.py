@@ -48,13 +48,17 @@ WORKS_INDEX_WALDEN = "works-v34"
 WORKS_VECTOR_INDEX = "works-vectors-v1"
 USE_VECTOR_INDEX = os.environ.get("USE_VECTOR_INDEX", "false").lower() == "true"
 SEMANTIC_TEXT_BOOST = os.environ.get("SEMANTIC_TEXT_BOOST", "true").lower() == "true"
+# Text boost runs alongside kNN; past this deadline it is dropped from the pool.
+SEMANTIC_TEXT_BOOST_DEADLINE_MS = int(os.environ.get("SEMANTIC_TEXT_BOOST_DEADLINE_MS", "1500"))
 
 # Citation rescoring parameters for semantic search.
-# See core/vector_index.py hydrate_results() for how these are used.
+# See core/vector_index.py rank_candidates() for how these are used.
 CITATION_PIVOT = int(os.environ.get("CITATION_PIVOT", "100"))
 CITATION_MAX_BOOST = float(os.environ.get("CITATION_MAX_BOOST", "0.5"))
 CITATION_KNN_FLOOR = float(os.environ.get("CITATION_KNN_FLOOR", "0.5"))
 GROUPBY_VALUES_INDEX = "groupby_values"
+GROUPBY_VALUES_PRELOAD = True
+GROUPBY_VALUES_REFRESH_SECONDS = int(os.environ.get("GROUPBY_VALUES_REFRESH_SECONDS", "3600"))
 RAW_AFFILIATION_STRINGS_INDEX = "raw-affiliation-strings-v3"
 
 DO_NOT_GROUP_BY = [
@@ -124,3 +128,72 @@ SNAPSHOTS_CREDENTIALS_ENABLED = (
 SNAPSHOTS_SESSION_DURATION_SECONDS = int(
     os.environ.get("SNAPSHOTS_SESSION_DURATION_SECONDS", "43200")
 )
+
+# Response-level result cache for shared_view (see core/result_cache.py), seconds.
+RESULT_CACHE_GROUP_BY_TIMEOUT = int(os.environ.get("RESULT_CACHE_GROUP_BY_TIMEOUT", "21600"))
+RESULT_CACHE_HITS_TIMEOUT = int(os.environ.get("RESULT_CACHE_HITS_TIMEOUT", "300"))
+
+# /counts and /entities entity totals (see core/utils.get_entity_counts), seconds.
+ENTITY_COUNTS_CACHE_SECONDS = int(os.environ.get("ENTITY_COUNTS_CACHE_SECONDS", "600"))
+
+# search.semantic query embeddings (see core/semantic_search.py), seconds.
+EMBEDDING_CACHE_TIMEOUT = int(os.environ.get("EMBEDDING_CACHE_TIMEOUT", "604800"))
+
+# Compiled marshmallow dumps for works responses (see core/compiled_schema.py);
+# orjson encoding is used only when the package is installed.
+COMPILED_SERIALIZER = os.environ.get("COMPILED_SERIALIZER", "true").lower() == "true"
+SERIALIZER_ORJSON = os.environ.get("SERIALIZER_ORJSON", "false").lower() == "true"
+
+# Ranked semantic search candidate pools (see core/vector_index.py), seconds.
+SEMANTIC_POOL_CACHE_TIMEOUT = int(os.environ.get("SEMANTIC_POOL_CACHE_TIMEOUT", "600"))
+
+# Memoized `meta.x_query` echoes per (entity, query args) (see
+# core/shared_view.attach_x_query), entries.
+X_QUERY_CACHE_MAX_SIZE = int(os.environ.get("X_QUERY_CACHE_MAX_SIZE", "4096"))
+
+# List exports (format=csv|ndjson|jsonl.gz, see core/export.py): hits per
+# point-in-time page, PIT keep-alive between responses, and the rows / seconds of
+# ES paging per response -- kept well inside gunicorn's 12s worker timeout; the
+# X-Next-Cursor header resumes the export.
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_PIT_KEEP_ALIVE = os.environ.get("EXPORT_PIT_KEEP_ALIVE", "2m")
+EXPORT_MAX_ROWS = int(os.environ.get("EXPORT_MAX_ROWS", "5000"))
+EXPORT_TIME_BUDGET = float(os.environ.get("EXPORT_TIME_BUDGET", "4"))
+
+# Cursor paging over an ES point in time (see core/shared_view.set_point_in_time);
+# the PIT is kept alive this long between pages. Off by default: every abandoned
+# cursor=* walk holds its PIT open for the keep-alive.
+CURSOR_PIT = os.environ.get("CURSOR_PIT", "false").lower() == "true"
+CURSOR_PIT_KEEP_ALIVE = os.environ.get("CURSOR_PIT_KEEP_ALIVE", "1m")
+
+# Hit counting (see core/shared_view.get_track_total_hits): the default
+# count_mode (exact|lower_bound) and where lower_bound stops counting.
+DEFAULT_COUNT_MODE = os.environ.get("DEFAULT_COUNT_MODE", "exact")
+LOWER_BOUND_COUNT_THRESHOLD = int(os.environ.get("LOWER_BOUND_COUNT_THRESHOLD", "10000"))
+
+# Per-document random key in [0, 1) that works are sampled by (see
+# core/sample.py); empty keeps function_score random_score sampling.
+SAMPLE_RANDOM_KEY_FIELD = os.environ.get("SAMPLE_RANDOM_KEY_FIELD", "")
+
+# Admission control for expensive searches (see core/admission.py): queries
+# costing at least ADMISSION_COST_THRESHOLD share ADMISSION_POOL_SIZE slots per
+# dyno, waiting up to ADMISSION_QUEUE_TIMEOUT seconds before a 429. A slot is a
+# Redis lease that expires after ADMISSION_LEASE_TIMEOUT seconds -- longer than
+# gunicorn's 12s worker timeout, so a killed worker's slot comes back.
+ADMISSION_CONTROL = os.environ.get("ADMISSION_CONTROL", "false").lower() == "true"
+ADMISSION_COST_THRESHOLD = float(os.environ.get("ADMISSION_COST_THRESHOLD", "25"))
+ADMISSION_POOL_SIZE = int(os.environ.get("ADMISSION_POOL_SIZE", "2"))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "3"))
+ADMISSION_LEASE_TIMEOUT = int(os.environ.get("ADMISSION_LEASE_TIMEOUT", "15"))
+
+# /autocomplete prefix cache (see autocomplete/cache.py): entry lifetime in
+# seconds, process-local LRU entries, and the longest prefix also shared via
+# Redis. The closed vocabularies (see autocomplete/vocabulary.py) are reloaded
+# from ES every AUTOCOMPLETE_VOCABULARY_TIMEOUT seconds.
+AUTOCOMPLETE_CACHE_TIMEOUT = int(os.environ.get("AUTOCOMPLETE_CACHE_TIMEOUT", "3600"))
+AUTOCOMPLETE_CACHE_MAX_SIZE = int(os.environ.get("AUTOCOMPLETE_CACHE_MAX_SIZE", "2000"))
+AUTOCOMPLETE_SHARED_CACHE_MAX_LENGTH = int(os.environ.get("AUTOCOMPLETE_SHARED_CACHE_MAX_LENGTH", "3"))
+AUTOCOMPLETE_VOCABULARY_TIMEOUT = int(os.environ.get("AUTOCOMPLETE_VOCABULARY_TIMEOUT", "3600"))
+
+# group_by key display names (see core/group_by/display_names.py), seconds.
+DISPLAY_NAME_CACHE_TIMEOUT = int(os.environ.get("DISPLAY_NAME_CACHE_TIMEOUT", "86400"))
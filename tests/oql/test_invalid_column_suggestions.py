@@ -11,12 +11,18 @@ the no-spurious-suggestion guarantee.
 Pure: no app boot (core.properties imports without Flask). Run with
     PYTHONPATH=. pytest tests/oql/test_invalid_column_suggestions.py -q --noconftest
 """
+import difflib
+import random
+
 import pytest
 
 import tests.oql._qt_loader  # noqa: F401  (installs the pure query_translation stub)
 
 from query_translation.validator import (  # noqa: E402
+    _SUGGEST_CUTOFF,
+    _column_suggest_index,
     _suggest_columns,
+    ENTITY_PROPERTIES,
     get_entity_properties,
     validate_oqo,
 )
@@ -68,6 +74,42 @@ def test_non_string_id_is_safe():
     assert _suggest_columns(42, WORKS_COLS) == []
 
 
+# --- the suggestion index ----------------------------------------------------
+
+def _typos(column_ids, n, seed=0):
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz._"
+    for _ in range(n):
+        chars = list(rnd.choice(column_ids))
+        for _ in range(rnd.randint(0, 4)):
+            i = rnd.randrange(len(chars))
+            op = rnd.randrange(3)
+            if op == 0 and len(chars) > 1:
+                del chars[i]
+            elif op == 1:
+                chars.insert(i, rnd.choice(letters))
+            else:
+                chars[i] = rnd.choice(letters)
+        yield "".join(chars)
+
+
+@pytest.mark.parametrize("entity", sorted(ENTITY_PROPERTIES))
+def test_index_matches_get_close_matches(entity):
+    columns = ENTITY_PROPERTIES[entity]
+    index = _column_suggest_index(columns)
+    column_ids = list(columns)
+    for bad_id in list(_typos(column_ids, 100)) + ["zzzzz", "x", "id" * 40]:
+        for n in (1, 2, 5):
+            assert index.close_matches(bad_id, n, _SUGGEST_CUTOFF) == difflib.get_close_matches(
+                bad_id, column_ids, n=n, cutoff=_SUGGEST_CUTOFF), bad_id
+
+
+def test_index_is_built_once_per_column_set():
+    columns = get_entity_properties("works")
+    assert _column_suggest_index(columns) is _column_suggest_index(columns)
+    assert _column_suggest_index(WORKS_COLS) is not _column_suggest_index(columns)
+
+
 # --- wired into the validator message ----------------------------------------
 
 def test_message_appends_did_you_mean_for_reorder():
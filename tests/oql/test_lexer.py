@@ -0,0 +1,62 @@
+"""The OQL lexer (`oql_lang.lex`): one compiled alternation, token-for-token the
+same stream the original character loop produced.
+
+Pure: no app boot. Run with
+    PYTHONPATH=. pytest tests/oql/test_lexer.py -q --noconftest
+"""
+import pytest
+
+import tests.oql._qt_loader  # noqa: F401  (installs the pure query_translation stub)
+
+from query_translation.oql_lang import lex, OQLError, Tok  # noqa: E402
+
+
+def kinds(s):
+    return [(t.kind, t.val, t.pos) for t in lex(s)]
+
+
+def test_words_punctuation_and_operators():
+    assert kinds('works where year >= 2020 and (a>b, c);x!y') == [
+        ("WORD", "works", 0), ("WORD", "where", 6), ("WORD", "year", 12),
+        ("OP", ">=", 17), ("WORD", "2020", 20), ("WORD", "and", 25),
+        ("LP", "(", 29), ("WORD", "a>b", 30), ("COMMA", ",", 33),
+        ("WORD", "c", 35), ("RP", ")", 36), ("SEMI", ";", 37),
+        ("WORD", "x", 38), ("BANG", "!", 39), ("WORD", "y", 40),
+    ]
+
+
+def test_strings_and_annotations():
+    assert kinds('title has "deep [x] learning" [Name "q"]\n') == [
+        ("WORD", "title", 0), ("WORD", "has", 6),
+        ("STRING", "deep [x] learning", 10), ("ANNOT", 'Name "q"', 30),
+    ]
+
+
+def test_quote_runs_and_curly_quotes_collapse_to_one_string():
+    assert lex('"""universiteit maastricht"""') == [Tok("STRING", "universiteit maastricht", 0)]
+    assert lex("x “deep”") == [Tok("WORD", "x", 0), Tok("STRING", "deep", 2)]
+
+
+@pytest.mark.parametrize("q,code,position", [
+    ('title has "deep', "OQL_UNTERMINATED_STRING", 10),
+    ('title has ""', "OQL_UNTERMINATED_STRING", 10),
+    ("works [note", "OQL_UNTERMINATED_ANNOTATION", 6),
+    ("works where x ] y", "OQL_UNMATCHED_BRACKET", 14),
+])
+def test_lex_errors(q, code, position):
+    with pytest.raises(OQLError) as exc_info:
+        lex(q)
+    assert (exc_info.value.code, exc_info.value.position) == (code, position)
+
+
+def test_lexing_resumes_at_a_token_boundary():
+    q = "works where title has dogs"
+    assert lex(q, 12) == lex(q)[2:]
+
+
+@pytest.mark.parametrize("q", ['"' * 100000, "[ " * 50000, "]" * 100000, "x " * 50000])
+def test_pathological_input_is_linear(q):
+    try:
+        lex(q)
+    except OQLError:
+        pass
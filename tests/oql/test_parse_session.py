@@ -0,0 +1,140 @@
+"""Incremental editor parsing (`ParseSession`): a session's lex / parse /
+parse_collecting / parse_for_context must equal the one-shot engine on every
+keystroke, while re-parsing only from the edited clause onward.
+
+Pure: no app boot. Run with
+    PYTHONPATH=. pytest tests/oql/test_parse_session.py -q --noconftest
+"""
+import os
+
+import pytest
+import yaml
+
+import tests.oql._qt_loader  # noqa: F401  (installs the pure query_translation stub)
+
+from query_translation import oql_lang  # noqa: E402
+from query_translation.oql_context import parse_context  # noqa: E402
+from query_translation.oql_lang import (  # noqa: E402
+    ParseSession, _Parser, get_parse_session, lex, parse, parse_collecting, OQLError,
+)
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), "docs", "oql", "corpus.yaml")
+
+with open(CORPUS) as fh:
+    QUERIES = [r["oql"] for r in yaml.safe_load(fh)["rows"]
+               if r["status"] in ("ok", "hint", "error") and r.get("oql")]
+
+
+def _err(e):
+    return (e.code, e.message, e.position)
+
+
+def _strict(parse_fn, q):
+    try:
+        return parse_fn(q).to_dict()
+    except OQLError as e:
+        return _err(e)
+
+
+def _collecting(parse_fn, q):
+    oqo, diags = parse_fn(q)
+    return (oqo.to_dict() if oqo is not None else None), [_err(d) for d in diags]
+
+
+def _assert_same(session, q):
+    assert _strict(session.parse, q) == _strict(parse, q), q
+    assert _collecting(session.parse_collecting, q) == _collecting(parse_collecting, q), q
+    try:
+        toks = lex(q)
+    except OQLError:
+        return
+    assert session.parse_for_context(toks) == _Parser(list(toks)).parse_for_context(), q
+
+
+def _edits(q):
+    """Keystroke-ish buffers for `q`: typed out, then edited mid-way and at the end."""
+    mid = len(q) // 2
+    typed = [q[:n] for n in range(1, len(q) + 1, max(7, len(q) // 40))] + [q]
+    return typed + [
+        q[:mid] + "x" + q[mid:],            # insert in the middle
+        q,                                  # ...and undo it
+        q[:mid] + q[mid + 1:],              # delete in the middle
+        q + " and year is 2020",            # append a clause
+        q + " and year is",                 # backspace into it
+        q[:-1],                             # trim the end
+        '"' + q,                            # break the lexer
+        q,
+    ]
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_session_matches_one_shot_parse_across_edits(q):
+    session = ParseSession()
+    for text in _edits(q):
+        _assert_same(session, text)
+
+
+def test_session_lex_matches_full_lex():
+    session = ParseSession()
+    for text in ('works where title has "deep', 'works where title has "deep learning"',
+                 "works where title has deep learning", "works where titl has x",
+                 "works [note] where year is 2020", ""):
+        try:
+            expected = lex(text)
+        except OQLError:
+            continue
+        assert session.lex(text) == expected
+
+
+def _long_query(n):
+    return "works where " + " and ".join(f"cited_by_count > {i}" for i in range(n))
+
+
+def test_editing_the_last_clause_reparses_only_the_tail(monkeypatch):
+    calls = []
+    operand = _Parser._operand_tracked
+    monkeypatch.setattr(_Parser, "_operand_tracked",
+                        lambda self: calls.append(self.i) or operand(self))
+    session = ParseSession()
+    q = _long_query(200)
+    session.parse(q)
+    assert len(calls) == 200
+
+    edited = q + "1"
+    expected = parse(edited).to_dict()
+    calls.clear()
+    assert session.parse(edited).to_dict() == expected
+    assert len(calls) == 1
+
+
+def test_editing_an_early_clause_reparses_from_there(monkeypatch):
+    session = ParseSession()
+    q = _long_query(50)
+    session.parse_collecting(q)
+    edited = q.replace("cited_by_count > 10 ", "cited_by_count > abc ", 1)
+    expected = _collecting(parse_collecting, edited)
+    assert expected[1][0][0] == "OQL_BAD_NUMBER"
+    calls = []
+    operand = _Parser._operand_tracked
+    monkeypatch.setattr(_Parser, "_operand_tracked",
+                        lambda self: calls.append(self.i) or operand(self))
+    assert _collecting(session.parse_collecting, edited) == expected
+    assert len(calls) == 40
+
+
+def test_parse_context_with_session_matches():
+    session = ParseSession()
+    q = "works where type is article and institution is university of fl"
+    for pos in list(range(0, len(q) + 1, 3)) + [len(q)]:
+        assert parse_context(q[:pos], pos, session=session) == parse_context(q[:pos], pos)
+
+
+def test_sessions_are_kept_per_id_and_bounded(monkeypatch):
+    monkeypatch.setattr(oql_lang, "MAX_PARSE_SESSIONS", 2)
+    monkeypatch.setattr(oql_lang, "_sessions", oql_lang.OrderedDict())
+    a = get_parse_session("a")
+    assert get_parse_session("a") is a
+    get_parse_session("b")
+    get_parse_session("c")
+    assert list(oql_lang._sessions) == ["b", "c"]
@@ -0,0 +1,141 @@
+"""Unit tests for admission control of expensive ES queries (core/admission.py)."""
+
+import pytest
+from elasticsearch_dsl import A, Q, Search
+
+import core.admission as admission
+from core.admission import admit_query, estimate_query_cost
+from core.exceptions import APIOverloadedError
+from core.group_by.buckets import create_nested_group_by_buckets
+from works.fields import fields_dict
+
+
+def _cost(s, hits=0):
+    return estimate_query_cost(s.to_dict(), hits)
+
+
+def test_plain_filtered_page_is_cheap():
+    s = Search().filter("term", type="article").extra(track_total_hits=True)
+    assert _cost(s, hits=25) == pytest.approx(2.025)
+
+
+def test_cost_grows_with_terms_values_and_wildcards():
+    ids = [f"W{i}" for i in range(100)]
+    assert _cost(Search().filter("terms", ids=ids)) == pytest.approx(6)
+    wildcard = Search().query(Q("query_string", query="smart* phon?"))
+    assert _cost(wildcard) == pytest.approx(11)
+    intervals = Search().query(
+        Q("intervals", title={"all_of": {"intervals": [{"wildcard": {"pattern": "smart*"}}]}})
+    )
+    assert _cost(intervals) == pytest.approx(16)
+
+
+def test_sample_and_deep_pages_cost_more():
+    sample = Search().query(Q("function_score", functions={"random_score": {}}))
+    assert _cost(sample, hits=200) == pytest.approx(11.2)
+    assert _cost(Search(), hits=10000) == pytest.approx(11)
+
+
+def _group_by(*dimensions, q=None):
+    return create_nested_group_by_buckets(
+        fields_dict, [(d, False) for d in dimensions], Search(), {"q": q, "per_page": 200}
+    )
+
+
+def test_group_by_costs_the_buckets_it_returns():
+    flat = Search()
+    flat.aggs.bucket("by_year", A("terms", field="publication_year", size=200, shard_size=5000))
+    assert _cost(flat) == pytest.approx(1.4)
+
+
+def test_nested_group_by_multiplies_bucket_counts_up_to_a_cap():
+    nested = Search()
+    nested.aggs.bucket("by_year", A("terms", field="publication_year", size=20)).bucket(
+        "by_type", A("terms", field="type", size=10)
+    )
+    assert _cost(nested) == pytest.approx(1 + 0.04 + 0.4)
+    assert _cost(_group_by("type", "publication_year")) == pytest.approx(
+        1 + 0.4 + admission.NESTED_AGG_MAX_COST
+    )
+
+
+def test_typical_multi_dimension_group_bys_skip_the_pool():
+    threshold = admission.settings.ADMISSION_COST_THRESHOLD
+    assert _cost(_group_by("type", "publication_year")) < threshold
+    assert _cost(_group_by("type", "publication_year", q="cancer")) < threshold
+    assert _cost(_group_by("type", "publication_year", "language")) < threshold
+
+
+class _FakeLeases:
+    """The slice of the Redis cache admission uses: add-if-absent and delete."""
+
+    def __init__(self):
+        self.keys = {}
+
+    def add(self, key, value, timeout=None):
+        if key in self.keys:
+            return False
+        self.keys[key] = timeout
+        return True
+
+    def delete(self, key):
+        self.keys.pop(key, None)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(admission.settings, "ADMISSION_CONTROL", True)
+    monkeypatch.setattr(admission.settings, "ADMISSION_COST_THRESHOLD", 10)
+    monkeypatch.setattr(admission.settings, "ADMISSION_POOL_SIZE", 1)
+    monkeypatch.setattr(admission.settings, "ADMISSION_QUEUE_TIMEOUT", 0.01)
+    leases = _FakeLeases()
+    monkeypatch.setattr(admission, "cache", leases)
+    return leases
+
+
+EXPENSIVE = Search().query(Q("function_score", functions={"random_score": {}}))
+
+
+def _take_every_slot(leases):
+    for key in admission.get_slot_keys():
+        leases.add(key, 1)
+
+
+def test_cheap_queries_skip_the_pool(pool):
+    _take_every_slot(pool)
+    with admit_query(Search(), hits=25):
+        pass
+
+
+def test_expensive_query_holds_an_expiring_lease(pool):
+    with admit_query(EXPENSIVE):
+        assert pool.keys == {admission.get_slot_keys()[0]: admission.settings.ADMISSION_LEASE_TIMEOUT}
+    assert pool.keys == {}
+
+
+def test_expensive_query_is_rejected_when_the_pool_is_full(pool):
+    _take_every_slot(pool)
+    with pytest.raises(APIOverloadedError) as exc_info:
+        with admit_query(EXPENSIVE):
+            pass
+    assert exc_info.value.code == 429
+
+
+def test_lease_outlives_the_worker_timeout():
+    assert admission.settings.ADMISSION_LEASE_TIMEOUT > 12
+
+
+def test_unreachable_redis_admits_without_a_slot(pool, monkeypatch):
+    def down(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(pool, "add", down)
+    with admit_query(EXPENSIVE):
+        pass
+
+
+def test_disabled_admission_control_admits_everything(pool, monkeypatch):
+    monkeypatch.setattr(admission.settings, "ADMISSION_CONTROL", False)
+    _take_every_slot(pool)
+    with admit_query(EXPENSIVE):
+        pass
@@ -0,0 +1,136 @@
+"""Unit tests for the /autocomplete prefix cache (autocomplete/cache.py) and the
+in-memory closed-vocabulary index (autocomplete/vocabulary.py)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import autocomplete.cache as ac_cache
+import autocomplete.vocabulary as vocabulary
+from autocomplete.schemas import MessageSchema
+from autocomplete.vocabulary import VocabularyIndex, normalize_phrase
+
+
+def _hit(n, display_name, works_count, **source):
+    source.update(id=f"https://openalex.org/languages/{n}", display_name=display_name, works_count=works_count)
+    return {"_index": "languages-v1", "_id": n, "_score": None, "_source": source}
+
+
+HITS = [
+    _hit("en", "English", 900),
+    _hit("es", "Spanish", 300, display_name_alternatives=["Español", "Castilian"]),
+    _hit("pt-br", "Brazilian Portuguese", 200),
+    _hit("pt", "Portuguese", 400),
+]
+
+
+def _names(response):
+    return [hit.display_name for hit in response]
+
+
+def test_normalize_phrase():
+    assert normalize_phrase("  Español, (Castilian)") == "espanol castilian"
+    assert normalize_phrase("?!") == ""
+
+
+def test_vocabulary_matches_phrase_prefixes_by_popularity():
+    index = VocabularyIndex("languages-v1", HITS)
+    assert _names(index.search("port", "-works_count")) == ["Portuguese", "Brazilian Portuguese"]
+    assert _names(index.search("brazilian po", "-works_count")) == ["Brazilian Portuguese"]
+    assert _names(index.search("ESPA", "-works_count")) == ["Spanish"]
+    assert index.search("portuguese brazilian", "-works_count").hits.total.value == 0
+
+
+def test_vocabulary_response_counts_and_caps_matches():
+    index = VocabularyIndex("languages-v1", HITS)
+    response = index.search("p", "-works_count", size=1)
+    assert response.hits.total.value == 2
+    assert _names(response) == ["Portuguese"]
+
+
+def test_vocabulary_response_dumps_like_an_es_response():
+    index = VocabularyIndex("languages-v1", HITS)
+    result = {
+        "meta": {"count": 1, "db_response_time_ms": 0, "page": 1, "per_page": 10},
+        "results": index.search("engl", "-works_count"),
+    }
+    (row,) = MessageSchema().dump(result)["results"]
+    assert row["display_name"] == "English"
+    assert row["works_count"] == 900
+
+
+def test_vocabularies_reload_after_timeout_and_serve_stale_on_error(monkeypatch):
+    monkeypatch.setattr(vocabulary, "_vocabularies", {})
+    monkeypatch.setattr(vocabulary.settings, "AUTOCOMPLETE_VOCABULARY_TIMEOUT", 60)
+    now = [1000.0]
+    monkeypatch.setattr(vocabulary.time, "monotonic", lambda: now[0])
+    loads = []
+
+    def load():
+        loads.append(1)
+        if len(loads) > 1:
+            raise ConnectionError("es down")
+        return "types"
+
+    assert vocabulary._get_or_load("k", load) == "types"
+    assert vocabulary._get_or_load("k", load) == "types"
+    assert len(loads) == 1
+    now[0] += 61
+    assert vocabulary._get_or_load("k", load) == "types"
+    assert len(loads) == 2
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.store[key] = value
+
+
+@pytest.fixture
+def prefix_cache(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(ac_cache, "cache", redis)
+    monkeypatch.setattr(ac_cache, "_local_cache", ac_cache.OrderedDict())
+    monkeypatch.setattr(ac_cache.settings, "DEBUG", False)
+    monkeypatch.setattr(ac_cache.settings, "AUTOCOMPLETE_CACHE_MAX_SIZE", 2)
+    return redis
+
+
+def _request(**args):
+    return SimpleNamespace(args=args)
+
+
+def test_prefix_cache_key(prefix_cache):
+    key = ac_cache.get_prefix_cache_key(_request(q="mi:t", entity_type="institution"), "2")
+    assert key == "autocomplete:mi%3At:institution:::2"
+    assert ac_cache.get_prefix_cache_key(_request(q="mit", hide_works="true"), "2") != key
+    assert ac_cache.get_prefix_cache_key(_request(), "2") is None
+    assert ac_cache.get_prefix_cache_key(_request(q="mit", bypass_cache="true"), "2") is None
+
+
+def test_short_prefixes_are_shared_long_ones_stay_local(prefix_cache):
+    short, long = _request(q="mi"), _request(q="massachusetts")
+    ac_cache.set_cached_autocomplete("k-short", short, {"results": [1]})
+    ac_cache.set_cached_autocomplete("k-long", long, {"results": [2]})
+    assert list(prefix_cache.store) == ["k-short"]
+
+    # another worker: empty local LRU, short prefix still served from Redis
+    ac_cache._local_cache.clear()
+    assert ac_cache.get_cached_autocomplete("k-short", short) == {"results": [1]}
+    assert ac_cache.get_cached_autocomplete("k-long", long) is None
+
+
+def test_local_cache_is_bounded_and_expires(prefix_cache, monkeypatch):
+    long = _request(q="massachusetts")
+    for n in range(3):
+        ac_cache.set_cached_autocomplete(f"k{n}", long, n)
+    assert list(ac_cache._local_cache) == ["k1", "k2"]
+
+    later = ac_cache.time.monotonic() + ac_cache.settings.AUTOCOMPLETE_CACHE_TIMEOUT + 1
+    monkeypatch.setattr(ac_cache.time, "monotonic", lambda: later)
+    assert ac_cache.get_cached_autocomplete("k2", long) is None
@@ -0,0 +1,208 @@
+"""Parity tests for the compiled serializer (core/compiled_schema.py).
+
+Every case dumps the same input through marshmallow and through the compiled
+dumper and compares the encoded JSON text, so key order, omitted keys, None
+handling and hook behavior must all match byte for byte.
+"""
+
+import copy
+import json
+
+import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+from marshmallow import Schema, fields
+
+from core.compiled_schema import compiled_dump, get_compiled_schema
+from core.schemas import GroupBySchema
+from works.lakebase import LakebaseHit
+from works.schemas import MessageSchema, WorksSchema
+
+
+def _work(n, **extra):
+    source = {
+        "id": f"https://openalex.org/W{n}",
+        "doi": f"https://doi.org/10.1234/{n}",
+        "title": f"Title {n} — ünïcode",
+        "display_name": f"Title {n} — ünïcode",
+        "publication_year": 2020,
+        "publication_date": "2020-01-02",
+        "ids": {"openalex": f"https://openalex.org/W{n}", "pmid": None, "extra_id": "x"},
+        "language": None,
+        "type": "article",
+        "authorships": [
+            {
+                "author_position": "first",
+                "author": {"id": "https://openalex.org/A5023888391", "display_name": "A. Author"},
+                "institutions": [
+                    {"id": "https://openalex.org/I136199984", "display_name": "Inst", "lineage": ["x"]}
+                ],
+                "countries": ["US"],
+                "is_corresponding": True,
+                "raw_affiliation_strings": ["Dept"],
+            }
+        ],
+        "authorships_full": [{"author_position": "first", "author": {"display_name": "Full"}}],
+        "authorships_truncated": False,
+        "primary_location": {
+            "native_id": "10.1234/x",
+            "provenance": "crossref",
+            "is_oa": "false",
+            "source": {"id": "https://openalex.org/S1", "issns": ["1234-5678"], "is_core": 1},
+        },
+        "locations": [
+            {"native_id": "1", "provenance": "unknown", "is_oa": True, "version": None},
+            {"native_id": "2", "provenance": "pubmed"},
+        ],
+        "open_access": {"is_oa": True, "oa_status": "gold", "oa_url": None},
+        "cited_by_count": "12",
+        "fwci": 1,
+        "has_content": {"pdf": True, "grobid_xml": False},
+        "abstract_inverted_index": json.dumps({"InvertedIndex": {"hello": [0], "world": [1]}}),
+        "counts_by_year": [{"year": 2021, "cited_by_count": 3}],
+        "referenced_works": [f"https://openalex.org/W{n + 1}", None],
+        "mesh": [{"descriptor_ui": "D1", "is_major_topic": 0}],
+        "topics": [{"id": "T1", "display_name": "Topic", "score": 0.5}],
+        "updated_date": "2024-01-01",
+    }
+    source.update(extra)
+    return source
+
+
+def _response(sources, with_score=True):
+    raw = {
+        "took": 1,
+        "timed_out": False,
+        "hits": {
+            "total": {"value": len(sources), "relation": "eq"},
+            "hits": [
+                {"_id": s["id"], "_score": 2.5 if with_score else None, "_source": s}
+                for s in sources
+            ],
+        },
+    }
+    return Response(Search(index="works-v34"), raw)
+
+
+def _result(sources, **meta):
+    return {
+        "meta": {"count": len(sources), "db_response_time_ms": 3, "page": 1, "per_page": 25,
+                 "groups_count": None, **meta},
+        "group_by": [],
+        "results": _response(sources),
+    }
+
+
+def _sources():
+    return [
+        _work(10),
+        _work(11, title=None, created_date="2019-01-01"),
+        # zd#22072 scrubbed work: its mag location is removed in post_dump
+        _work(
+            3150055031,
+            id="https://openalex.org/W3150055031",
+            locations=[{"native_id": "3150055031", "provenance": "mag", "is_oa": True}],
+            locations_count=1,
+        ),
+        {"id": "https://openalex.org/W12"},
+    ]
+
+
+def _assert_parity(schema_class, build_input, only=None, context=None):
+    expected = schema_class(only=only, context=context or {}).dump(build_input())
+    actual = compiled_dump(schema_class, build_input(), only=only, context=context)
+    assert json.dumps(actual) == json.dumps(expected)
+
+
+@pytest.mark.parametrize(
+    "only",
+    [
+        None,
+        ["meta", "results.id", "group_by"],
+        ["meta", "results.id", "results.doi", "results.title", "group_by"],
+        ["meta", "results.authorships", "results.content_urls", "results.relevance_score", "group_by"],
+        ["meta", "results.locations", "results.open_access", "results.id", "group_by"],
+    ],
+)
+def test_message_schema_parity(only):
+    _assert_parity(MessageSchema, lambda: _result(_sources()), only=only)
+
+
+def test_meta_x_query_and_relevance_parity():
+    _assert_parity(
+        MessageSchema,
+        lambda: _result(_sources(), x_query={"oql": "works", "url": None}, next_cursor="abc"),
+    )
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"display_relevance": False, "single_record": True},
+        {"display_relevance": False},
+    ],
+)
+def test_single_record_parity(context):
+    _assert_parity(WorksSchema, lambda: _response(_sources())[0], context=context)
+    _assert_parity(WorksSchema, lambda: LakebaseHit(_work(10)), context=context)
+    _assert_parity(WorksSchema, lambda: LakebaseHit(_work(10)), only=["id", "authorships"], context=context)
+
+
+def test_group_by_parity_with_nested_groups_and_metric_keys():
+    groups = [
+        {
+            "key": "https://openalex.org/I136199984",
+            "key_display_name": "Inst",
+            "doc_count": 5,
+            "mean_cited_by_count": 2.5,
+            "groups": [{"key": "2020", "key_display_name": "2020", "doc_count": 2}],
+        },
+        {"key": "unknown", "key_display_name": None, "doc_count": 1},
+    ]
+    _assert_parity(GroupBySchema, lambda: copy.deepcopy(groups), context=None)
+    result = {"meta": {"count": 6}, "group_by": groups}
+    _assert_parity(MessageSchema, lambda: copy.deepcopy(result))
+
+
+def test_fields_with_defaults_data_keys_and_custom_accessors():
+    class Inner(Schema):
+        x = fields.Bool()
+
+    class Custom(Schema):
+        a = fields.Str(data_key="A")
+        b = fields.Int(dump_default=7)
+        c = fields.Float(attribute="nested.value")
+        d = fields.List(fields.Int())
+        e = fields.Nested(Inner, many=True)
+        f = fields.Raw()
+        g = fields.DateTime()
+
+    import datetime
+
+    obj = {
+        "a": 1,
+        "nested": {"value": "2.5"},
+        "d": ["1", None],
+        "e": [{"x": "yes"}, {"x": "off"}, {"x": []}],
+        "f": {"anything": [1]},
+        "g": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    }
+    _assert_parity(Custom, lambda: obj)
+    _assert_parity(Custom, lambda: {})
+
+
+def test_compiled_schemas_are_cached_per_shape():
+    a = get_compiled_schema(MessageSchema, only=["meta", "results.id", "group_by"])
+    b = get_compiled_schema(MessageSchema, only=["meta", "results.id", "group_by"])
+    c = get_compiled_schema(MessageSchema, only=["meta", "results.doi", "group_by"])
+    assert a is b
+    assert a is not c
+
+
+def test_disabled_falls_back_to_marshmallow(monkeypatch):
+    import core.compiled_schema as compiled_schema
+
+    monkeypatch.setattr(compiled_schema.settings, "COMPILED_SERIALIZER", False)
+    monkeypatch.setattr(compiled_schema, "get_compiled_schema", None)
+    expected = MessageSchema().dump(_result(_sources()))
+    assert json.dumps(compiled_dump(MessageSchema, _result(_sources()))) == json.dumps(expected)
@@ -0,0 +1,91 @@
+"""Unit tests for configurable hit counting (`count_mode=exact|lower_bound`)."""
+
+import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+from core.cursor import decode_pit_cursor
+from core.exceptions import APIQueryParamsError
+from core.shared_view import format_meta, get_track_total_hits, set_size
+from core.validate import validate_count_mode
+
+
+def _params(**overrides):
+    params = {
+        "count_mode": None,
+        "cursor": None,
+        "group_by": None,
+        "page": 1,
+        "per_page": 2,
+        "sample": None,
+    }
+    params.update(overrides)
+    return params
+
+
+def _response(value, relation, n_hits=2):
+    raw = {
+        "took": 3,
+        "pit_id": "pit-b",
+        "hits": {
+            "total": {"value": value, "relation": relation},
+            "hits": [{"_id": f"W{i}", "_source": {}, "sort": [i]} for i in range(n_hits)],
+        },
+    }
+    return Response(Search(), raw)
+
+
+def test_validate_count_mode():
+    assert validate_count_mode(None) is None
+    assert validate_count_mode("Lower_Bound") == "lower_bound"
+    with pytest.raises(APIQueryParamsError):
+        validate_count_mode("approximate")
+
+
+def test_track_total_hits_per_mode(monkeypatch):
+    import core.shared_view as shared_view
+
+    assert get_track_total_hits(_params()) is True
+    assert get_track_total_hits(_params(count_mode="lower_bound")) == 10000
+    assert set_size(_params(count_mode="lower_bound"), Search()).to_dict()["track_total_hits"] == 10000
+    monkeypatch.setattr(shared_view.settings, "DEFAULT_COUNT_MODE", "lower_bound")
+    assert get_track_total_hits(_params()) == 10000
+    assert get_track_total_hits(_params(count_mode="exact")) is True
+
+
+def test_exact_mode_meta_is_unchanged():
+    meta = format_meta(_response(5, "eq"), _params(), Search())
+    assert meta["count"] == 5
+    assert "count_is_exact" not in meta
+
+
+@pytest.mark.parametrize(
+    "value, relation, sample, expected",
+    [(10000, "gte", None, False), (42, "eq", None, True), (10000, "gte", 100, True)],
+)
+def test_lower_bound_meta_flags_exactness(value, relation, sample, expected):
+    params = _params(count_mode="lower_bound", sample=sample)
+    meta = format_meta(_response(value, relation), params, Search())
+    assert meta["count_is_exact"] is expected
+
+
+def test_lower_bound_flag_rides_in_pit_cursor():
+    params = _params(
+        count_mode="lower_bound",
+        cursor="*",
+        pit={"id": "pit-a", "count": None, "count_is_exact": True, "slice": None},
+    )
+    meta = format_meta(_response(10000, "gte"), params, Search())
+    state = decode_pit_cursor(meta["next_cursor"])
+    assert state["count"] == 10000
+    assert state["count_is_exact"] is False
+
+    # a later page reports the first page's count and flag, without counting
+    later = _params(
+        count_mode="lower_bound",
+        cursor=meta["next_cursor"],
+        pit={"id": "pit-b", "count": 10000, "count_is_exact": False, "slice": None},
+    )
+    meta = format_meta(_response(0, "eq"), later, Search())
+    assert meta["count"] == 10000
+    assert meta["count_is_exact"] is False
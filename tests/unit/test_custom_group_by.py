@@ -0,0 +1,84 @@
+"""Unit tests for custom group_bys (continent / version / best_open_version).
+
+Their buckets are a keyed `filters` aggregation on the main search, so the
+request costs one ES round trip. These tests check the aggregation that gets
+built and the results read back from a canned response. Offline (no ES).
+"""
+
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+import core.group_by.custom_results as custom_results
+from core.group_by.buckets import create_group_by_buckets
+from core.group_by.custom_results import (
+    group_by_best_open_version,
+    group_by_continent,
+    group_by_version,
+)
+from country_list import COUNTRIES_BY_CONTINENT
+from works.fields import fields_dict
+
+
+def _params(**overrides):
+    base = {"cursor": None, "q": None, "per_page": 200, "sort": None, "group_by": None}
+    base.update(overrides)
+    return base
+
+
+def _aggs(group_by):
+    s = create_group_by_buckets(
+        fields_dict, group_by, False, Search(), _params(group_by=group_by)
+    )
+    return s.to_dict()["aggs"]
+
+
+def _response(agg_name, counts):
+    raw = {
+        "took": 1,
+        "hits": {"total": {"value": 100, "relation": "eq"}, "hits": []},
+        "aggregations": {
+            agg_name: {"buckets": {k: {"doc_count": v} for k, v in counts.items()}}
+        },
+    }
+    return Response(Search(), raw)
+
+
+def test_continent_is_a_filters_agg_on_the_main_search():
+    aggs = _aggs("authorships.institutions.continent")
+    buckets = aggs["groupby_authorships_institutions_continent"]["filters"]["filters"]
+    assert set(buckets) == set(COUNTRIES_BY_CONTINENT) | {"unknown"}
+    assert "terms" in buckets["Europe"]
+
+
+def test_version_and_best_open_version_filters():
+    version = _aggs("version")["groupby_version"]["filters"]["filters"]
+    assert set(version) == set(custom_results.settings.VERSIONS)
+    best = _aggs("best_open_version")["groupby_best_open_version"]["filters"]["filters"]
+    assert set(best) == {"any", "acceptedOrPublished", "published"}
+
+
+def test_continent_results_from_response():
+    counts = {c: 0 for c in COUNTRIES_BY_CONTINENT}
+    counts.update({"Europe": 30, "Asia": 50, "unknown": 5})
+    response = _response("groupby_authorships_institutions_continent", counts)
+    results = group_by_continent("authorships.institutions.continent", _params(), response)
+    assert results[0] == {"key": "Q48", "key_display_name": "Asia", "doc_count": 50}
+    assert results[1]["key_display_name"] == "Europe"
+    assert {"key": "unknown", "key_display_name": "unknown", "doc_count": 5} in results
+
+
+def test_version_results_from_response():
+    counts = {"null": 7, "acceptedVersion": 2, "submittedVersion": 3, "publishedVersion": 9}
+    response = _response("groupby_version", counts)
+    results = group_by_version("version", _params(), True, response)
+    assert [r["key"] for r in results][0] == "publishedVersion"
+    assert {r["key"]: r["doc_count"] for r in results}["unknown"] == 7
+    known = group_by_version("version", _params(), False, response)
+    assert "unknown" not in [r["key"] for r in known]
+
+
+def test_best_open_version_results_with_q():
+    counts = {"any": 10, "acceptedOrPublished": 8, "published": 5}
+    response = _response("groupby_best_open_version", counts)
+    results = group_by_best_open_version("best_open_version", _params(q="any"), response)
+    assert [r["key"] for r in results] == ["any"]
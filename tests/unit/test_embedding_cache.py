@@ -0,0 +1,108 @@
+"""Unit tests for the semantic-search query embedding cache and request
+coalescing (core/semantic_search.embed_query). The Databricks call is stubbed."""
+
+import threading
+
+import pytest
+from cachelib import SimpleCache
+
+import core.semantic_search as semantic_search
+from core.exceptions import APIQueryParamsError
+from core.semantic_search import embed_query
+
+VECTOR = [0.25, -0.5, 0.125]
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fake_fetch(text):
+        calls.append(text)
+        return list(VECTOR)
+
+    monkeypatch.setattr(semantic_search, "_fetch_embedding", fake_fetch)
+    monkeypatch.setattr(semantic_search, "cache", SimpleCache())
+    monkeypatch.setattr(semantic_search, "_embedding_cache", semantic_search.OrderedDict())
+    return calls
+
+
+def test_repeated_query_is_embedded_once(fetches):
+    assert embed_query("machine learning") == VECTOR
+    assert embed_query("machine learning") == VECTOR
+    assert fetches == ["machine learning"]
+
+
+def test_whitespace_variants_share_an_entry(fetches):
+    embed_query("machine learning")
+    embed_query("  machine   learning ")
+    assert fetches == ["machine learning"]
+
+
+def test_stored_as_float32_bytes(fetches):
+    embed_query("drug discovery")
+    (packed,) = semantic_search._embedding_cache.values()
+    assert isinstance(packed, bytes)
+    assert len(packed) == 4 * len(VECTOR)
+
+
+def test_shared_cache_serves_other_processes(fetches):
+    embed_query("climate change")
+    semantic_search._embedding_cache.clear()
+    assert embed_query("climate change") == VECTOR
+    assert len(fetches) == 1
+
+
+def test_local_cache_is_bounded(fetches, monkeypatch):
+    monkeypatch.setattr(semantic_search, "EMBEDDING_CACHE_MAX_SIZE", 2)
+    for q in ("a", "b", "c"):
+        embed_query(q)
+    assert len(semantic_search._embedding_cache) == 2
+
+
+def test_concurrent_identical_queries_are_coalesced(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(text):
+        calls.append(text)
+        release.wait(5)
+        return list(VECTOR)
+
+    monkeypatch.setattr(semantic_search, "_fetch_embedding", slow_fetch)
+    monkeypatch.setattr(semantic_search, "cache", SimpleCache())
+    monkeypatch.setattr(semantic_search, "_embedding_cache", semantic_search.OrderedDict())
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(embed_query("same query")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while not calls:
+        pass
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == ["same query"]
+    assert results == [VECTOR] * 4
+
+
+def test_failure_is_not_cached(monkeypatch):
+    def failing_fetch(text):
+        raise APIQueryParamsError("Failed to embed query: boom")
+
+    monkeypatch.setattr(semantic_search, "_fetch_embedding", failing_fetch)
+    monkeypatch.setattr(semantic_search, "cache", SimpleCache())
+    monkeypatch.setattr(semantic_search, "_embedding_cache", semantic_search.OrderedDict())
+    with pytest.raises(APIQueryParamsError):
+        embed_query("x")
+    assert not semantic_search._embedding_cache
+    assert not semantic_search._in_flight
+
+
+def test_empty_query_rejected(fetches):
+    with pytest.raises(APIQueryParamsError):
+        embed_query("   ")
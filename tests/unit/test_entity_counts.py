@@ -0,0 +1,59 @@
+"""Unit tests for core.utils.get_entity_counts: one _msearch for all indexes,
+cached per connection and refreshed in the background when stale. ES is
+stubbed."""
+
+import pytest
+
+import core.utils as utils
+from core.utils import get_entity_counts
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fake_fetch(connection, entities_to_indices):
+        calls.append(connection)
+        return {name: len(calls) for name in entities_to_indices}
+
+    refreshes = []
+    monkeypatch.setattr(utils, "fetch_entity_counts", fake_fetch)
+    monkeypatch.setattr(
+        utils,
+        "_refresh_entity_counts_in_background",
+        lambda connection, entities_to_indices: refreshes.append(connection),
+    )
+    monkeypatch.setattr(utils, "_entity_counts_cache", {})
+    return calls, refreshes
+
+
+def test_first_call_fetches_then_caches(fetches):
+    calls, refreshes = fetches
+    first = get_entity_counts(connection="walden")
+    second = get_entity_counts(connection="walden")
+    assert first == second
+    assert first["works"] == 1
+    assert len(first) == 15
+    assert calls == ["walden"]
+    assert refreshes == []
+
+
+def test_connections_are_cached_separately(fetches):
+    calls, _ = fetches
+    get_entity_counts(connection="walden")
+    get_entity_counts(connection="default")
+    assert calls == ["walden", "default"]
+
+
+def test_stale_counts_are_served_while_refreshing(fetches, monkeypatch):
+    calls, refreshes = fetches
+    get_entity_counts(connection="walden")
+    monkeypatch.setattr(utils.settings, "ENTITY_COUNTS_CACHE_SECONDS", -1)
+    assert get_entity_counts(connection="walden")["works"] == 1
+    assert refreshes == ["walden"]
+    assert calls == ["walden"]
+
+
+def test_callers_cannot_mutate_cached_counts(fetches):
+    get_entity_counts(connection="walden")["works"] = -5
+    assert get_entity_counts(connection="walden")["works"] == 1
@@ -0,0 +1,54 @@
+"""Unit tests for per-request field binding (Field.bind).
+
+The Field objects in each entity's `fields_dict` are shared module-level
+singletons; building a query must never write `value` onto them, or two
+concurrent requests (threaded workers) can read each other's filter values.
+"""
+
+from elasticsearch_dsl import Search
+
+from core.filter import filter_records
+from query_translation.oqo import LeafFilter
+from query_translation.oqo_to_es import _translate_leaf
+from works.fields import fields_dict
+
+
+def test_bind_returns_copy_with_value():
+    field = fields_dict["type"]
+    bound = field.bind("article")
+    assert bound is not field
+    assert bound.value == "article"
+    assert bound.param == field.param
+    assert field.value is None
+
+
+def test_bound_query_matches_direct_build():
+    bound = fields_dict["publication_year"].bind("2020")
+    assert bound.build_query().to_dict() == {"term": {"publication_year": "2020"}}
+
+
+def test_filter_records_does_not_mutate_shared_fields():
+    filters = [
+        {"type": "article"},
+        {"publication_year": "2019|2020"},
+        {"authorships.institutions.continent": "europe|asia"},
+        {"title.search": "bikes"},
+        {"concepts.id": "C41008148 C15708023"},
+        {"is_oa": "true"},
+    ]
+    filter_records(fields_dict, filters, Search())
+    for f in filters:
+        for key in f:
+            assert fields_dict[key].value is None, key
+
+
+def test_terms_query_does_not_mutate_shared_field():
+    field = fields_dict["authorships.author.id"]
+    field.build_terms_query(["A5023888391", "A5000000001"])
+    assert field.value is None
+
+
+def test_oqo_leaf_translation_does_not_mutate_shared_field():
+    leaf = LeafFilter(column_id="type", value="article")
+    _translate_leaf(leaf, fields_dict)
+    assert fields_dict["type"].value is None
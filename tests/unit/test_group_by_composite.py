@@ -0,0 +1,161 @@
+"""Unit tests for composite-agg group_by paging and streamed group_by exports.
+
+Cursor pages (and `sort=key:asc|desc`) enumerate buckets with a `composite`
+agg; core.shared_view.GroupByPages follows its `after_key` for one bounded
+export response and core.export.export_group_by_stream writes the pages as
+NDJSON. All offline: a fake ES client stands in for the cluster.
+"""
+
+import gzip
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch_dsl import Search
+from flask import Flask
+
+from core.cursor import encode_cursor
+from core.exceptions import APIOverloadedError
+from core.export import export_group_by_stream, is_group_by_stream_export
+from core.group_by.buckets import create_group_by_buckets, uses_composite_buckets
+import core.shared_view as shared_view
+from core.shared_view import GroupByPages
+from core.utils import get_field
+from works.fields import fields_dict
+
+GROUP_BY = "publication_year"
+AGG = "groupby_publication_year"
+
+
+class _FakeES:
+    def __init__(self, years):
+        self.years = years
+        self.searches = []
+
+    def search(self, index=None, body=None, **params):
+        self.searches.append(body)
+        composite = body["aggs"][AGG]["composite"]
+        after = composite.get("after", {}).get("sub_key")
+        # a client's cursor comes back as the key's string
+        keys = [y for y in self.years if after is None or y > int(after)]
+        page = keys[:composite["size"]]
+        agg = {"buckets": [{"key": {"sub_key": y}, "doc_count": y - 2000} for y in page]}
+        if page:
+            agg["after_key"] = {"sub_key": page[-1]}
+        return SimpleNamespace(body={
+            "took": 1,
+            "timed_out": False,
+            "hits": {"total": {"value": 0, "relation": "eq"}, "hits": []},
+            "aggregations": {AGG: agg},
+        })
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    with app.test_request_context():
+        yield app
+
+
+def _params(**overrides):
+    params = {"cursor": "*", "q": None, "per_page": 3, "sort": None, "group_by": GROUP_BY}
+    params.update(overrides)
+    return params
+
+
+def _buckets(s):
+    return s.to_dict()["aggs"][AGG]
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        (_params(), True),
+        (_params(sort={"key": "desc"}), True),
+        (_params(cursor=None), False),
+        (_params(sort={"count": "desc"}), False),
+        (_params(sort={"cited_by_count.mean": "desc"}), False),
+    ],
+)
+def test_uses_composite_buckets(params, expected):
+    assert uses_composite_buckets(get_field(fields_dict, GROUP_BY), params) is expected
+
+
+def test_fixed_bucket_fields_stay_on_their_own_aggs():
+    assert not uses_composite_buckets(get_field(fields_dict, "has_doi"), _params())
+
+
+def test_cursor_with_key_sort_pages_a_composite_agg(app):
+    s = create_group_by_buckets(fields_dict, GROUP_BY, False, Search(), _params(sort={"key": "desc"}))
+    sources = _buckets(s)["composite"]["sources"]
+    assert sources[0]["sub_key"]["terms"]["order"] == "desc"
+
+    s = create_group_by_buckets(fields_dict, GROUP_BY, False, Search(), _params(sort={"count": "desc"}))
+    assert "terms" in _buckets(s)
+
+
+def test_group_pages_follow_the_after_key(app):
+    es = _FakeES(list(range(2001, 2011)))
+    params = _params()
+    s = create_group_by_buckets(fields_dict, GROUP_BY, False, Search(index="works-v34", using=es), params)
+    pages = list(GroupByPages(s, params, GROUP_BY, False, "works-v34", fields_dict, es))
+
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [g["key"] for page in pages for g in page] == list(range(2001, 2011))
+    assert es.searches[1]["aggs"][AGG]["composite"]["after"] == {"sub_key": 2003}
+    assert len(es.searches) == 4
+
+
+def test_group_pages_stop_at_max_rows(app):
+    es = _FakeES(list(range(2001, 2011)))
+    params = _params()
+    s = create_group_by_buckets(fields_dict, GROUP_BY, False, Search(index="works-v34", using=es), params)
+    pages = GroupByPages(s, params, GROUP_BY, False, "works-v34", fields_dict, es, max_rows=4)
+    assert [len(page) for page in pages] == [3, 1]
+    # the second page only asks for the bucket the response has room for
+    assert [body["aggs"][AGG]["composite"]["size"] for body in es.searches] == [3, 1]
+    assert pages.next_cursor == encode_cursor(2004)
+
+    params = _params(cursor=pages.next_cursor)
+    s = create_group_by_buckets(fields_dict, GROUP_BY, False, Search(index="works-v34", using=es), params)
+    rest = GroupByPages(s, params, GROUP_BY, False, "works-v34", fields_dict, es, max_rows=10)
+    assert [g["key"] for page in rest for g in page] == list(range(2005, 2011))
+    assert rest.next_cursor is None
+
+
+def test_group_pages_are_admission_controlled(app, monkeypatch):
+    @contextmanager
+    def reject(s, hits=0):
+        raise APIOverloadedError("busy")
+        yield
+
+    monkeypatch.setattr(shared_view, "admit_query", reject)
+    es = _FakeES(list(range(2001, 2011)))
+    params = _params()
+    s = create_group_by_buckets(fields_dict, GROUP_BY, False, Search(index="works-v34", using=es), params)
+    with pytest.raises(APIOverloadedError):
+        list(GroupByPages(s, params, GROUP_BY, False, "works-v34", fields_dict, es))
+    assert es.searches == []
+
+
+class _Pages(list):
+    next_cursor = None
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "jsonl.gz"])
+def test_export_group_by_stream(app, export_format):
+    request = SimpleNamespace(args={"format": export_format, "group_by": GROUP_BY})
+    assert is_group_by_stream_export(request)
+    pages = _Pages([[{"key": "2001", "key_display_name": "2001", "doc_count": 1}]])
+    with app.test_request_context():
+        body = export_group_by_stream(request, pages).get_data()
+    if export_format == "jsonl.gz":
+        body = gzip.decompress(body)
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert rows == [{"key": "2001", "key_display_name": "2001", "count": 1}]
+
+
+def test_csv_group_by_export_is_not_streamed():
+    request = SimpleNamespace(args={"format": "csv", "group_by": GROUP_BY})
+    assert not is_group_by_stream_export(request)
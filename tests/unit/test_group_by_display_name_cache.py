@@ -0,0 +1,79 @@
+"""Unit tests for the cached group_by display-name resolver
+(core/group_by/display_names.lookup_display_names).
+
+ES is stubbed out; the tests check that only cache misses reach it, that the
+process-local LRU and the shared (Redis) level both serve hits, and that
+entries are scoped to the (versioned) index name.
+"""
+
+import pytest
+from cachelib import SimpleCache
+
+import core.group_by.display_names as display_names
+from core.group_by.display_names import (
+    get_display_names_host_organization,
+    lookup_display_names,
+)
+
+I1 = "https://openalex.org/I136199984"
+I2 = "https://openalex.org/I27837315"
+P1 = "https://openalex.org/P4310320990"
+NAMES = {I1: "Inst One", I2: "Inst Two", P1: "Pub One"}
+
+
+@pytest.fixture
+def es_calls(monkeypatch):
+    calls = []
+
+    def fake_search(index_name, ids, connection):
+        calls.append((index_name, list(ids)))
+        return {i: NAMES[i] for i in ids if i in NAMES}
+
+    monkeypatch.setattr(display_names, "_search_display_names", fake_search)
+    monkeypatch.setattr(display_names, "cache", SimpleCache())
+    monkeypatch.setattr(display_names, "_local_cache", display_names.OrderedDict())
+    return calls
+
+
+def test_only_misses_go_to_es(es_calls):
+    assert lookup_display_names([I1], "institutions-v8") == {I1: "Inst One"}
+    assert lookup_display_names([I1, I2], "institutions-v8") == {
+        I1: "Inst One",
+        I2: "Inst Two",
+    }
+    assert es_calls == [("institutions-v8", [I1]), ("institutions-v8", [I2])]
+
+
+def test_shared_cache_serves_after_local_eviction(es_calls):
+    lookup_display_names([I1], "institutions-v8")
+    display_names._local_cache.clear()
+    assert lookup_display_names([I1], "institutions-v8") == {I1: "Inst One"}
+    assert len(es_calls) == 1
+
+
+def test_index_version_scopes_entries(es_calls):
+    lookup_display_names([I1], "institutions-v8")
+    lookup_display_names([I1], "institutions-v9")
+    assert [c[0] for c in es_calls] == ["institutions-v8", "institutions-v9"]
+
+
+def test_unknown_and_duplicates_are_not_looked_up(es_calls):
+    assert lookup_display_names(["unknown", I1, I1], "institutions-v8") == {I1: "Inst One"}
+    assert es_calls == [("institutions-v8", [I1])]
+
+
+def test_not_found_ids_are_omitted(es_calls):
+    assert lookup_display_names(["https://openalex.org/I999"], "institutions-v8") == {}
+
+
+def test_local_cache_is_bounded(es_calls, monkeypatch):
+    monkeypatch.setattr(display_names, "LOCAL_CACHE_MAX_SIZE", 1)
+    lookup_display_names([I1, I2], "institutions-v8")
+    assert len(display_names._local_cache) == 1
+
+
+def test_host_organization_is_one_lookup(es_calls):
+    result = get_display_names_host_organization([I1, P1, "unknown"])
+    assert result == {I1: "Inst One", P1: "Pub One"}
+    assert len(es_calls) == 1
+    assert "institutions" in es_calls[0][0] and "publishers" in es_calls[0][0]
@@ -0,0 +1,79 @@
+"""Unit tests for the in-memory groupby_values table (core/group_by/utils.py).
+
+ES is stubbed; the tests check that a loaded table serves lookups without a
+search, that a missing table falls back to the per-request search and loads in
+the background, and that a stale table is refreshed in the background.
+"""
+
+import pytest
+
+import core.group_by.utils as utils
+from core.group_by.utils import get_all_groupby_values, load_groupby_values
+
+TABLE = {
+    ("works", "type"): [{"key": "article", "key_display_name": "article"}],
+    ("works", "locations.license"): [{"key": "cc-by", "key_display_name": "CC BY"}],
+}
+
+
+@pytest.fixture
+def stubbed(monkeypatch):
+    calls = {"fetch": 0, "search": 0, "refresh": 0}
+
+    def fake_fetch(connection):
+        calls["fetch"] += 1
+        return dict(TABLE)
+
+    def fake_search(entity, field, connection):
+        calls["search"] += 1
+        return [{"key": "from-es", "key_display_name": "from-es"}]
+
+    def fake_refresh(connection):
+        calls["refresh"] += 1
+
+    monkeypatch.setattr(utils, "fetch_groupby_values_table", fake_fetch)
+    monkeypatch.setattr(utils, "search_groupby_values", fake_search)
+    monkeypatch.setattr(utils, "refresh_groupby_values_in_background", fake_refresh)
+    monkeypatch.setattr(utils, "_groupby_values_tables", {})
+    monkeypatch.setattr(utils, "_groupby_values_loaded_at", {})
+    return calls
+
+
+def test_loaded_table_serves_without_search(stubbed):
+    assert load_groupby_values("walden") is True
+    assert get_all_groupby_values("works", "type", "walden") == TABLE[("works", "type")]
+    assert get_all_groupby_values("works", "unknown_field", "walden") == []
+    assert stubbed["search"] == 0
+    assert stubbed["refresh"] == 0
+
+
+def test_best_oa_location_license_maps_to_locations_license(stubbed):
+    load_groupby_values("walden")
+    assert get_all_groupby_values("works", "best_oa_location.license", "walden") == TABLE[
+        ("works", "locations.license")
+    ]
+
+
+def test_missing_table_falls_back_and_loads_in_background(stubbed):
+    result = get_all_groupby_values("works", "type", "walden")
+    assert result[0]["key"] == "from-es"
+    assert stubbed["search"] == 1
+    assert stubbed["refresh"] == 1
+
+
+def test_stale_table_triggers_background_refresh(stubbed, monkeypatch):
+    load_groupby_values("walden")
+    monkeypatch.setattr(utils, "GROUPBY_VALUES_REFRESH_SECONDS", -1)
+    assert get_all_groupby_values("works", "type", "walden") == TABLE[("works", "type")]
+    assert stubbed["refresh"] == 1
+
+
+def test_failed_load_keeps_previous_table(stubbed, monkeypatch):
+    load_groupby_values("walden")
+
+    def boom(connection):
+        raise ConnectionError("es down")
+
+    monkeypatch.setattr(utils, "fetch_groupby_values_table", boom)
+    assert load_groupby_values("walden") is False
+    assert get_all_groupby_values("works", "type", "walden") == TABLE[("works", "type")]
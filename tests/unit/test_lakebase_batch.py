@@ -0,0 +1,144 @@
+"""Unit tests for batched Lakebase work lookups (works/lakebase.get_work_docs)
+and the two callers it backs: semantic search hydration and
+`filter=ids.openalex:W1|W2|...` list requests. All offline: the per-shard SQL
+and the ES mget are stubbed.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import core.vector_index as vector_index
+from core.shared_view import _sort_docs_like_es, get_id_list_work_ids, get_lakebase_id_list_result
+from works import lakebase
+
+
+@pytest.fixture
+def shard_queries(monkeypatch):
+    """Stub _query_all with a fake docs table; records (shard, ids) per query."""
+    table = {n: {"id": f"https://openalex.org/W{n}", "title": f"t{n}"} for n in (10, 11, 12, 19, 27)}
+    calls = []
+    lock = threading.Lock()
+
+    def fake_query_all(sql, params):
+        shard = int(sql.split("lakebase_works_docs_")[1].split()[0])
+        ids = params[0]
+        assert all(i % lakebase.N_DOC_SHARDS == shard for i in ids)
+        with lock:
+            calls.append((shard, sorted(ids)))
+        return [(i, json.dumps(table[i])) for i in ids if i in table]
+
+    monkeypatch.setattr(lakebase, "_query_all", fake_query_all)
+    return calls
+
+
+def test_get_work_docs_one_query_per_shard_in_request_order(shard_queries):
+    docs = lakebase.get_work_docs([27, 10, 99, 19, 11])
+    assert [d and d["title"] for d in docs] == ["t27", "t10", None, "t19", "t11"]
+    # 27, 19, 11 share shard 3; 10 is shard 2; 99 is shard 3 too.
+    assert sorted(shard_queries) == [(2, [10]), (3, [11, 19, 27, 99])]
+
+
+def test_get_work_docs_dedupes_ids(shard_queries):
+    docs = lakebase.get_work_docs([10, 10])
+    assert [d["title"] for d in docs] == ["t10", "t10"]
+    assert shard_queries == [(2, [10])]
+
+
+def test_parse_work_id():
+    assert lakebase.parse_work_id("W123") == 123
+    assert lakebase.parse_work_id("https://openalex.org/W123") == 123
+    assert lakebase.parse_work_id("A123") is None
+    assert lakebase.parse_work_id("10.1234/abc") is None
+
+
+def _params(**overrides):
+    base = {
+        "filters": [{"is_xpac": "false"}, {"ids.openalex": "W27|W10"}],
+        "search": None,
+        "searches": [],
+        "sort": None,
+        "sample": None,
+        "cursor": None,
+        "group_by": None,
+        "group_bys": None,
+        "q": None,
+        "apc_sum": None,
+        "cited_by_count_sum": None,
+        "page": 1,
+        "per_page": 25,
+    }
+    base.update(overrides)
+    return base
+
+
+class TestIdListEligibility:
+    def test_plain_id_list(self):
+        assert get_id_list_work_ids(_params(), "works-v34") == [27, 10]
+
+    def test_alias_key(self):
+        assert get_id_list_work_ids(_params(filters=[{"openalex": "W27"}]), "works-v34") == [27]
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"filters": [{"ids.openalex": "W27"}, {"type": "article"}]},
+            {"filters": [{"ids.openalex": "W27"}, {"ids.openalex": "W10"}]},
+            {"filters": [{"ids.openalex": "!W27"}]},
+            {"sort": {"publication_date": "desc"}},
+            {"search": "bikes"},
+            {"group_by": "type"},
+            {"page": 2},
+            {"per_page": 1},
+        ],
+    )
+    def test_ineligible(self, overrides):
+        assert get_id_list_work_ids(_params(**overrides), "works-v34") is None
+
+    def test_other_entities_ineligible(self):
+        assert get_id_list_work_ids(_params(), "authors-v16") is None
+
+
+@pytest.mark.parametrize("count_mode, expected", [("lower_bound", {"count_is_exact": True}), ("exact", {})])
+def test_id_list_meta_matches_the_count_mode(monkeypatch, shard_queries, count_mode, expected):
+    monkeypatch.setattr(lakebase, "should_route", lambda request: True)
+    # eligibility is TestIdListEligibility's concern
+    monkeypatch.setattr("core.shared_view.get_id_list_work_ids", lambda params, index_name: [27, 10])
+    params = _params(filters=[{"ids.openalex": "W27|W10"}], count_mode=count_mode)
+    result = get_lakebase_id_list_result(SimpleNamespace(), params, "works-v34", ["id"])
+
+    assert result["meta"]["count"] == 2
+    assert {k: v for k, v in result["meta"].items() if k == "count_is_exact"} == expected
+
+
+def test_sort_docs_like_es_default_sort():
+    docs = [
+        {"id": "https://openalex.org/W3", "cited_by_count": 5},
+        {"id": "https://openalex.org/W2", "cited_by_count": 5, "cited_by_percentile_year": {"max": 90}},
+        {"id": "https://openalex.org/W1", "cited_by_count": 9},
+        {"id": "https://openalex.org/W4", "cited_by_count": 1, "cited_by_percentile_year": {"max": 99}},
+    ]
+    ordered = _sort_docs_like_es(docs, ["-cited_by_percentile_year.max", "-cited_by_count", "id"])
+    assert [d["id"][-2:] for d in ordered] == ["W4", "W2", "W1", "W3"]
+
+
+def test_semantic_hydration_fills_lakebase_misses_from_es(monkeypatch, shard_queries):
+    mget_ids = []
+
+    class FakeES:
+        def mget(self, index, body, _source_excludes):
+            mget_ids.extend(body["ids"])
+            return {"docs": [{"_id": i, "found": True, "_source": {"title": "es"}} for i in body["ids"]]}
+
+    monkeypatch.setattr(vector_index.connections, "get_connection", lambda name=None: FakeES())
+    hits = vector_index.fetch_docs(
+        [("W27", 0.9), ("W99", 0.8), ("W10", 0.7)], "walden", use_lakebase=True
+    )
+    assert [(h["_id"], h["title"], h["_score"]) for h in hits] == [
+        ("W27", "t27", 0.9),
+        ("W99", "es", 0.8),
+        ("W10", "t10", 0.7),
+    ]
+    assert mget_ids == ["W99"]
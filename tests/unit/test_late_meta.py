@@ -0,0 +1,64 @@
+"""Unit tests for late meta fields (core/late_meta.py): `meta.cost_usd` is
+merged in while the payload is serialized, with no parse/re-dump of the body."""
+
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from core.late_meta import LateMetaJSONEncoder, with_late_meta
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config["JSON_SORT_KEYS"] = False
+    app.json_encoder = LateMetaJSONEncoder
+    payload = {"meta": {"count": 2}, "results": [{"id": "W1"}, {"id": "W2"}]}
+
+    @app.route("/dict")
+    def as_dict():
+        return payload
+
+    @app.route("/jsonify")
+    def as_jsonify():
+        return jsonify(payload)
+
+    @app.route("/no-meta")
+    def no_meta():
+        return {"results": []}
+
+    app.payload = payload
+    return app.test_client()
+
+
+@pytest.mark.parametrize("path", ["/dict", "/jsonify"])
+def test_cost_added_to_meta(client, path):
+    response = client.get(path, headers={"X-Cost-USD": "0.0001"})
+    body = response.get_json()
+    assert body["meta"] == {"count": 2, "cost_usd": 0.0001}
+    # meta stays first and keeps its key order
+    assert list(json.loads(response.data)) == ["meta", "results"]
+    assert list(body["meta"]) == ["count", "cost_usd"]
+
+
+def test_no_header_no_cost(client):
+    assert "cost_usd" not in client.get("/dict").get_json()["meta"]
+
+
+def test_bad_header_is_ignored(client):
+    assert "cost_usd" not in client.get("/dict", headers={"X-Cost-USD": "abc"}).get_json()["meta"]
+
+
+def test_payload_without_meta_untouched(client):
+    assert client.get("/no-meta", headers={"X-Cost-USD": "1"}).get_json() == {"results": []}
+
+
+def test_view_payload_is_not_mutated(client):
+    client.get("/dict", headers={"X-Cost-USD": "1"})
+    assert client.application.payload["meta"] == {"count": 2}
+
+
+def test_with_late_meta_returns_same_object_when_nothing_to_add():
+    data = {"meta": {}}
+    assert with_late_meta(data, {}) is data
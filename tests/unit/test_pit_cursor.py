@@ -0,0 +1,225 @@
+"""Unit tests for point-in-time cursor paging (core/cursor.py,
+core/shared_view.set_point_in_time).
+
+`cursor=*` opens an ES point in time; next_cursor carries the PIT id, the sort
+values, the first page's count and an optional slice. All offline: a fake ES
+client stands in for the cluster.
+"""
+
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+from flask import Flask
+
+import core.shared_view as shared_view
+
+from core.cursor import (
+    decode_pit_cursor,
+    encode_cursor,
+    encode_pit_cursor,
+    get_next_cursor,
+    handle_cursor,
+    parse_cursor_slice,
+)
+from core.exceptions import APIPaginationError
+from core.shared_view import calculate_sample_or_default_count, set_point_in_time
+
+
+class _FakeES:
+    def __init__(self):
+        self.opened = []
+        self.closed = []
+
+    def open_point_in_time(self, index, keep_alive):
+        self.opened.append((index, keep_alive))
+        return {"id": "pit-a"}
+
+    def close_point_in_time(self, id):
+        self.closed.append(id)
+
+
+@pytest.fixture(autouse=True)
+def cursor_pit(monkeypatch):
+    monkeypatch.setattr(shared_view.settings, "CURSOR_PIT", True)
+    monkeypatch.setattr(shared_view.settings, "CURSOR_PIT_KEEP_ALIVE", "1m")
+
+
+def _params(**overrides):
+    params = {"group_by": None, "cursor": "*", "slice": None, "per_page": 2, "sample": None}
+    params.update(overrides)
+    return params
+
+
+def _search(es):
+    return Search(index="works-v34", using=es).sort("id").params(preference="abc")
+
+
+def _response(hits, pit_id="pit-b", total=None):
+    raw = {
+        "took": 1,
+        "pit_id": pit_id,
+        "hits": {
+            "hits": [{"_id": h, "_source": {}, "sort": [h, i]} for i, h in enumerate(hits)],
+        },
+    }
+    if total is not None:
+        raw["hits"]["total"] = {"value": total, "relation": "eq"}
+    return Response(Search(), raw)
+
+
+def test_pit_cursor_round_trip_and_plain_cursors():
+    cursor = encode_pit_cursor("pit-a", ["W2", 7], 120, (1, 4))
+    assert decode_pit_cursor(cursor) == {
+        "pit": "pit-a", "search_after": ["W2", 7], "count": 120, "slice": [1, 4]
+    }
+    assert decode_pit_cursor(encode_cursor(["W2", 7])) is None
+    assert decode_pit_cursor("*") is None
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        {"pit": "pit-a", "search_after": [1], "count": "120"},
+        {"pit": "pit-a", "search_after": [1], "count": True},
+        {"pit": "pit-a", "search_after": [1], "count": 1, "count_is_exact": "no"},
+        {"pit": "pit-a", "search_after": [1], "count": 1, "slice": [1]},
+        {"pit": "pit-a", "search_after": [1], "count": 1, "slice": ["0", 4]},
+    ],
+)
+def test_pit_cursor_rejects_malformed_state(state):
+    cursor = base64.b64encode(json.dumps(state).encode()).decode()
+    with pytest.raises(APIPaginationError):
+        decode_pit_cursor(cursor)
+
+
+def test_handle_cursor_reads_pit_search_after():
+    cursor = encode_pit_cursor("pit-a", [5, "W2", 7], 10)
+    s = handle_cursor(cursor, 1, Search())
+    assert s.to_dict()["search_after"] == [5, "W2", 7]
+
+
+@pytest.mark.parametrize(
+    "slice_param, expected", [(None, None), ("0/4", (0, 4)), ("3/4", (3, 4))]
+)
+def test_parse_cursor_slice(slice_param, expected):
+    assert parse_cursor_slice(slice_param) == expected
+
+
+@pytest.mark.parametrize("slice_param", ["4/4", "0/1", "a/b"])
+def test_parse_cursor_slice_rejects(slice_param):
+    with pytest.raises(APIPaginationError):
+        parse_cursor_slice(slice_param)
+
+
+def test_first_page_opens_pit_and_counts():
+    es = _FakeES()
+    params = _params(slice="1/4")
+    s = set_point_in_time(params, _search(es), "works-v34", es)
+
+    body = s.to_dict()
+    assert es.opened == [("works-v34", "1m")]
+    assert s._index is None
+    assert s._params["preference"] is None
+    assert body["pit"] == {"id": "pit-a", "keep_alive": "1m"}
+    assert body["slice"] == {"id": 1, "max": 4}
+    assert "track_total_hits" not in body
+    assert params["pit"] == {
+        "id": "pit-a", "count": None, "count_is_exact": True, "slice": (1, 4)
+    }
+
+
+def test_later_page_reuses_pit_and_skips_count():
+    es = _FakeES()
+    cursor = encode_pit_cursor("pit-b", ["W2", 7], 120, (1, 4))
+    params = _params(cursor=cursor)
+    s = set_point_in_time(params, _search(es), "works-v34", es)
+
+    body = s.to_dict()
+    assert es.opened == []
+    assert body["pit"]["id"] == "pit-b"
+    assert body["slice"] == {"id": 1, "max": 4}
+    assert body["track_total_hits"] is False
+    # the count comes from the cursor, not the (untracked) hit total
+    assert calculate_sample_or_default_count(params, _response(["W3"])) == 120
+
+
+def test_slice_can_stay_in_the_url_across_pages():
+    es = _FakeES()
+    params = _params(slice="1/4")
+    set_point_in_time(params, _search(es), "works-v34", es)
+    page_2 = get_next_cursor(params, _response(["W1", "W2"], pit_id="pit-b"))
+
+    params = _params(cursor=page_2, slice="1/4")
+    s = set_point_in_time(params, _search(es), "works-v34", es)
+    assert s.to_dict()["slice"] == {"id": 1, "max": 4}
+    assert params["pit"]["slice"] == [1, 4]
+    page_3 = get_next_cursor(params, _response(["W3", "W4"], pit_id="pit-b"))
+    assert decode_pit_cursor(page_3)["slice"] == [1, 4]
+    assert es.opened == [("works-v34", "1m")]
+
+
+@pytest.mark.parametrize("slice_param", ["2/4", "1/8"])
+def test_later_page_rejects_a_different_slice(slice_param):
+    cursor = encode_pit_cursor("pit-b", ["W2", 7], 120, (1, 4))
+    with pytest.raises(APIPaginationError):
+        set_point_in_time(_params(cursor=cursor, slice=slice_param), Search(), "works-v34", _FakeES())
+
+
+def test_plain_cursor_rejects_slice():
+    with pytest.raises(APIPaginationError):
+        set_point_in_time(
+            _params(cursor=encode_cursor(["W2"]), slice="0/4"), Search(), "works-v34", _FakeES()
+        )
+
+
+def test_plain_cursor_keeps_live_index():
+    es = _FakeES()
+    s = set_point_in_time(_params(cursor=encode_cursor(["W2"])), _search(es), "works-v34", es)
+    assert s._index == ["works-v34"]
+    assert "pit" not in s.to_dict()
+
+
+def test_slice_requires_cursor():
+    with pytest.raises(APIPaginationError):
+        set_point_in_time(_params(cursor=None, slice="0/2"), Search(), "works-v34", _FakeES())
+
+
+def test_next_cursor_carries_pit_state():
+    params = _params(pit={"id": "pit-a", "count": 30, "slice": (0, 2)})
+    cursor = get_next_cursor(params, _response(["W1", "W2"], pit_id="pit-b"))
+    assert decode_pit_cursor(cursor) == {
+        "pit": "pit-b", "search_after": ["W2", 1], "count": 30, "slice": [0, 2]
+    }
+    # a short page is the last one
+    assert get_next_cursor(params, _response(["W1"])) is None
+
+
+def test_cursor_pages_are_not_result_cached():
+    from core.result_cache import is_result_cacheable
+
+    request = SimpleNamespace(args={})
+    assert not is_result_cacheable(request, _params())
+    assert is_result_cacheable(request, _params(cursor=None))
+
+
+@pytest.mark.parametrize("cursor, closed", [("*", ["pit-a"]), (encode_pit_cursor("pit-b", ["W2"], 5), [])])
+def test_failed_first_page_closes_its_pit(monkeypatch, cursor, closed):
+    es = _FakeES()
+    monkeypatch.setattr(shared_view, "construct_query", lambda *args: _search(es))
+
+    def fail(s, params):
+        raise APIPaginationError("boom")
+
+    monkeypatch.setattr(shared_view, "execute_search", fail)
+    app = Flask(__name__)
+    with app.test_request_context("/works", query_string={"cursor": cursor}):
+        from flask import request
+
+        with pytest.raises(APIPaginationError):
+            shared_view.shared_view(request, {}, "works-v34", "id", es)
+    # a later page's PIT belongs to the client's cursor
+    assert es.closed == closed
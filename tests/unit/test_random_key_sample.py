@@ -0,0 +1,130 @@
+"""Unit tests for `sample=` via an indexed random key (core/sample.py).
+
+A fake ES client evaluates the range filters, post_filter, filter aggs, sort
+and from/size the sampler sends, over docs with known keys.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch_dsl import Search
+
+import core.sample as sample
+from core.sample import get_random_key_field, get_sample_offset
+from core.shared_view import execute_search
+
+FIELD = "random_key"
+
+
+def _in_range(doc, clause):
+    (field, bounds), = clause["range"].items()
+    value = doc[field]
+    return ("gte" not in bounds or value >= bounds["gte"]) and (
+        "lt" not in bounds or value < bounds["lt"]
+    )
+
+
+def _matches(doc, query):
+    if query is None or "match_all" in query:
+        return True
+    if "range" in query:
+        return _in_range(doc, query)
+    return all(_matches(doc, q) for q in query["bool"]["filter"])
+
+
+class _FakeES:
+    def __init__(self, keys):
+        self.docs = [{"id": f"W{i}", FIELD: k} for i, k in enumerate(keys)]
+        self.searches = []
+
+    def search(self, index=None, body=None, **params):
+        self.searches.append(body)
+        matched = [d for d in self.docs if _matches(d, body.get("query"))]
+        hits = [d for d in matched if _matches(d, body.get("post_filter"))]
+        hits.sort(key=lambda d: (d[FIELD], d["id"]))
+        start = body.get("from", 0)
+        raw = {
+            "took": 2,
+            "hits": {
+                "hits": [
+                    {"_id": d["id"], "_source": d, "sort": [d[FIELD], d["id"]]}
+                    for d in hits[start:start + body.get("size", 10)]
+                ]
+            },
+        }
+        if "aggs" in body:
+            raw["aggregations"] = {
+                name: {"doc_count": sum(_matches(d, agg["filter"]) for d in matched)}
+                for name, agg in body["aggs"].items()
+            }
+        return SimpleNamespace(body=raw)
+
+
+KEYS = [0.05, 0.15, 0.25, 0.35, 0.45, 0.55, 0.65, 0.75, 0.85, 0.95]
+
+
+def _params(**overrides):
+    params = {
+        "cursor": None,
+        "group_by": None,
+        "page": 1,
+        "per_page": 3,
+        "sample": 7,
+        "seed": "42",
+        "random_key_field": FIELD,
+    }
+    params.update(overrides)
+    return params
+
+
+@pytest.fixture
+def es(monkeypatch):
+    # seed "42" starts the walk at key 0.6
+    monkeypatch.setattr(sample, "get_sample_offset", lambda seed: 0.6)
+    return _FakeES(KEYS)
+
+
+def _page(es, **overrides):
+    s = Search(index="works-v34", using=es).sort(FIELD, "id")
+    response = execute_search(s, _params(**overrides))
+    return response, [hit.meta.id for hit in response]
+
+
+def test_pages_walk_keys_from_the_offset_and_wrap(es):
+    pages = [_page(es, page=p)[1] for p in (1, 2, 3)]
+    assert pages == [["W6", "W7", "W8"], ["W9", "W0", "W1"], ["W2"]]
+
+
+def test_total_counts_every_match_and_head_only_pages_skip_the_tail_query(es):
+    response, ids = _page(es)
+    assert response.hits.total.value == 10
+    assert "aggregations" not in response.to_dict()
+    assert len(es.searches) == 1
+
+    _page(es, page=2)
+    assert len(es.searches) == 3  # head + tail
+
+
+def test_filters_apply_to_both_segments(es):
+    s = Search(index="works-v34", using=es).filter("range", random_key={"lt": 0.7}).sort(FIELD, "id")
+    response = execute_search(s, _params(per_page=10, sample=10))
+    assert [hit.meta.id for hit in response] == ["W6", "W0", "W1", "W2", "W3", "W4", "W5"]
+    assert response.hits.total.value == 7
+
+
+def test_seed_offsets_are_stable_and_spread():
+    assert get_sample_offset("42") == get_sample_offset("42")
+    offsets = {get_sample_offset(str(seed)) for seed in range(50)}
+    assert len(offsets) == 50
+    assert all(0 <= offset < 1 for offset in offsets)
+
+
+def test_random_key_field_only_for_plain_works_samples(monkeypatch):
+    monkeypatch.setattr(sample.settings, "SAMPLE_RANDOM_KEY_FIELD", FIELD)
+    assert get_random_key_field(_params(), "works-v34") == FIELD
+    assert get_random_key_field(_params(sample=None), "works-v34") is None
+    assert get_random_key_field(_params(cursor="*"), "works-v34") is None
+    assert get_random_key_field(_params(group_by="type"), "works-v34") is None
+    assert get_random_key_field(_params(), "authors-v19") is None
+    monkeypatch.setattr(sample.settings, "SAMPLE_RANDOM_KEY_FIELD", "")
+    assert get_random_key_field(_params(), "works-v34") is None
@@ -0,0 +1,164 @@
+"""Unit tests for the shared_view response cache (core/result_cache.py).
+
+Covers the fingerprint normalization (filter order, alias keys, folded-in
+defaults), the per-shape TTLs, the bypass rules, and a store/load round trip of
+a hit page through an in-memory cache backend. All offline (no ES, no Redis).
+"""
+
+import pytest
+from cachelib import SimpleCache
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+import core.result_cache as result_cache
+from core.result_cache import (
+    get_cache_key,
+    get_cache_timeout,
+    get_cached_result,
+    is_result_cacheable,
+    set_cached_result,
+)
+from works.fields import fields_dict
+
+
+class _Args(dict):
+    def get(self, key, default=None, type=None):
+        return super().get(key, default)
+
+
+class _Req:
+    def __init__(self, d=None):
+        self.args = _Args(d or {})
+
+
+def _params(**overrides):
+    base = {
+        "filters": None,
+        "searches": [],
+        "search": None,
+        "search_type": None,
+        "search_scope": None,
+        "group_by": None,
+        "group_bys": None,
+        "sort": None,
+        "page": 1,
+        "per_page": 25,
+        "cursor": None,
+        "sample": None,
+        "seed": None,
+        "q": None,
+        "apc_sum": None,
+        "cited_by_count_sum": None,
+    }
+    base.update(overrides)
+    return base
+
+
+def _key(**overrides):
+    return get_cache_key(_params(**overrides), fields_dict, "works-v34", "walden")
+
+
+class TestFingerprint:
+    def test_filter_order_is_ignored(self):
+        a = _key(filters=[{"type": "article"}, {"publication_year": "2020"}])
+        b = _key(filters=[{"publication_year": "2020"}, {"type": "article"}])
+        assert a == b
+
+    def test_alias_key_folds_into_canonical(self):
+        a = _key(filters=[{"is_oa": "true"}])
+        b = _key(filters=[{"open_access.is_oa": "true"}])
+        assert a == b
+
+    def test_default_filter_matches_explicit_filter(self):
+        # works view folds `is_xpac:false` into params["filters"] when absent.
+        implicit = _key(filters=[{"is_xpac": "false"}] + [{"type": "article"}])
+        explicit = _key(filters=[{"type": "article"}, {"is_xpac": "false"}])
+        assert implicit == explicit
+
+    def test_different_values_differ(self):
+        assert _key(filters=[{"type": "article"}]) != _key(filters=[{"type": "book"}])
+
+    def test_page_and_group_by_differ(self):
+        assert _key(page=1) != _key(page=2)
+        assert _key(group_by="type") != _key(group_by="publication_year")
+
+    def test_sort_key_order_differs(self):
+        a = _key(sort={"cited_by_count": "desc", "publication_year": "desc"})
+        b = _key(sort={"publication_year": "desc", "cited_by_count": "desc"})
+        assert a != b
+
+    def test_index_is_part_of_key(self):
+        params = _params()
+        assert get_cache_key(params, fields_dict, "works-v34", "walden") != get_cache_key(
+            params, fields_dict, "works-v35", "walden"
+        )
+
+
+class TestCacheability:
+    def test_plain_query_is_cacheable(self):
+        assert is_result_cacheable(_Req(), _params(filters=[{"type": "article"}]))
+
+    def test_sample_without_seed_bypasses(self):
+        assert not is_result_cacheable(_Req(), _params(sample=10))
+
+    def test_sample_with_seed_is_cacheable(self):
+        assert is_result_cacheable(_Req(), _params(sample=10, seed="1"))
+
+    def test_bypass_cache_param(self):
+        assert not is_result_cacheable(_Req({"bypass_cache": "true"}), _params())
+
+    def test_collection_filter_bypasses(self):
+        assert not is_result_cacheable(
+            _Req(), _params(filters=[{"authorships.author.id": "col_abc123"}])
+        )
+
+    def test_semantic_bypasses(self):
+        assert not is_result_cacheable(
+            _Req(), _params(search="x", search_type="semantic")
+        )
+
+
+def test_timeouts_by_shape():
+    settings = result_cache.settings
+    assert get_cache_timeout(_params(group_by="type")) == settings.RESULT_CACHE_GROUP_BY_TIMEOUT
+    assert get_cache_timeout(_params(group_bys=["type"])) == settings.RESULT_CACHE_GROUP_BY_TIMEOUT
+    assert get_cache_timeout(_params()) == settings.RESULT_CACHE_HITS_TIMEOUT
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    backend = SimpleCache()
+    monkeypatch.setattr(result_cache, "cache", backend)
+    return backend
+
+
+def test_hit_page_round_trip(memory_cache):
+    raw = {
+        "took": 3,
+        "timed_out": False,
+        "hits": {
+            "total": {"value": 1, "relation": "eq"},
+            "hits": [{"_id": "W1", "_score": 1.5, "_source": {"id": "W1", "title": "t"}}],
+        },
+    }
+    response = Response(Search(index="works-v34"), raw)
+    result = {"meta": {"count": 1}, "group_by": [], "results": response}
+
+    set_cached_result("k", result, _params())
+    loaded = get_cached_result("k", "works-v34", "walden")
+
+    assert loaded["meta"] == {"count": 1}
+    assert isinstance(loaded["results"], Response)
+    assert loaded["results"][0].title == "t"
+    assert loaded["results"][0].meta.score == 1.5
+
+
+def test_loaded_meta_is_not_shared(memory_cache):
+    set_cached_result("k", {"meta": {"count": 1}, "group_by": []}, _params(group_by="type"))
+    first = get_cached_result("k", "works-v34", "walden")
+    first["meta"]["x_query"] = {"oql": "works"}
+    assert "x_query" not in get_cached_result("k", "works-v34", "walden")["meta"]
+
+
+def test_miss_returns_none(memory_cache):
+    assert get_cached_result("missing", "works-v34", "walden") is None
@@ -0,0 +1,74 @@
+"""Unit tests for pushing `select=` down into ES `_source` includes
+(core.utils.get_source_includes + core.shared_view.set_source)."""
+
+import pytest
+from elasticsearch_dsl import Search
+from marshmallow import Schema, fields
+
+from core.result_cache import get_cache_key
+from core.shared_view import set_source
+from core.utils import get_source_includes
+from works.fields import fields_dict
+from works.schemas import WorksSchema
+
+
+class _Args(dict):
+    def get(self, key, default=None, type=None):
+        return super().get(key, default)
+
+
+class _Req:
+    def __init__(self, d=None):
+        self.args = _Args(d or {})
+
+
+def _includes(select, schema=WorksSchema):
+    return get_source_includes(_Req({"select": select}), schema)
+
+
+def test_no_select_fetches_everything():
+    assert get_source_includes(_Req(), WorksSchema) is None
+
+
+def test_plain_fields_map_to_their_names():
+    assert _includes("id,doi,title") == ["doi", "id", "title"]
+
+
+def test_attribute_is_used_for_renamed_fields():
+    assert _includes("id,is_authors_truncated") == ["authorships_truncated", "id"]
+
+
+def test_declared_sources():
+    assert _includes("content_urls") == ["has_content", "id"]
+    assert _includes("authorships") == ["authorships", "authorships_full"]
+    assert _includes("id,relevance_score") == ["id"]
+
+
+def test_undeclared_method_field_disables_pushdown():
+    class _Schema(Schema):
+        id = fields.Str()
+        derived = fields.Method("get_derived")
+
+        def get_derived(self, obj):
+            return obj.whatever
+
+    assert _includes("id,derived", _Schema) is None
+
+
+@pytest.mark.parametrize("select", ["relevance_score", "id,not_a_field"])
+def test_nothing_to_include_or_unknown_field(select):
+    assert _includes(select) is None
+
+
+def test_set_source_keeps_works_excludes():
+    source = set_source("works-v34", Search(), ["doi", "id"]).to_dict()["_source"]
+    assert source["includes"] == ["doi", "id"]
+    assert "abstract" in source["excludes"]
+
+
+def test_includes_are_part_of_result_cache_key():
+    params = {"filters": None, "page": 1, "per_page": 200, "source_includes": None}
+    narrow = dict(params, source_includes=["id"])
+    assert get_cache_key(params, fields_dict, "works-v34", "walden") != get_cache_key(
+        narrow, fields_dict, "works-v34", "walden"
+    )
@@ -0,0 +1,209 @@
+"""Unit tests for streamed full-result exports (format=csv|ndjson|jsonl.gz).
+
+core.shared_view.PitPages walks point-in-time `search_after` pages for one
+bounded response and core.export.export_stream serializes them, handing back
+the cursor that resumes the export. All offline: a fake ES client stands in
+for the cluster.
+"""
+
+import csv
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch_dsl import Search
+from flask import Flask
+
+import core.shared_view as shared_view
+from core.cursor import decode_pit_cursor
+from core.exceptions import APIOverloadedError
+from core.export import export_stream, is_stream_export
+from core.shared_view import PitPages
+from works.schemas import WorksSchema
+
+
+class _FakeES:
+    def __init__(self, n_docs):
+        self.docs = [
+            {"id": f"https://openalex.org/W{n}", "cited_by_count": n, "ids": {"doi": f"10.1/{n}"}}
+            for n in range(n_docs)
+        ]
+        self.searches = []
+        self.closed = []
+
+    def open_point_in_time(self, index, keep_alive):
+        return {"id": "pit-0"}
+
+    def close_point_in_time(self, id):
+        self.closed.append(id)
+
+    def search(self, index=None, body=None, **params):
+        self.searches.append({"index": index, "body": body, "params": params})
+        start = body["search_after"][0] + 1 if "search_after" in body else 0
+        page = self.docs[start:start + body["size"]]
+        return SimpleNamespace(body={
+            "took": 1,
+            "timed_out": False,
+            "pit_id": f"pit-{len(self.searches)}",
+            "hits": {
+                "total": {"value": 0, "relation": "gte"},
+                "hits": [
+                    {"_id": d["id"], "_score": None, "_source": d, "sort": [start + i]}
+                    for i, d in enumerate(page)
+                ],
+            },
+        })
+
+
+@pytest.fixture
+def batch_size(monkeypatch):
+    monkeypatch.setattr(shared_view.settings, "EXPORT_BATCH_SIZE", 4)
+
+
+def _search(es):
+    return Search(index="works-v34", using=es).sort("id").params(preference="abc")
+
+
+def test_pit_pages_walk_every_hit(batch_size):
+    es = _FakeES(10)
+    pages = list(PitPages(_search(es), "works-v34", es))
+
+    assert [len(p) for p in pages] == [4, 4, 2]
+    assert [h.id for p in pages for h in p] == [d["id"] for d in es.docs]
+    first, second = es.searches[0], es.searches[1]
+    assert first["index"] is None
+    assert first["params"].get("preference") is None
+    assert first["body"]["pit"] == {"id": "pit-0", "keep_alive": "2m"}
+    assert first["body"]["track_total_hits"] is False
+    # each page continues from the previous page's last sort values and PIT id
+    assert second["body"]["search_after"] == [3]
+    assert second["body"]["pit"]["id"] == "pit-1"
+    assert es.closed == ["pit-3"]
+
+
+def test_pit_pages_stop_at_max_rows(batch_size):
+    es = _FakeES(10)
+    pages = PitPages(_search(es), "works-v34", es, max_rows=6)
+
+    assert [len(p) for p in pages] == [4, 2]
+    assert [s["body"]["size"] for s in es.searches] == [4, 2]
+    assert pages.next_cursor is not None
+
+
+def test_pit_pages_resume_from_their_cursor(batch_size):
+    es = _FakeES(10)
+    first = PitPages(_search(es), "works-v34", es, max_rows=6)
+    ids = [h.id for p in first for h in p]
+    # more to come: the PIT stays open for the next response
+    assert es.closed == []
+    state = decode_pit_cursor(first.next_cursor)
+    assert state["pit"] == "pit-2" and state["search_after"] == [5]
+
+    rest = PitPages(_search(es), "works-v34", es, max_rows=6, state=state)
+    ids += [h.id for p in rest for h in p]
+    assert ids == [d["id"] for d in es.docs]
+    assert rest.next_cursor is None
+    assert es.closed == ["pit-4"]
+
+
+def test_pit_pages_stop_at_the_time_budget(batch_size, monkeypatch):
+    monkeypatch.setattr(shared_view.settings, "EXPORT_TIME_BUDGET", 0)
+    es = _FakeES(10)
+    pages = PitPages(_search(es), "works-v34", es)
+    assert [len(p) for p in pages] == [4]
+    assert decode_pit_cursor(pages.next_cursor)["search_after"] == [3]
+
+
+def test_pit_closed_when_consumer_stops_early(batch_size):
+    es = _FakeES(10)
+    pages = iter(PitPages(_search(es), "works-v34", es))
+    next(pages)
+    pages.close()
+    assert es.closed == ["pit-1"]
+
+
+def test_pit_pages_are_admission_controlled(batch_size, monkeypatch):
+    admitted = []
+
+    @contextmanager
+    def admit(s, hits=0):
+        admitted.append(hits)
+        if len(admitted) == 2:
+            raise APIOverloadedError("busy")
+        yield
+
+    monkeypatch.setattr(shared_view, "admit_query", admit)
+    es = _FakeES(10)
+    with pytest.raises(APIOverloadedError):
+        list(PitPages(_search(es), "works-v34", es))
+    assert admitted == [4, 4]
+    assert es.closed == ["pit-1"]
+
+
+def _export(es, query, max_rows=None):
+    app = Flask(__name__)
+    with app.test_request_context(f"/works?{query}"):
+        from flask import request
+
+        pages = PitPages(_search(es), "works-v34", es, max_rows=max_rows)
+        response = export_stream(request, pages, WorksSchema, only=["id", "cited_by_count", "ids"])
+        return response, response.get_data()
+
+
+def test_is_stream_export():
+    app = Flask(__name__)
+    for query, expected in [
+        ("format=csv", True),
+        ("format=NDJSON", True),
+        ("format=jsonl.gz", True),
+        ("format=csv&group_by=type", False),
+        ("format=xlsx", False),
+        ("", False),
+    ]:
+        with app.test_request_context(f"/works?{query}"):
+            from flask import request
+
+            assert bool(is_stream_export(request)) is expected, query
+
+
+def test_csv_export(batch_size):
+    es = _FakeES(5)
+    response, body = _export(es, "format=csv")
+
+    assert response.mimetype == "text/csv"
+    assert "attachment; filename=openalex-works-" in response.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert list(rows[0]) == ["id", "cited_by_count", "ids"]
+    assert [r["id"] for r in rows] == [d["id"] for d in es.docs]
+    assert json.loads(rows[2]["ids"]) == {"doi": "10.1/2"}
+
+
+def test_ndjson_and_gzip_exports(batch_size):
+    response, body = _export(_FakeES(5), "format=ndjson")
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    assert [line["cited_by_count"] for line in lines] == [0, 1, 2, 3, 4]
+
+    response, gz_body = _export(_FakeES(5), "format=jsonl.gz")
+    assert response.mimetype == "application/gzip"
+    assert gzip.decompress(gz_body) == body
+
+
+def test_partial_export_returns_a_resume_cursor(batch_size):
+    response, body = _export(_FakeES(10), "format=ndjson", max_rows=4)
+    assert len(body.decode().splitlines()) == 4
+    assert decode_pit_cursor(response.headers["X-Next-Cursor"])["search_after"] == [3]
+    assert response.headers["Access-Control-Expose-Headers"] == "X-Next-Cursor"
+
+    response, _ = _export(_FakeES(3), "format=ndjson", max_rows=4)
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "jsonl.gz"])
+def test_unstreamed_routes_reject_line_formats(client, export_format):
+    response = client.get(f"/authors?format={export_format}")
+    assert response.status_code == 400
+    assert export_format in response.get_json()["message"]
@@ -0,0 +1,88 @@
+"""Unit tests for the memoized query translation (query_translation/translation_cache.py)
+shared by the /query translation routes, the editor's /validate and `GET /?oql=`."""
+
+import json
+import urllib.parse
+
+import pytest
+
+import query_translation.translation_cache as translation_cache
+from query_translation.oql_parser import OQLParseError
+
+OQL = "works where type is article and year is 2020"
+
+
+@pytest.fixture(autouse=True)
+def translations(monkeypatch):
+    monkeypatch.setattr(translation_cache, "_translations", translation_cache.OrderedDict())
+    parses = []
+    parse = translation_cache.parse_oql_to_oqo
+
+    def counting_parse(oql, session=None):
+        parses.append(oql)
+        return parse(oql, session=session)
+
+    monkeypatch.setattr(translation_cache, "parse_oql_to_oqo", counting_parse)
+    return parses
+
+
+def _path(oql):
+    return urllib.parse.quote(oql, safe="")
+
+
+def test_oql_routes_and_editor_share_one_translation(client, translations):
+    first = client.get(f"/query/oql/{_path(OQL)}")
+    assert first.status_code == 200
+    second = client.post("/query", json={"oql": OQL})
+    assert second.get_json() == first.get_json()
+
+    validated = client.get("/validate", query_string={"q": OQL, "session": "doc-1"}).get_json()
+    assert validated["valid"] is True
+    assert validated["oql"] == first.get_json()["oql"]
+    assert translations == [OQL]
+
+
+def test_parse_errors_are_cached_per_caller_shape(client, translations):
+    bad = 'works where title has "deep'
+    response = client.get(f"/query/oql/{_path(bad)}")
+    assert response.status_code == 400
+    assert response.get_json()["validation"]["errors"][0]["message"].startswith("Failed to parse OQL")
+
+    validated = client.get("/validate", query_string={"q": bad}).get_json()
+    assert validated["valid"] is False
+    assert validated["diagnostics"][0]["code"] == "OQL_UNTERMINATED_STRING"
+    assert translations == [bad]
+    assert isinstance(translation_cache.translate_oql(bad).error, OQLParseError)
+
+
+def test_oqo_body_and_path_translate_alike(client):
+    oqo = client.get(f"/query/oql/{_path(OQL)}").get_json()["oqo"]
+    by_path = client.get(f"/query/oqo/{_path(json.dumps(oqo))}")
+    by_body = client.post("/query", json={"oqo": oqo})
+    assert by_path.status_code == by_body.status_code == 200
+    assert by_path.get_json() == by_body.get_json()
+
+
+def test_formats_render_once(monkeypatch):
+    import query_translation.views as views
+
+    renders = []
+    render = views.render_all_formats
+    monkeypatch.setattr(views, "render_all_formats",
+                        lambda *args, **kwargs: renders.append(1) or render(*args, **kwargs))
+    translation = translation_cache.translate_oql(OQL)
+    assert translation.formats() is translation_cache.translate_oql(OQL).formats()
+    assert len(renders) == 1
+
+
+def test_translations_are_bounded_and_expire(monkeypatch, translations):
+    monkeypatch.setattr(translation_cache, "MAX_TRANSLATIONS", 2)
+    for year in (2020, 2021, 2022):
+        translation_cache.translate_oql(f"works where year is {year}")
+    assert [key[1] for key in translation_cache._translations] == [
+        "works where year is 2021", "works where year is 2022"]
+
+    later = translation_cache.time.monotonic() + translation_cache.TRANSLATION_TIMEOUT + 1
+    monkeypatch.setattr(translation_cache.time, "monotonic", lambda: later)
+    translation_cache.translate_oql("works where year is 2022")
+    assert translations.count("works where year is 2022") == 2
@@ -0,0 +1,179 @@
+"""Unit tests for the cached semantic search candidate pool (core/vector_index.py).
+
+The first page of a semantic query embeds, runs kNN + text boost and rescores the
+whole pool; later pages (and cursor follow-ups) read the ranked pool from the
+cache and only mget their own slice. All offline: the phases are stubbed and the
+cache is an in-memory backend.
+"""
+
+import time
+
+import pytest
+from cachelib import SimpleCache
+
+import core.vector_index as vector_index
+from core.cursor import decode_cursor
+from core.exceptions import APIPaginationError
+from core.vector_index import get_candidate_pool_key, rank_candidates
+
+
+class _FakeES:
+    def __init__(self):
+        self.mget_calls = []
+        self.missing = set()
+
+    def mget(self, index, body, _source_excludes=None, _source=True):
+        if _source is not False:
+            # only hydration is counted; the pool's existence check fetches no _source
+            self.mget_calls.append(list(body["ids"]))
+        return {
+            "docs": [
+                {"_id": i, "found": i not in self.missing, "_source": {"id": f"https://openalex.org/{i}"}}
+                for i in body["ids"]
+            ]
+        }
+
+
+@pytest.fixture
+def pool_env(monkeypatch):
+    es = _FakeES()
+    calls = {"knn": 0}
+
+    def fake_knn(query_vector, filter_dict, k=50, num_candidates=75):
+        calls["knn"] += 1
+        return [(f"W{n:02d}", 0.9 - n * 0.01, 0) for n in range(10, 40)]
+
+    monkeypatch.setattr(vector_index, "cache", SimpleCache())
+    monkeypatch.setattr(vector_index, "embed_query", lambda text: [0.0])
+    monkeypatch.setattr(vector_index, "execute_vector_search", fake_knn)
+    monkeypatch.setattr(vector_index, "_text_boost_search", lambda *a, **kw: [])
+    monkeypatch.setattr(
+        vector_index.connections, "get_connection", lambda name=None: es
+    )
+    return es, calls
+
+
+def _params(**overrides):
+    base = {
+        "search": "deep learning for protein folding",
+        "filters": [{"is_xpac": "false"}, {"type": "article"}],
+        "page": 1,
+        "per_page": 10,
+        "cursor": None,
+    }
+    base.update(overrides)
+    return base
+
+
+def _ids(result):
+    return [r.meta.id for r in result["results"]]
+
+
+def test_rank_candidates_orders_by_rescored_score():
+    ranked = rank_candidates([("W10", 0.6, 0), ("W11", 0.9, 0), ("W12", 0.6, 5000)])
+    assert [r[0] for r in ranked] == ["W11", "W12", "W10"]
+
+
+def test_pool_key_ignores_paging_and_filter_order():
+    a = get_candidate_pool_key(_params(filters=[{"type": "article"}, {"is_oa": "true"}]), "walden")
+    b = get_candidate_pool_key(
+        _params(filters=[{"is_oa": "true"}, {"type": "article"}], page=3, cursor="*"), "walden"
+    )
+    assert a == b
+    assert a != get_candidate_pool_key(_params(filters=[{"type": "book"}]), "walden")
+    # each data version checks its candidates against its own works index
+    assert a != get_candidate_pool_key(_params(filters=[{"type": "article"}, {"is_oa": "true"}]), "v1")
+
+
+def test_later_pages_reuse_pool_and_hydrate_only_their_slice(pool_env):
+    es, calls = pool_env
+    first = vector_index.vector_semantic_search(_params(), "works", "walden")
+    second = vector_index.vector_semantic_search(_params(page=2), "works", "walden")
+
+    assert calls["knn"] == 1
+    assert es.mget_calls == [
+        [f"W{n:02d}" for n in range(10, 20)],
+        [f"W{n:02d}" for n in range(20, 30)],
+    ]
+    assert _ids(first)[0] == "W10"
+    assert _ids(second)[0] == "W20"
+    assert first["meta"]["count"] == second["meta"]["count"] == 30
+    assert second["meta"]["page"] == 2
+
+
+def test_cursor_walks_the_pool(pool_env):
+    _, calls = pool_env
+    seen = []
+    cursor = "*"
+    while cursor:
+        result = vector_index.vector_semantic_search(
+            _params(cursor=cursor), "works", "walden"
+        )
+        assert result["meta"]["page"] is None
+        seen.extend(_ids(result))
+        cursor = result["meta"]["next_cursor"]
+
+    assert seen == [f"W{n:02d}" for n in range(10, 40)]
+    assert calls["knn"] == 1
+
+
+def test_next_cursor_is_an_offset(pool_env):
+    result = vector_index.vector_semantic_search(_params(cursor="*"), "works", "walden")
+    assert decode_cursor(result["meta"]["next_cursor"]) == [10]
+
+
+def test_candidates_without_a_works_doc_leave_the_pool(pool_env):
+    es, _ = pool_env
+    es.missing = {"W12", "W25"}
+    seen = []
+    cursor = "*"
+    while cursor:
+        result = vector_index.vector_semantic_search(
+            _params(cursor=cursor), "works", "walden"
+        )
+        assert result["meta"]["count"] == 28
+        assert len(result["results"]) == 10 or not result["meta"]["next_cursor"]
+        seen.extend(_ids(result))
+        cursor = result["meta"]["next_cursor"]
+
+    assert seen == [f"W{n:02d}" for n in range(10, 40) if n not in (12, 25)]
+
+
+def test_cursor_with_page_is_rejected(pool_env):
+    with pytest.raises(APIPaginationError):
+        vector_index.vector_semantic_search(_params(cursor="*", page=2), "works", "walden")
+
+
+def _short_query_env(monkeypatch, pool_env, knn_sleep, boost_sleep):
+    def slow_knn(query_vector, filter_dict, k=50, num_candidates=75):
+        time.sleep(knn_sleep)
+        return [("W10", 0.8, 0), ("W11", 0.7, 0), ("W12", 0.6, 0)]
+
+    def slow_boost(query_text, k=20, connection="walden", filter_dict=None, request_timeout=None):
+        time.sleep(boost_sleep)
+        return [("W99", 0.0, 10000)]
+
+    monkeypatch.setattr(vector_index, "execute_vector_search", slow_knn)
+    monkeypatch.setattr(vector_index, "_text_boost_search", slow_boost)
+    return _params(search="protein folding", per_page=10)
+
+
+def test_text_boost_runs_concurrently_with_knn(monkeypatch, pool_env):
+    params = _short_query_env(monkeypatch, pool_env, knn_sleep=0.2, boost_sleep=0.2)
+    t0 = time.monotonic()
+    result = vector_index.vector_semantic_search(params, "works", "walden")
+    elapsed = time.monotonic() - t0
+
+    assert elapsed < 0.35
+    assert "W99" in _ids(result)
+
+
+def test_slow_text_boost_is_dropped_and_pool_not_cached(monkeypatch, pool_env):
+    monkeypatch.setattr(vector_index.settings, "SEMANTIC_TEXT_BOOST_DEADLINE_MS", 50)
+    params = _short_query_env(monkeypatch, pool_env, knn_sleep=0.0, boost_sleep=0.3)
+    t0 = time.monotonic()
+    result = vector_index.vector_semantic_search(params, "works", "walden")
+
+    assert time.monotonic() - t0 < 0.25
+    assert _ids(result) == ["W10", "W11", "W12"]
+    assert vector_index.get_cached_candidate_pool(get_candidate_pool_key(params, "walden")) is None
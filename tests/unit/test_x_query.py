@@ -281,3 +281,63 @@ def test_meta_schema_omits_x_query_when_absent():
     ms = MessageSchema()
     dumped = ms.dump({"meta": {"count": 3}, "results": [], "group_by": []})
     assert "x_query" not in dumped["meta"]
+
+
+# --------------------------------------------------------------------------- #
+# attach_x_query memoization / opt-out
+# --------------------------------------------------------------------------- #
+
+@pytest.fixture
+def count_builds(monkeypatch):
+    import core.shared_view as shared_view
+
+    monkeypatch.setattr(shared_view, "_x_query_cache", type(shared_view._x_query_cache)())
+    calls = []
+    real = shared_view.build_request_x_query
+
+    def counting(request, entity_type):
+        calls.append(entity_type)
+        return real(request, entity_type)
+
+    monkeypatch.setattr(shared_view, "build_request_x_query", counting)
+    return calls
+
+
+def test_attach_x_query_memoizes_per_entity_and_args(count_builds):
+    for _ in range(3):
+        result = {"meta": {"count": 5}, "results": []}
+        attach_x_query(result, _Req({"filter": "is_oa:true", "mailto": "a@b.c"}), "works-v33")
+        assert "is_oa:true" in result["meta"]["x_query"]["url"]
+    attach_x_query({"meta": {}}, _Req({"filter": "is_oa:true"}), "works-v33")
+    assert count_builds == ["works"]
+
+    attach_x_query({"meta": {}}, _Req({"filter": "is_oa:false"}), "works-v33")
+    attach_x_query({"meta": {}}, _Req({"filter": "is_oa:true"}), "authors-v19")
+    assert count_builds == ["works", "works", "authors"]
+
+
+def test_attach_x_query_responses_do_not_share_the_echo(count_builds):
+    first, second = {"meta": {}}, {"meta": {}}
+    attach_x_query(first, _Req({"filter": "is_oa:true"}), "works-v33")
+    first["meta"]["x_query"]["url"] = "mutated"
+    attach_x_query(second, _Req({"filter": "is_oa:true"}), "works-v33")
+    assert "is_oa:true" in second["meta"]["x_query"]["url"]
+    assert count_builds == ["works"]
+
+
+def test_attach_x_query_cache_is_bounded(count_builds, monkeypatch):
+    import core.shared_view as shared_view
+
+    monkeypatch.setattr(shared_view.settings, "X_QUERY_CACHE_MAX_SIZE", 2)
+    for year in (2019, 2020, 2021):
+        attach_x_query({"meta": {}}, _Req({"filter": f"publication_year:{year}"}), "works-v33")
+    assert len(shared_view._x_query_cache) == 2
+    attach_x_query({"meta": {}}, _Req({"filter": "publication_year:2019"}), "works-v33")
+    assert len(count_builds) == 4
+
+
+def test_attach_x_query_skipped_when_client_opts_out(count_builds):
+    result = {"meta": {"count": 5}, "results": []}
+    attach_x_query(result, _Req({"filter": "is_oa:true", "x_query": "false"}), "works-v33")
+    assert "x_query" not in result["meta"]
+    assert count_builds == []
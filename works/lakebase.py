@@ -1,7 +1,9 @@
-"""Lakebase-backed single-work lookups (oxjob #576, Phase 2).
+"""Lakebase-backed work lookups (oxjob #576, Phase 2).
 
 Serves GET /works/{id} point lookups from the Lakebase Postgres instance
-(`openalex-lookups`) instead of Elasticsearch. The stored doc is the ES
+(`openalex-lookups`) instead of Elasticsearch. `get_work_docs` is the batched
+form, used for semantic search hydration and `filter=ids.openalex:W1|W2|...`
+list requests. The stored doc is the ES
 `_source` shape, so it flows through the existing WorksSchema unchanged and
 responses stay byte-identical. ES remains the fallback on any miss or error.
 
@@ -16,8 +18,10 @@ as an unset-by-default emergency override (e.g. slam to 0 without a deploy).
 import json
 import os
 import random
+import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import psycopg2
 from elasticsearch_dsl.utils import AttrDict
@@ -31,6 +35,14 @@ DEFAULT_LOOKUP_PCT = 100
 _pool = None
 _pool_lock = threading.Lock()
 
+# Batch lookups run one query per shard on this executor. Its size bounds how
+# many pool connections batches can hold at once (LAKEBASE_BATCH_PARALLELISM,
+# default 2 of the default 4), so point lookups are never starved by batches.
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+_WORK_ID_RE = re.compile(r"^(?:https://openalex\.org/)?[Ww](\d+)$")
+
 
 def lakebase_enabled():
     return bool(os.getenv("LAKEBASE_URL"))
@@ -79,6 +91,35 @@ def _query_one(sql, params):
         pool.putconn(conn)
 
 
+def _query_all(sql, params):
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+    finally:
+        pool.putconn(conn)
+
+
+def _get_batch_executor():
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("LAKEBASE_BATCH_PARALLELISM", "2")),
+                    thread_name_prefix="lakebase-batch",
+                )
+    return _batch_executor
+
+
+def parse_work_id(value):
+    """"W123" / "https://openalex.org/W123" -> 123, or None for any other form."""
+    match = _WORK_ID_RE.match(str(value).strip())
+    return int(match.group(1)) if match else None
+
+
 def get_work_doc(work_id):
     """work_id (int) -> parsed doc dict, or None if absent."""
     shard = work_id % N_DOC_SHARDS
@@ -89,6 +130,34 @@ def get_work_doc(work_id):
     return json.loads(row[0]) if row else None
 
 
+def _get_shard_docs(shard, work_ids):
+    rows = _query_all(
+        f"SELECT work_id, doc FROM lakebase.lakebase_works_docs_{shard} WHERE work_id = ANY(%s)",
+        (work_ids,),
+    )
+    return {row[0]: json.loads(row[1]) for row in rows}
+
+
+def get_work_docs(work_ids):
+    """work_ids (ints) -> list of parsed doc dicts (None if absent), in the
+    requested order. One `ANY(%s)` query per shard, shards queried in parallel."""
+    by_shard = {}
+    for work_id in dict.fromkeys(work_ids):
+        by_shard.setdefault(work_id % N_DOC_SHARDS, []).append(work_id)
+
+    found = {}
+    if len(by_shard) == 1:
+        found.update(_get_shard_docs(*next(iter(by_shard.items()))))
+    elif by_shard:
+        futures = [
+            _get_batch_executor().submit(_get_shard_docs, shard, ids)
+            for shard, ids in by_shard.items()
+        ]
+        for future in futures:
+            found.update(future.result())
+    return [found.get(work_id) for work_id in work_ids]
+
+
 def get_work_doc_by_ext_id(ext_id):
     """ext_id (DOI/PMID in the URL form the API queries) -> doc dict or None."""
     row = _query_one(
@@ -328,7 +328,7 @@ class WorksSchema(Schema):
     doi = fields.Str()
     title = fields.Str()
     display_name = fields.Str()
-    relevance_score = fields.Method("get_relevance_score")
+    relevance_score = fields.Method("get_relevance_score", metadata={"es_source": []})
     publication_year = fields.Int()
     publication_date = fields.Str()
     ids = fields.Nested(IDsSchema)
@@ -339,7 +339,10 @@ class WorksSchema(Schema):
     type_crossref = fields.Str()
     indexed_in = fields.List(fields.Str())
     open_access = fields.Nested(OpenAccessSchema)
-    authorships = fields.Nested(AuthorshipsSchema, many=True)
+    # single records display authorships_full instead (see pre_dump)
+    authorships = fields.Nested(
+        AuthorshipsSchema, many=True, metadata={"es_source": ["authorships", "authorships_full"]}
+    )
     institution_assertions = fields.Nested(InstitutionsSchema, many=True)
     institutions = fields.Nested(InstitutionsSchema, many=True)
     countries_distinct_count = fields.Int()
@@ -373,7 +376,7 @@ class WorksSchema(Schema):
     datasets = fields.List(fields.Str())
     versions = fields.List(fields.Str())
     has_content = fields.Nested(HasContentSchema)
-    content_urls = fields.Method("get_content_urls")
+    content_urls = fields.Method("get_content_urls", metadata={"es_source": ["has_content", "id"]})
     referenced_works_count = fields.Int()
     referenced_works = fields.List(fields.Str())
     related_works = fields.List(fields.Str())
@@ -382,7 +385,8 @@ class WorksSchema(Schema):
             _parse_abstract_inverted_index(obj.abstract_inverted_index)
             if hasattr(obj, "abstract_inverted_index") and obj.abstract_inverted_index is not None
             else None
-        )
+        ),
+        metadata={"es_source": ["abstract_inverted_index"]},
     )
     cited_by_api_url = fields.Str()
     counts_by_year = fields.List(fields.Nested(CountsByYearSchema))
@@ -1,15 +1,20 @@
 from flask import Blueprint, jsonify, request
 
 from combined_config import all_entities_config
+from core.compiled_schema import compiled_dump, json_response
 from core.entities import get_entity_type
-from core.export import export_group_by, is_group_by_export
+from core.export import (export_group_by, export_group_by_stream, export_stream,
+                         get_export_max_rows, is_group_by_export,
+                         is_group_by_stream_export, is_stream_export)
 from core.filters_view import shared_filter_view
 from core.semantic import semantic_search
 from core.schemas import FiltersWrapperSchema, StatsWrapperSchema
-from core.shared_view import shared_view
+from core.shared_view import (shared_export_view, shared_group_by_export_view,
+                              shared_view)
 from core.stats_view import shared_stats_view
 from core.utils import (get_data_version_connection, get_entity_counts,
-                        get_flattened_fields, get_valid_fields, process_only_fields)
+                        get_flattened_fields, get_source_includes, get_valid_fields,
+                        process_only_fields)
 from settings import WORKS_INDEX_LEGACY, WORKS_INDEX_WALDEN
 from works.fields import fields_dict
 from works.schemas import MessageSchema, WorksSchema
@@ -136,11 +141,29 @@ def works():
         if 'is_xpac:' not in current_filter and 'is-xpac:' not in current_filter and not include_xpac:
             default_filters = [{'is_xpac': 'false'}]
 
-    result = shared_view(request, fields_dict, index_name, default_sort, connection, default_filters=default_filters)
+    source_includes = get_source_includes(request, WorksSchema)
+    if is_stream_export(request):
+        pages = shared_export_view(
+            request, fields_dict, index_name, default_sort, connection,
+            default_filters=default_filters, source_includes=source_includes,
+            max_rows=get_export_max_rows(request),
+        )
+        only = [f[len("results."):] for f in only_fields if f.startswith("results.")] if only_fields else None
+        return export_stream(request, pages, WorksSchema, only=only)
+    if is_group_by_stream_export(request):
+        pages = shared_group_by_export_view(
+            request, fields_dict, index_name, default_sort, connection,
+            default_filters=default_filters, max_rows=get_export_max_rows(request),
+        )
+        return export_group_by_stream(request, pages)
+
+    result = shared_view(
+        request, fields_dict, index_name, default_sort, connection,
+        default_filters=default_filters, source_includes=source_includes,
+    )
     if is_group_by_export(request):
         return export_group_by(result, request)
-    message_schema = MessageSchema(only=only_fields)
-    return message_schema.dump(result)
+    return json_response(compiled_dump(MessageSchema, result, only=only_fields))
 
 
 @blueprint.route("/v2/works")
@@ -148,9 +171,12 @@ def v2_works():
     index_name = WORKS_INDEX_WALDEN
     default_sort = ["-cited_by_percentile_year.max", "-cited_by_count", "id"]
     only_fields = process_only_fields(request, WorksSchema)
-    result = shared_view(request, fields_dict, index_name, default_sort, connection='walden')
-    message_schema = MessageSchema(only=only_fields)
-    return message_schema.dump(result)
+    source_includes = get_source_includes(request, WorksSchema)
+    result = shared_view(
+        request, fields_dict, index_name, default_sort, connection='walden',
+        source_includes=source_includes,
+    )
+    return json_response(compiled_dump(MessageSchema, result, only=only_fields))
 
 
 @blueprint.route("/works/filters/<path:params>")